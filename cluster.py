@@ -0,0 +1,126 @@
+# cluster.py - run the bot as several worker processes, each owning a shard range
+#
+#   python cluster.py --workers 4 --shards 8
+#
+# Every worker runs main.py with SHARD_COUNT/SHARD_IDS set to its range and
+# CLUSTER_ID set to its index. The JSON files in ./data are shared: saves take
+# an advisory lock and replace the file atomically (see utils/database.py),
+# while schedule and session files are kept per worker; deadlines over shared
+# data (gang upkeep, Patreon expiry) are only kept by worker 0, which the other
+# workers forward their changes to.
+# Worker i serves its health/metrics endpoints on PORT + i.
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+
+IDENTIFY_INTERVAL = 5  # seconds Discord wants between shard IDENTIFYs
+RESTART_DELAY = 10  # seconds before restarting a crashed worker
+MAX_RESTART_DELAY = 300
+
+
+def split_shards(shard_count, workers):
+    """Contiguous shard ranges, as even as possible: split_shards(8, 3) -> [[0,1,2],[3,4,5],[6,7]]."""
+    ranges = []
+    start = 0
+    for i in range(workers):
+        size = shard_count // workers + (1 if i < shard_count % workers else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return [r for r in ranges if r]
+
+
+class Worker:
+    def __init__(self, cluster_id, shard_ids, shard_count, port):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self.port = port
+        self.process = None
+        self.started_at = 0
+        self.restart_delay = RESTART_DELAY
+        self.restart_at = None
+
+    def start(self):
+        env = dict(os.environ,
+                   CLUSTER_ID=str(self.cluster_id),
+                   SHARD_COUNT=str(self.shard_count),
+                   SHARD_IDS=",".join(map(str, self.shard_ids)),
+                   PORT=str(self.port))
+        self.process = subprocess.Popen([sys.executable, "main.py"], env=env)
+        self.started_at = time.time()
+        self.restart_at = None
+        print(f"Worker {self.cluster_id} started (pid {self.process.pid}, "
+              f"shards {self.shard_ids[0]}-{self.shard_ids[-1]} of {self.shard_count}, port {self.port})")
+
+
+class Cluster:
+    def __init__(self, workers, shard_count, base_port):
+        self.workers = [Worker(i, ids, shard_count, base_port + i)
+                        for i, ids in enumerate(split_shards(shard_count, workers))]
+        self.stopping = False
+
+    def stop(self, signum=None, frame=None):
+        """Forward SIGTERM so every worker drains and saves before exiting."""
+        self.stopping = True
+        for worker in self.workers:
+            if worker.process and worker.process.poll() is None:
+                worker.process.send_signal(signal.SIGTERM)
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        # Stagger startup so the workers' IDENTIFYs don't collide
+        for worker in self.workers:
+            if self.stopping:
+                break
+            worker.start()
+            time.sleep(IDENTIFY_INTERVAL * len(worker.shard_ids))
+
+        while True:
+            alive = False
+            for worker in self.workers:
+                if worker.process is None:
+                    continue
+                code = worker.process.poll()
+                if code is None:
+                    alive = True
+                    continue
+                if self.stopping:
+                    continue
+                # Crashed or exited: restart with backoff
+                if worker.restart_at is None:
+                    if time.time() - worker.started_at > MAX_RESTART_DELAY:
+                        worker.restart_delay = RESTART_DELAY  # it ran fine for a while
+                    print(f"Worker {worker.cluster_id} exited with code {code}; "
+                          f"restarting in {worker.restart_delay}s")
+                    worker.restart_at = time.time() + worker.restart_delay
+                    worker.restart_delay = min(worker.restart_delay * 2, MAX_RESTART_DELAY)
+                elif time.time() >= worker.restart_at:
+                    worker.start()
+                alive = True
+            if self.stopping and not alive:
+                break
+            time.sleep(1)
+        print("All workers stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the bot as several sharded worker processes")
+    parser.add_argument("--workers", type=int,
+                        default=int(os.environ.get("CLUSTER_WORKERS", os.cpu_count() or 1)))
+    parser.add_argument("--shards", type=int, default=None,
+                        help="total shard count (default: one per worker)")
+    args = parser.parse_args()
+
+    shard_count = args.shards or args.workers
+    if args.workers < 1 or shard_count < args.workers:
+        parser.error("need at least one worker and at least one shard per worker")
+    Cluster(args.workers, shard_count, int(os.environ.get("PORT", 8080))).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,21 @@
 import discord
+import io
+import json
 import time
 from discord.ext import commands
-from utils.database import load, save
+from utils.database import load, save, locked
+from utils.scheduler import scheduler
+from utils.leaderboard_index import record_user, forget_user, rebuild as rebuild_leaderboards
+from utils.cog_loader import cog_loader
+from utils.profiler import profiler, MAX_DURATION
+from utils.memtrace import memtrace, live_views, raid_lobbies
+from utils.member_cache import member_cache, rss_bytes
 import config
 from difflib import get_close_matches
 
 USERS_FILE = "data/users.json"
 CARDS_FILE = "data/cards.json"
+CATALOG_FILES = ["data/cards.json", "data/bosses.json", "data/rarities.json"]
 
 
 class Admin(commands.Cog):
@@ -34,6 +43,12 @@ class Admin(commands.Cog):
             }
         return users[uid]
 
+    async def _reply(self, ctx, reply):
+        """Send a reply that is either plain text or an embed"""
+        if isinstance(reply, discord.Embed):
+            return await ctx.send(embed=reply)
+        return await ctx.send(reply)
+
     def find_card(self, cards_db, search_name: str):
         """Fuzzy find a card by name from cards.json.
 
@@ -80,154 +95,160 @@ class Admin(commands.Cog):
         if member is None:
             member = ctx.author
 
-        users = load(USERS_FILE)
         uid = str(member.id)
-        user = self.ensure_user(users, uid)
-
         embed = discord.Embed(color=0x2ECC71)
         embed.set_author(
             name=f"Admin: {ctx.author.display_name}", icon_url=ctx.author.display_avatar.url)
 
-        if type == "yen":
-            user["yen"] = user.get("yen", 0) + amount
-            msg = f"Added ¥{amount:,} to {member.display_name}"
-            embed.title = "✅ Yen Added"
-            embed.description = f"**{member.mention}** received **{amount:,}** yen"
-            embed.add_field(name="💰 New Balance",
-                            value=f"`{user['yen']:,}` yen", inline=True)
-
-        elif type == "ticket":
-            ticket_id = ctx.message.content.split(
-            )[-1] if len(ctx.message.content.split()) > 4 else None
-            if not ticket_id or ticket_id.startswith("<@"):
-                return await ctx.send("❌ Specify ticket ID. Usage: `ls add ticket <amount> @user <ticket_id>`")
-            user.setdefault("tickets", {})
-            user["tickets"][ticket_id] = user["tickets"].get(
-                ticket_id, 0) + amount
-            msg = f"Added {amount}x {ticket_id} to {member.display_name}"
-            embed.title = "✅ Ticket Added"
-            embed.description = f"**{member.mention}** received **{amount}x {ticket_id}**"
-
-        elif type == "item" or type == "equipment":
-            item_id = ctx.message.content.split(
-            )[-1] if len(ctx.message.content.split()) > 4 else None
-            if not item_id or item_id.startswith("<@"):
-                return await ctx.send("❌ Specify item ID. Usage: `ls add item <amount> @user <item_id>`")
-            user.setdefault("equipment", {})
-            user["equipment"][item_id] = user["equipment"].get(
-                item_id, 0) + amount
-            msg = f"Added {amount}x {item_id} to {member.display_name}"
-            embed.title = "✅ Item Added"
-            embed.description = f"**{member.mention}** received **{amount}x {item_id}**"
-
-        elif type == "pulls" or type == "pull":
-            user["pulls"] = min(12, user.get("pulls", 0) + amount)
-            msg = f"Added {amount} pulls to {member.display_name}"
-            embed.title = "✅ Pulls Added"
-            embed.description = f"**{member.mention}** received **{amount}** pulls"
-            embed.add_field(name="🃏 Total Pulls",
-                            value=f"`{user['pulls']}/12`", inline=True)
-
-        elif type == "reset" or type == "reset_token":
-            user.setdefault("reset_tokens", 0)
-            user["reset_tokens"] = user.get("reset_tokens", 0) + amount
-            embed.title = "✅ Reset Tokens Added"
-            embed.description = f"**{member.mention}** received **{amount}** reset token(s)"
-            embed.add_field(name="🔄 Total Reset Tokens",
-                            value=f"`{user['reset_tokens']}`", inline=True)
-
-        elif type == "card":
-            # Everything after the amount and optional member mention is treated as card search text
-            parts = ctx.message.content.split()
-            # ls add card <amount> [@user] <card name...>
-            # Find index of type and amount, everything after member (if any) is name
-            try:
-                type_index = parts.index(type)
-            except ValueError:
-                type_index = 2
-            name_parts = parts[type_index + 2:]
-            if member is not None and member.mention in parts:
-                # Skip the first occurrence of the mention
-                mention_index = parts.index(member.mention)
-                name_parts = parts[mention_index + 1:]
-            card_name = " ".join(name_parts).strip()
-            if not card_name:
-                return await ctx.send("❌ Specify card name. Usage: `ls add card <amount> @user <card_name>`")
-
-            cards_db = load(CARDS_FILE)
-            card_data = self.find_card(cards_db, card_name)
-            if not card_data:
-                return await ctx.send(f"❌ Card '{card_name}' not found in database!")
-
-            user.setdefault("cards", [])
-            user.setdefault("unlocked", [])
-
-            for _ in range(amount):
-                if card_data["name"] not in user.get("unlocked", []):
-                    user.setdefault("unlocked", []).append(card_data["name"])
-                user["cards"].append({
-                    "name": card_data["name"],
-                    "rarity": card_data["rarity"],
-                    "level": 1,
-                    "exp": 0,
-                    "evo": 0,
-                    "aura": 0
-                })
-
-            msg = f"Added {amount}x {card_data['name']} to {member.display_name}"
-            embed.title = "✅ Card Added"
-            embed.description = f"**{member.mention}** received **{amount}x {card_data['name']}**"
-
-        elif type in ["frag", "frags", "fragment", "fragments", "shard", "shards"]:
-            # Add character fragments by card name (fuzzy)
-            parts = ctx.message.content.split()
-            try:
-                type_index = parts.index(type)
-            except ValueError:
-                type_index = 2
-            name_parts = parts[type_index + 2:]
-            if member is not None and member.mention in parts:
-                mention_index = parts.index(member.mention)
-                name_parts = parts[mention_index + 1:]
-            card_name = " ".join(name_parts).strip()
-            if not card_name:
-                return await ctx.send("❌ Specify card name. Usage: `ls add frag <amount> @user <card_name>`")
-
-            cards_db = load(CARDS_FILE)
-            card_data = self.find_card(cards_db, card_name)
-            if not card_data:
-                return await ctx.send(f"❌ Card '{card_name}' not found in database!")
-
-            real_name = card_data["name"]
-            user.setdefault("fragments", {})
-            user["fragments"][real_name] = user["fragments"].get(
-                real_name, 0) + amount
-
-            msg = f"Added {amount} fragments of {real_name} to {member.display_name}"
-            embed.title = "✅ Fragments Added"
-            embed.description = f"**{member.mention}** received **{amount}x {real_name} fragments**"
-
-        elif type in ["chest", "chests"]:
-            # Generic chest ID
-            chest_id = ctx.message.content.split(
-            )[-1] if len(ctx.message.content.split()) > 4 else None
-            if not chest_id or chest_id.startswith("<@"):
-                return await ctx.send("❌ Specify chest ID. Usage: `ls add chest <amount> @user <chest_id>`")
-            user.setdefault("chests", {})
-            user["chests"][chest_id] = user["chests"].get(chest_id, 0) + amount
-            msg = f"Added {amount}x {chest_id} chest(s) to {member.display_name}"
-            embed.title = "✅ Chests Added"
-            embed.description = f"**{member.mention}** received **{amount}x {chest_id}**"
-
-        else:
-            embed = discord.Embed(
-                title="❌ Invalid Type",
-                description="Available types: `yen`, `ticket`, `item`, `pulls`, `reset`, `card`, `frag`, `chest`",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
-        save(USERS_FILE, users)
+        def apply(user):
+            """Apply the change to `user`; returns the error reply, or None once applied."""
+            if type == "yen":
+                user["yen"] = user.get("yen", 0) + amount
+                msg = f"Added ¥{amount:,} to {member.display_name}"
+                embed.title = "✅ Yen Added"
+                embed.description = f"**{member.mention}** received **{amount:,}** yen"
+                embed.add_field(name="💰 New Balance",
+                                value=f"`{user['yen']:,}` yen", inline=True)
+
+            elif type == "ticket":
+                ticket_id = ctx.message.content.split(
+                )[-1] if len(ctx.message.content.split()) > 4 else None
+                if not ticket_id or ticket_id.startswith("<@"):
+                    return "❌ Specify ticket ID. Usage: `ls add ticket <amount> @user <ticket_id>`"
+                user.setdefault("tickets", {})
+                user["tickets"][ticket_id] = user["tickets"].get(
+                    ticket_id, 0) + amount
+                msg = f"Added {amount}x {ticket_id} to {member.display_name}"
+                embed.title = "✅ Ticket Added"
+                embed.description = f"**{member.mention}** received **{amount}x {ticket_id}**"
+
+            elif type == "item" or type == "equipment":
+                item_id = ctx.message.content.split(
+                )[-1] if len(ctx.message.content.split()) > 4 else None
+                if not item_id or item_id.startswith("<@"):
+                    return "❌ Specify item ID. Usage: `ls add item <amount> @user <item_id>`"
+                user.setdefault("equipment", {})
+                user["equipment"][item_id] = user["equipment"].get(
+                    item_id, 0) + amount
+                msg = f"Added {amount}x {item_id} to {member.display_name}"
+                embed.title = "✅ Item Added"
+                embed.description = f"**{member.mention}** received **{amount}x {item_id}**"
+
+            elif type == "pulls" or type == "pull":
+                user["pulls"] = min(12, user.get("pulls", 0) + amount)
+                msg = f"Added {amount} pulls to {member.display_name}"
+                embed.title = "✅ Pulls Added"
+                embed.description = f"**{member.mention}** received **{amount}** pulls"
+                embed.add_field(name="🃏 Total Pulls",
+                                value=f"`{user['pulls']}/12`", inline=True)
+
+            elif type == "reset" or type == "reset_token":
+                user.setdefault("reset_tokens", 0)
+                user["reset_tokens"] = user.get("reset_tokens", 0) + amount
+                embed.title = "✅ Reset Tokens Added"
+                embed.description = f"**{member.mention}** received **{amount}** reset token(s)"
+                embed.add_field(name="🔄 Total Reset Tokens",
+                                value=f"`{user['reset_tokens']}`", inline=True)
+
+            elif type == "card":
+                # Everything after the amount and optional member mention is treated as card search text
+                parts = ctx.message.content.split()
+                # ls add card <amount> [@user] <card name...>
+                # Find index of type and amount, everything after member (if any) is name
+                try:
+                    type_index = parts.index(type)
+                except ValueError:
+                    type_index = 2
+                name_parts = parts[type_index + 2:]
+                if member is not None and member.mention in parts:
+                    # Skip the first occurrence of the mention
+                    mention_index = parts.index(member.mention)
+                    name_parts = parts[mention_index + 1:]
+                card_name = " ".join(name_parts).strip()
+                if not card_name:
+                    return "❌ Specify card name. Usage: `ls add card <amount> @user <card_name>`"
+
+                cards_db = load(CARDS_FILE)
+                card_data = self.find_card(cards_db, card_name)
+                if not card_data:
+                    return f"❌ Card '{card_name}' not found in database!"
+
+                user.setdefault("cards", [])
+                user.setdefault("unlocked", [])
+
+                for _ in range(amount):
+                    if card_data["name"] not in user.get("unlocked", []):
+                        user.setdefault("unlocked", []).append(card_data["name"])
+                    user["cards"].append({
+                        "name": card_data["name"],
+                        "rarity": card_data["rarity"],
+                        "level": 1,
+                        "exp": 0,
+                        "evo": 0,
+                        "aura": 0
+                    })
+
+                msg = f"Added {amount}x {card_data['name']} to {member.display_name}"
+                embed.title = "✅ Card Added"
+                embed.description = f"**{member.mention}** received **{amount}x {card_data['name']}**"
+
+            elif type in ["frag", "frags", "fragment", "fragments", "shard", "shards"]:
+                # Add character fragments by card name (fuzzy)
+                parts = ctx.message.content.split()
+                try:
+                    type_index = parts.index(type)
+                except ValueError:
+                    type_index = 2
+                name_parts = parts[type_index + 2:]
+                if member is not None and member.mention in parts:
+                    mention_index = parts.index(member.mention)
+                    name_parts = parts[mention_index + 1:]
+                card_name = " ".join(name_parts).strip()
+                if not card_name:
+                    return "❌ Specify card name. Usage: `ls add frag <amount> @user <card_name>`"
+
+                cards_db = load(CARDS_FILE)
+                card_data = self.find_card(cards_db, card_name)
+                if not card_data:
+                    return f"❌ Card '{card_name}' not found in database!"
+
+                real_name = card_data["name"]
+                user.setdefault("fragments", {})
+                user["fragments"][real_name] = user["fragments"].get(
+                    real_name, 0) + amount
+
+                msg = f"Added {amount} fragments of {real_name} to {member.display_name}"
+                embed.title = "✅ Fragments Added"
+                embed.description = f"**{member.mention}** received **{amount}x {real_name} fragments**"
+
+            elif type in ["chest", "chests"]:
+                # Generic chest ID
+                chest_id = ctx.message.content.split(
+                )[-1] if len(ctx.message.content.split()) > 4 else None
+                if not chest_id or chest_id.startswith("<@"):
+                    return "❌ Specify chest ID. Usage: `ls add chest <amount> @user <chest_id>`"
+                user.setdefault("chests", {})
+                user["chests"][chest_id] = user["chests"].get(chest_id, 0) + amount
+                msg = f"Added {amount}x {chest_id} chest(s) to {member.display_name}"
+                embed.title = "✅ Chests Added"
+                embed.description = f"**{member.mention}** received **{amount}x {chest_id}**"
+
+            else:
+                return discord.Embed(
+                    title="❌ Invalid Type",
+                    description="Available types: `yen`, `ticket`, `item`, `pulls`, `reset`, `card`, `frag`, `chest`",
+                    color=0xE74C3C
+                )
+
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, uid)
+            error = apply(user)
+            if error is None:
+                save(USERS_FILE, users)
+        if error is not None:
+            return await self._reply(ctx, error)
+        record_user(uid, user)
         await ctx.send(embed=embed)
 
     @commands.command(name="remove", aliases=["rem"])
@@ -236,90 +257,95 @@ class Admin(commands.Cog):
         if member is None:
             member = ctx.author
 
-        users = load(USERS_FILE)
         uid = str(member.id)
-        if uid not in users:
-            return await ctx.send(f"❌ {member.display_name} has no data.")
-
-        user = users[uid]
         embed = discord.Embed(color=0xE74C3C)
         embed.set_author(
             name=f"Admin: {ctx.author.display_name}", icon_url=ctx.author.display_avatar.url)
 
-        if type == "yen":
-            user["yen"] = max(0, user.get("yen", 0) - amount)
-            embed.title = "✅ Yen Removed"
-            embed.description = f"**{amount:,}** yen removed from **{member.mention}**"
-            embed.add_field(name="💰 New Balance",
-                            value=f"`{user['yen']:,}` yen", inline=True)
-        elif type == "pulls" or type == "pull":
-            user["pulls"] = max(0, user.get("pulls", 0) - amount)
-            embed.title = "✅ Pulls Removed"
-            embed.description = f"**{amount}** pulls removed from **{member.mention}**"
-        elif type == "reset" or type == "reset_token":
-            user["reset_tokens"] = max(0, user.get("reset_tokens", 0) - amount)
-            embed.title = "✅ Reset Tokens Removed"
-            embed.description = f"**{amount}** reset token(s) removed from **{member.mention}**"
-        elif type == "ticket":
-            ticket_id = ctx.message.content.split(
-            )[-1] if len(ctx.message.content.split()) > 4 else None
-            if not ticket_id or ticket_id.startswith("<@"):
-                return await ctx.send("❌ Specify ticket ID. Usage: `ls remove ticket <amount> @user <ticket_id>`")
-            user.setdefault("tickets", {})
-            current = user["tickets"].get(ticket_id, 0)
-            user["tickets"][ticket_id] = max(0, current - amount)
-            embed.title = "✅ Ticket Removed"
-            embed.description = f"**{amount}x {ticket_id}** removed from **{member.mention}**"
-        elif type == "item" or type == "equipment":
-            item_id = ctx.message.content.split(
-            )[-1] if len(ctx.message.content.split()) > 4 else None
-            if not item_id or item_id.startswith("<@"):
-                return await ctx.send("❌ Specify item ID. Usage: `ls remove item <amount> @user <item_id>`")
-            user.setdefault("equipment", {})
-            current = user["equipment"].get(item_id, 0)
-            user["equipment"][item_id] = max(0, current - amount)
-            embed.title = "✅ Item Removed"
-            embed.description = f"**{amount}x {item_id}** removed from **{member.mention}**"
-        elif type in ["frag", "frags", "fragment", "fragments", "shard", "shards"]:
-            parts = ctx.message.content.split()
-            try:
-                type_index = parts.index(type)
-            except ValueError:
-                type_index = 2
-            name_parts = parts[type_index + 2:]
-            if member is not None and member.mention in parts:
-                mention_index = parts.index(member.mention)
-                name_parts = parts[mention_index + 1:]
-            card_name = " ".join(name_parts).strip()
-            if not card_name:
-                return await ctx.send("❌ Specify card name. Usage: `ls remove frag <amount> @user <card_name>`")
-
-            cards_db = load(CARDS_FILE)
-            card_data = self.find_card(cards_db, card_name)
-            if not card_data:
-                return await ctx.send(f"❌ Card '{card_name}' not found in database!")
-
-            real_name = card_data["name"]
-            user.setdefault("fragments", {})
-            current = user["fragments"].get(real_name, 0)
-            user["fragments"][real_name] = max(0, current - amount)
-
-            embed.title = "✅ Fragments Removed"
-            embed.description = f"**{amount}x {real_name} fragments** removed from **{member.mention}**"
-        elif type in ["chest", "chests"]:
-            chest_id = ctx.message.content.split(
-            )[-1] if len(ctx.message.content.split()) > 4 else None
-            if not chest_id or chest_id.startswith("<@"):
-                return await ctx.send("❌ Specify chest ID. Usage: `ls remove chest <amount> @user <chest_id>`")
-            user.setdefault("chests", {})
-            current = user["chests"].get(chest_id, 0)
-            user["chests"][chest_id] = max(0, current - amount)
-            embed.title = "✅ Chests Removed"
-            embed.description = f"**{amount}x {chest_id}** removed from **{member.mention}**"
-        else:
-            return await ctx.send("❌ Invalid type. Use: yen, pulls, reset, ticket, item, frag, chest")
-
-        save(USERS_FILE, users)
+        def apply(user):
+            """Apply the change to `user`; returns the error reply, or None once applied."""
+            if type == "yen":
+                user["yen"] = max(0, user.get("yen", 0) - amount)
+                embed.title = "✅ Yen Removed"
+                embed.description = f"**{amount:,}** yen removed from **{member.mention}**"
+                embed.add_field(name="💰 New Balance",
+                                value=f"`{user['yen']:,}` yen", inline=True)
+            elif type == "pulls" or type == "pull":
+                user["pulls"] = max(0, user.get("pulls", 0) - amount)
+                embed.title = "✅ Pulls Removed"
+                embed.description = f"**{amount}** pulls removed from **{member.mention}**"
+            elif type == "reset" or type == "reset_token":
+                user["reset_tokens"] = max(0, user.get("reset_tokens", 0) - amount)
+                embed.title = "✅ Reset Tokens Removed"
+                embed.description = f"**{amount}** reset token(s) removed from **{member.mention}**"
+            elif type == "ticket":
+                ticket_id = ctx.message.content.split(
+                )[-1] if len(ctx.message.content.split()) > 4 else None
+                if not ticket_id or ticket_id.startswith("<@"):
+                    return "❌ Specify ticket ID. Usage: `ls remove ticket <amount> @user <ticket_id>`"
+                user.setdefault("tickets", {})
+                current = user["tickets"].get(ticket_id, 0)
+                user["tickets"][ticket_id] = max(0, current - amount)
+                embed.title = "✅ Ticket Removed"
+                embed.description = f"**{amount}x {ticket_id}** removed from **{member.mention}**"
+            elif type == "item" or type == "equipment":
+                item_id = ctx.message.content.split(
+                )[-1] if len(ctx.message.content.split()) > 4 else None
+                if not item_id or item_id.startswith("<@"):
+                    return "❌ Specify item ID. Usage: `ls remove item <amount> @user <item_id>`"
+                user.setdefault("equipment", {})
+                current = user["equipment"].get(item_id, 0)
+                user["equipment"][item_id] = max(0, current - amount)
+                embed.title = "✅ Item Removed"
+                embed.description = f"**{amount}x {item_id}** removed from **{member.mention}**"
+            elif type in ["frag", "frags", "fragment", "fragments", "shard", "shards"]:
+                parts = ctx.message.content.split()
+                try:
+                    type_index = parts.index(type)
+                except ValueError:
+                    type_index = 2
+                name_parts = parts[type_index + 2:]
+                if member is not None and member.mention in parts:
+                    mention_index = parts.index(member.mention)
+                    name_parts = parts[mention_index + 1:]
+                card_name = " ".join(name_parts).strip()
+                if not card_name:
+                    return "❌ Specify card name. Usage: `ls remove frag <amount> @user <card_name>`"
+
+                cards_db = load(CARDS_FILE)
+                card_data = self.find_card(cards_db, card_name)
+                if not card_data:
+                    return f"❌ Card '{card_name}' not found in database!"
+
+                real_name = card_data["name"]
+                user.setdefault("fragments", {})
+                current = user["fragments"].get(real_name, 0)
+                user["fragments"][real_name] = max(0, current - amount)
+
+                embed.title = "✅ Fragments Removed"
+                embed.description = f"**{amount}x {real_name} fragments** removed from **{member.mention}**"
+            elif type in ["chest", "chests"]:
+                chest_id = ctx.message.content.split(
+                )[-1] if len(ctx.message.content.split()) > 4 else None
+                if not chest_id or chest_id.startswith("<@"):
+                    return "❌ Specify chest ID. Usage: `ls remove chest <amount> @user <chest_id>`"
+                user.setdefault("chests", {})
+                current = user["chests"].get(chest_id, 0)
+                user["chests"][chest_id] = max(0, current - amount)
+                embed.title = "✅ Chests Removed"
+                embed.description = f"**{amount}x {chest_id}** removed from **{member.mention}**"
+            else:
+                return "❌ Invalid type. Use: yen, pulls, reset, ticket, item, frag, chest"
+
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = users.get(uid)
+            error = apply(user) if user is not None else f"❌ {member.display_name} has no data."
+            if error is None:
+                save(USERS_FILE, users)
+        if error is not None:
+            return await self._reply(ctx, error)
+        record_user(uid, user)
         await ctx.send(embed=embed)
 
     @commands.command(name="set")
@@ -328,39 +354,46 @@ class Admin(commands.Cog):
         if member is None:
             member = ctx.author
 
-        users = load(USERS_FILE)
         uid = str(member.id)
-        user = self.ensure_user(users, uid)
-
         embed = discord.Embed(color=0x3498DB)
         embed.set_author(
             name=f"Admin: {ctx.author.display_name}", icon_url=ctx.author.display_avatar.url)
 
-        if type == "yen":
-            user["yen"] = max(0, value)
-            embed.title = "✅ Yen Set"
-            embed.description = f"**{member.mention}**'s yen set to **{value:,}**"
-        elif type == "pulls" or type == "pull":
-            user["pulls"] = max(0, min(12, value))
-            embed.title = "✅ Pulls Set"
-            embed.description = f"**{member.mention}**'s pulls set to **{value}/12**"
-        elif type == "wins":
-            user["wins"] = max(0, value)
-            embed.title = "✅ Wins Set"
-            embed.description = f"**{member.mention}**'s wins set to **{value}**"
-        elif type == "streak":
-            user["streak"] = max(0, value)
-            embed.title = "✅ Streak Set"
-            embed.description = f"**{member.mention}**'s streak set to **{value}**"
-        elif type == "reset" or type == "reset_token":
-            user.setdefault("reset_tokens", 0)
-            user["reset_tokens"] = max(0, value)
-            embed.title = "✅ Reset Tokens Set"
-            embed.description = f"**{member.mention}**'s reset tokens set to **{value}**"
-        else:
-            return await ctx.send("❌ Invalid type. Use: yen, pulls, wins, streak, reset")
-
-        save(USERS_FILE, users)
+        def apply(user):
+            """Apply the change to `user`; returns the error reply, or None once applied."""
+            if type == "yen":
+                user["yen"] = max(0, value)
+                embed.title = "✅ Yen Set"
+                embed.description = f"**{member.mention}**'s yen set to **{value:,}**"
+            elif type == "pulls" or type == "pull":
+                user["pulls"] = max(0, min(12, value))
+                embed.title = "✅ Pulls Set"
+                embed.description = f"**{member.mention}**'s pulls set to **{value}/12**"
+            elif type == "wins":
+                user["wins"] = max(0, value)
+                embed.title = "✅ Wins Set"
+                embed.description = f"**{member.mention}**'s wins set to **{value}**"
+            elif type == "streak":
+                user["streak"] = max(0, value)
+                embed.title = "✅ Streak Set"
+                embed.description = f"**{member.mention}**'s streak set to **{value}**"
+            elif type == "reset" or type == "reset_token":
+                user.setdefault("reset_tokens", 0)
+                user["reset_tokens"] = max(0, value)
+                embed.title = "✅ Reset Tokens Set"
+                embed.description = f"**{member.mention}**'s reset tokens set to **{value}**"
+            else:
+                return "❌ Invalid type. Use: yen, pulls, wins, streak, reset"
+
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, uid)
+            error = apply(user)
+            if error is None:
+                save(USERS_FILE, users)
+        if error is not None:
+            return await self._reply(ctx, error)
+        record_user(uid, user)
         await ctx.send(embed=embed)
 
     @commands.command(name="wipe")
@@ -369,12 +402,15 @@ class Admin(commands.Cog):
         if member is None:
             member = ctx.author
 
-        users = load(USERS_FILE)
         uid = str(member.id)
-
-        if uid in users:
-            del users[uid]
-            save(USERS_FILE, users)
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            existed = users.pop(uid, None) is not None
+            if existed:
+                save(USERS_FILE, users)
+
+        if existed:
+            forget_user(uid)
             embed = discord.Embed(
                 title="🗑️ Data Wiped",
                 description=f"All data for **{member.mention}** has been wiped.",
@@ -396,32 +432,39 @@ class Admin(commands.Cog):
         if member is None:
             member = ctx.author
 
-        users = load(USERS_FILE)
         uid = str(member.id)
-        if uid not in users:
-            return await ctx.send(f"❌ {member.display_name} has no data.")
-
-        user = users[uid]
         embed = discord.Embed(color=0xF39C12)
         embed.set_author(
             name=f"Admin: {ctx.author.display_name}", icon_url=ctx.author.display_avatar.url)
 
-        if type == "cooldown" or type == "claim":
-            user["last_claim_ts"] = 0
-            embed.title = "✅ Cooldown Reset"
-            embed.description = f"**{member.mention}**'s daily claim cooldown has been reset"
-        elif type == "pulls":
-            user["last_pull_regen_ts"] = 0
-            embed.title = "✅ Pull Cooldown Reset"
-            embed.description = f"**{member.mention}**'s pull cooldown has been reset"
-        elif type == "streak":
-            user["streak"] = 0
-            embed.title = "✅ Streak Reset"
-            embed.description = f"**{member.mention}**'s win streak has been reset"
-        else:
-            return await ctx.send("❌ Invalid type. Use: cooldown, pulls, streak")
-
-        save(USERS_FILE, users)
+        def apply(user):
+            """Apply the reset to `user`; returns the error reply, or None once applied."""
+            if type == "cooldown" or type == "claim":
+                user["last_claim_ts"] = 0
+                scheduler.cancel("daily_claim", uid)
+                embed.title = "✅ Cooldown Reset"
+                embed.description = f"**{member.mention}**'s daily claim cooldown has been reset"
+            elif type == "pulls":
+                user["last_pull_regen_ts"] = 0
+                scheduler.cancel("pull_regen", uid)
+                embed.title = "✅ Pull Cooldown Reset"
+                embed.description = f"**{member.mention}**'s pull cooldown has been reset"
+            elif type == "streak":
+                user["streak"] = 0
+                embed.title = "✅ Streak Reset"
+                embed.description = f"**{member.mention}**'s win streak has been reset"
+            else:
+                return "❌ Invalid type. Use: cooldown, pulls, streak"
+
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = users.get(uid)
+            error = apply(user) if user is not None else f"❌ {member.display_name} has no data."
+            if error is None:
+                save(USERS_FILE, users)
+        if error is not None:
+            return await self._reply(ctx, error)
+        record_user(uid, user)
         await ctx.send(embed=embed)
 
     @commands.command(name="give")
@@ -467,6 +510,135 @@ class Admin(commands.Cog):
 
         await ctx.send(embed=embed)
 
+    @commands.command(name="adminprofile", aliases=["aprofile"])
+    async def admin_profile(self, ctx, seconds: int = 30):
+        """Sample the bot's stacks for N seconds. Usage: ls adminprofile [seconds]"""
+        seconds = max(1, min(seconds, MAX_DURATION))
+        if profiler.running:
+            return await ctx.send("❌ A profile is already running.")
+
+        await ctx.send(f"⏱️ Profiling for **{seconds}s**...")
+        data, samples = await profiler.run(seconds)
+
+        embed = discord.Embed(
+            title="✅ Profile Complete",
+            description=(
+                f"Collected **{samples:,}** samples over **{seconds}s**.\n"
+                "Stacks are rooted at the running command. Open the file with "
+                "speedscope or `flamegraph.pl`."
+            ),
+            color=0x2ECC71
+        )
+        embed.set_author(
+            name=f"Admin: {ctx.author.display_name}", icon_url=ctx.author.display_avatar.url)
+        file = discord.File(io.BytesIO(data), filename=f"profile-{int(time.time())}.collapsed")
+        await ctx.send(embed=embed, file=file)
+
+    @commands.command(name="adminmem", aliases=["amem"])
+    async def admin_mem(self, ctx, action: str = "diff"):
+        """Track memory growth with tracemalloc. Usage: ls adminmem <start|diff|reset|stop>"""
+        action = action.lower()
+        embed = discord.Embed(color=0x3498DB)
+        embed.set_author(
+            name=f"Admin: {ctx.author.display_name}", icon_url=ctx.author.display_avatar.url)
+
+        if action == "start":
+            memtrace.start()
+            embed.title = "✅ Memory Tracing Started"
+            embed.description = "Baseline snapshot taken. Use `ls adminmem diff` later to see what grew."
+        elif action == "stop":
+            if not memtrace.tracing:
+                return await ctx.send("❌ Memory tracing isn't running. Use `ls adminmem start`.")
+            memtrace.stop()
+            embed.title = "✅ Memory Tracing Stopped"
+            embed.description = "tracemalloc has been turned off."
+        elif action in ("diff", "reset"):
+            if not memtrace.tracing or memtrace.baseline is None:
+                return await ctx.send("❌ Memory tracing isn't running. Use `ls adminmem start`.")
+            top = memtrace.diff(reset=action == "reset")
+            current, peak = memtrace.traced_memory()
+            lines = [f"`{where}` {size / 1024:+,.1f} KiB ({count:+,} blocks)"
+                     for where, size, count in top]
+            embed.title = "📈 Memory Growth Since Baseline"
+            embed.description = "\n".join(lines) or "No allocations recorded."
+            embed.add_field(name="🧠 Traced",
+                            value=f"`{current / 1048576:,.1f}` MiB (peak `{peak / 1048576:,.1f}` MiB)", inline=False)
+            if action == "reset":
+                embed.set_footer(text="Baseline moved to this snapshot")
+        else:
+            return await ctx.send("❌ Invalid action. Use: start, diff, reset, stop")
+
+        views = live_views()
+        embed.add_field(name="🪟 Live Views",
+                        value="\n".join(f"`{name}`: {n}" for name, n in sorted(views.items())) or "None",
+                        inline=True)
+        lobbies = raid_lobbies()
+        if lobbies is not None:
+            embed.add_field(name="⚔️ Raid Lobbies", value=f"`{lobbies}`", inline=True)
+        members = member_cache.stats(self.bot)
+        rss = rss_bytes()
+        embed.add_field(name=f"👥 Members ({config.MEMBER_CACHE})",
+                        value=f"`{members['discord']:,}` cached, `{members['lru']:,}` in LRU"
+                        + (f"\nRSS `{rss / 1048576:,.0f}` MiB" if rss else ""),
+                        inline=True)
+        await ctx.send(embed=embed)
+
+    @commands.command(name="adminreload", aliases=["areload"])
+    async def admin_reload(self, ctx, target: str = None):
+        """Reload a cog or the catalogs without restarting. Usage: ls adminreload <cog|catalogs>"""
+        if not target:
+            return await ctx.send("❌ Usage: `ls adminreload <cog name|catalogs>`")
+        target = target.lower()
+        embed = discord.Embed(color=0x2ECC71)
+        embed.set_author(
+            name=f"Admin: {ctx.author.display_name}", icon_url=ctx.author.display_avatar.url)
+
+        if target == "catalogs":
+            # Catalogs are read from disk on use; check the edited files parse before anyone hits them
+            lines = []
+            failed = False
+            for path in CATALOG_FILES:
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        entries = len(json.load(f))
+                    lines.append(f"✅ `{path}`: {entries:,} entries")
+                except Exception as e:
+                    failed = True
+                    lines.append(f"❌ `{path}`: {e}")
+            if failed:
+                # Don't rebuild anything from a half-edited catalog
+                lines.append("Fix the files above and run the command again; nothing was rebuilt.")
+                embed.title = "❌ Catalog Reload Failed"
+                embed.color = 0xE74C3C
+                embed.description = "\n".join(lines)
+                return await ctx.send(embed=embed)
+            rebuild_leaderboards()
+            lines.append("✅ Leaderboard indexes rebuilt")
+            embed.title = "📚 Catalogs Reloaded"
+            embed.description = "\n".join(lines)
+            return await ctx.send(embed=embed)
+
+        extension = target if target.startswith("cogs.") else f"cogs.{target}"
+        started = time.perf_counter()
+        try:
+            if extension in self.bot.extensions:
+                # Views already running keep the old module until they finish
+                await self.bot.reload_extension(extension)
+            else:
+                await cog_loader.load(self.bot, extension)
+                if extension not in self.bot.extensions:
+                    return await ctx.send(f"❌ Could not load `{extension}`, see the bot log.")
+        except Exception as e:
+            embed = discord.Embed(
+                title="❌ Reload Failed",
+                description=f"`{extension}`: {e}\nThe previous version is still running.",
+                color=0xE74C3C
+            )
+            return await ctx.send(embed=embed)
+        embed.title = "🔄 Cog Reloaded"
+        embed.description = f"`{extension}` reloaded in {(time.perf_counter() - started) * 1000:,.0f} ms."
+        await ctx.send(embed=embed)
+
     @commands.command(name="adminhelp", aliases=["ahelp"])
     async def admin_help(self, ctx):
         """Show admin-only command help. Usage: ls adminhelp"""
@@ -570,6 +742,24 @@ class Admin(commands.Cog):
             inline=False
         )
 
+        embed.add_field(
+            name="⏱️ ls adminprofile / ls aprofile",
+            value=f"`ls adminprofile [seconds]` – Sample live stacks (max {MAX_DURATION}s) and upload a flamegraph file.",
+            inline=False
+        )
+
+        embed.add_field(
+            name="🧠 ls adminmem / ls amem",
+            value="`ls adminmem <start|diff|reset|stop>` – tracemalloc baseline, top growing allocation sites, live Views and lobbies.",
+            inline=False
+        )
+
+        embed.add_field(
+            name="🔄 ls adminreload / ls areload",
+            value="`ls adminreload <cog|catalogs>` – Reload a cog's code, or check the card/boss catalogs and rebuild leaderboards, without a restart.",
+            inline=False
+        )
+
         await ctx.send(embed=embed)
 
 
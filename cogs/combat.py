@@ -1,10 +1,18 @@
+import asyncio
 import discord
 import random
+import secrets
+import time
+import weakref
 from difflib import get_close_matches
 from discord.ext import commands
 from discord.ui import View, Button, button
-from utils.database import load, save
+from utils.database import load, save, locked
 from utils.game_math import compute_stats
+from utils.leaderboard_index import record_user, record_gang
+from utils.sessions import sessions
+from utils.scheduler import scheduler
+from utils.member_cache import member_cache
 
 USERS_FILE = "data/users.json"
 CARDS_FILE = "data/cards.json"
@@ -12,17 +20,46 @@ GANGS_FILE = "data/gangs.json"
 RARITIES_FILE = "data/rarities.json"
 BOSS_FILE = "data/bosses.json"
 
+# Battle and raid views still in progress; their state is saved on shutdown
+active_views = weakref.WeakSet()
+restored_views = {}  # session_id -> view re-attached after a restart
+VIEW_TIMEOUT = 300
+OPPONENT_LOOKUPS = 5  # random candidates tried by `ls fight` before giving up
+
+
+def extend_session(view):
+    """Push a view's saved expiry forward on activity, as discord.py does with its live timeout"""
+    view.expires_at = int(time.time()) + VIEW_TIMEOUT
+    if view.session_id in restored_views:
+        scheduler.schedule("view_expiry", view.session_id, view.expires_at)
+
+
+class RestoredContext:
+    """Stand-in for the commands.Context of a view rebuilt after a restart"""
+
+    def __init__(self, author, channel, message=None):
+        self.author = author
+        self.channel = channel
+        self.message = message
+
+    async def send(self, *args, **kwargs):
+        return await self.channel.send(*args, **kwargs)
+
 
 class BattleView(View):
     """Interactive battle view with card selection buttons"""
 
-    def __init__(self, ctx, my_team, en_team, target, ensure_user_func):
-        super().__init__(timeout=300)
+    def __init__(self, ctx, my_team, en_team, target, cog, session_id=None, expires_at=None):
+        # Restored views are persistent; their expiry comes from the scheduler instead
+        super().__init__(timeout=None if session_id else VIEW_TIMEOUT)
+        self.session_id = session_id or secrets.token_hex(4)
+        self.expires_at = expires_at or int(time.time()) + VIEW_TIMEOUT
         self.ctx = ctx
         self.my_team = my_team
         self.en_team = en_team
         self.target = target
-        self.ensure_user = ensure_user_func
+        self.cog = cog
+        self.ensure_user = cog.ensure_user
         self.turn = 0
         self.max_turns = 15
         self.my_team_battle = [{"name": c["name"], "atk": c["atk"],
@@ -35,9 +72,29 @@ class BattleView(View):
 
         # Create buttons for each card (1-4)
         for i in range(min(len(my_team), 4)):  # Max 4 cards
-            self.add_item(CardAttackButton(i + 1, my_team[i]['name'], i))
+            self.add_item(CardAttackButton(i + 1, my_team[i]['name'], i, self.session_id))
+        active_views.add(self)
+
+    def to_state(self):
+        """Compact JSON state of an unfinished battle, or None."""
+        if not self.battle_active or self.msg is None:
+            return None
+        return {
+            "type": "battle",
+            "session_id": self.session_id,
+            "expires_at": self.expires_at,
+            "channel_id": self.msg.channel.id,
+            "message_id": self.msg.id,
+            "author_id": self.ctx.author.id,
+            "target_id": self.target.id,
+            "turn": self.turn,
+            "my_team": self.my_team_battle,
+            "en_team": self.en_team_battle,
+            "log": self.log[-5:],
+        }
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        extend_session(self)
         if interaction.user != self.ctx.author:
             await interaction.response.send_message("❌ This isn't your battle!", ephemeral=True)
             return False
@@ -152,55 +209,61 @@ class BattleView(View):
         self.battle_active = False
         winner = self.ctx.author if p1_win else self.target
 
-        # Update stats and grant EXP rewards
-        users = load(USERS_FILE)
-        author_user = self.ensure_user(users, str(self.ctx.author.id))
-        target_user = self.ensure_user(users, str(self.target.id))
-
-        if p1_win:
-            author_user["wins"] = author_user.get("wins", 0) + 1
-            author_user["streak"] = author_user.get("streak", 0) + 1
-            target_user["streak"] = 0
-        else:
-            target_user["wins"] = target_user.get("wins", 0) + 1
-            target_user["streak"] = target_user.get("streak", 0) + 1
-            author_user["streak"] = 0
-
         # Get card names for both teams
         winner_cards = [c["name"] for c in (
             self.my_team_battle if p1_win else self.en_team_battle)]
         loser_cards = [c["name"] for c in (
             self.en_team_battle if p1_win else self.my_team_battle)]
 
-        # Grant EXP rewards using our new system
+        # Grant EXP rewards using our new system (saves users.json itself)
         winner_id = self.ctx.author.id if p1_win else self.target.id
         loser_id = self.target.id if p1_win else self.ctx.author.id
 
-        rewards = self._grant_battle_rewards(
+        rewards = self.cog._grant_battle_rewards(
             winner_id, loser_id, winner_cards, loser_cards)
 
-        save(USERS_FILE, users)
+        # Update stats on top of the rewarded records
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            author_user = self.ensure_user(users, str(self.ctx.author.id))
+            target_user = self.ensure_user(users, str(self.target.id))
+
+            if p1_win:
+                author_user["wins"] = author_user.get("wins", 0) + 1
+                author_user["streak"] = author_user.get("streak", 0) + 1
+                target_user["streak"] = 0
+            else:
+                target_user["wins"] = target_user.get("wins", 0) + 1
+                target_user["streak"] = target_user.get("streak", 0) + 1
+                author_user["streak"] = 0
+
+            save(USERS_FILE, users)
+        record_user(self.ctx.author.id, author_user)
+        record_user(self.target.id, target_user)
 
         # Gang EXP reward for winner, if in a gang
         try:
-            gangs = load(GANGS_FILE)
-            winner_id_str = str(winner.id)
-            winner_gang = None
-            winner_gid = None
-            for gid, g in gangs.items():
-                if winner_id_str in g.get("members", []):
-                    winner_gid = gid
-                    winner_gang = g
-                    break
+            with locked(GANGS_FILE):
+                gangs = load(GANGS_FILE)
+                winner_id_str = str(winner.id)
+                winner_gang = None
+                winner_gid = None
+                for gid, g in gangs.items():
+                    if winner_id_str in g.get("members", []):
+                        winner_gid = gid
+                        winner_gang = g
+                        break
 
-            gang_exp_awarded = 0
+                gang_exp_awarded = 0
+                if winner_gang is not None:
+                    winner_gang.setdefault("exp", 0)
+                    # Simple flat EXP for now; can be scaled later by team/cards
+                    gang_exp_awarded = random.randint(20, 50)
+                    winner_gang["exp"] += gang_exp_awarded
+                    gangs[winner_gid] = winner_gang
+                    save(GANGS_FILE, gangs)
             if winner_gang is not None:
-                winner_gang.setdefault("exp", 0)
-                # Simple flat EXP for now; can be scaled later by team/cards
-                gang_exp_awarded = random.randint(20, 50)
-                winner_gang["exp"] += gang_exp_awarded
-                gangs[winner_gid] = winner_gang
-                save(GANGS_FILE, gangs)
+                record_gang(winner_gid, winner_gang)
         except Exception:
             gang_exp_awarded = 0
 
@@ -255,9 +318,10 @@ class BattleView(View):
 class CardAttackButton(Button):
     """Button for selecting a card to attack"""
 
-    def __init__(self, card_num, card_name, card_index):
+    def __init__(self, card_num, card_name, card_index, session_id):
         super().__init__(
-            label=f"Card {card_num}: {card_name[:15]}", style=discord.ButtonStyle.primary, row=(card_num - 1) // 2)
+            label=f"Card {card_num}: {card_name[:15]}", style=discord.ButtonStyle.primary, row=(card_num - 1) // 2,
+            custom_id=f"battle:{session_id}:{card_index}")
         self.card_index = card_index
         self.card_name = card_name
 
@@ -270,6 +334,108 @@ class CardAttackButton(Button):
 class Combat(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        sessions.register("combat", lambda: [
+            state for state in (view.to_state() for view in list(active_views)) if state])
+
+    async def cog_load(self):
+        scheduler.register("view_expiry", self._on_view_expired)
+        scheduler.start()
+        # The cog may load before or after on_ready (it is deferred at startup)
+        asyncio.create_task(self.restore_views())
+
+    async def cog_unload(self):
+        # Battles started before a reload finish on the old code; keep saving them
+        sessions.retire("combat")
+
+    async def _on_view_expired(self, items):
+        for session_id, _ in items:
+            view = restored_views.pop(session_id, None)
+            if view:
+                view.stop()
+
+    async def restore_views(self):
+        """Re-attach battles and boss raids that were running at the last shutdown"""
+        await self.bot.wait_until_ready()
+        now = int(time.time())
+        for state in sessions.take("combat", []):
+            if state.get("expires_at", 0) <= now:
+                continue
+            try:
+                view = await self._restore_view(state)
+            except Exception as e:
+                print(f"Could not restore {state.get('type')} {state.get('session_id')}: {e}")
+                continue
+            if view is None:
+                continue
+            self.bot.add_view(view, message_id=state["message_id"])
+            restored_views[view.session_id] = view
+            scheduler.schedule("view_expiry", view.session_id, state["expires_at"])
+
+    async def _get_member(self, guild, uid):
+        if guild is None:
+            return self.bot.get_user(uid) or await self.bot.fetch_user(uid)
+        return await member_cache.fetch(guild, uid)
+
+    async def _find_opponent(self, ctx):
+        """Random player of this server, other than the author, who has cards to fight with.
+
+        Candidates come from the server's player ids, so only the chosen
+        opponent is looked up; a few retries cover players who have left.
+        """
+        users = load(USERS_FILE)
+        author_id = str(ctx.author.id)
+        candidates = [uid for uid in await member_cache.member_ids(ctx.guild)
+                      if uid != author_id and users.get(uid, {}).get("cards")]
+        random.shuffle(candidates)
+        for uid in candidates[:OPPONENT_LOOKUPS]:
+            member = await member_cache.fetch(ctx.guild, int(uid))
+            if member is not None and not member.bot:
+                return member
+        return None
+
+    async def _restore_view(self, state):
+        """Rebuild a BattleView, BossTicketView or BossRaidView from its saved state"""
+        channel = self.bot.get_channel(state["channel_id"])
+        if channel is None:
+            return None
+        guild = getattr(channel, "guild", None)
+        message = channel.get_partial_message(state["message_id"])
+        session = {"session_id": state["session_id"], "expires_at": state["expires_at"]}
+
+        if state["type"] == "battle":
+            author = await self._get_member(guild, state["author_id"])
+            target = await self._get_member(guild, state["target_id"])
+            ctx = RestoredContext(author, channel, message)
+            view = BattleView(ctx, state["my_team"], state["en_team"], target, self, **session)
+            view.turn = state["turn"]
+            view.log = state["log"]
+            view.msg = message
+            return view
+
+        if state["type"] == "boss_ticket":
+            boss_data = load(BOSS_FILE).get(state["boss_key"])
+            if boss_data is None:
+                return None
+            host = await self._get_member(guild, state["host_id"])
+            ctx = RestoredContext(host, channel, message)
+            view = BossTicketView(ctx, state["boss_key"], boss_data, host, state["host_team"], self, **session)
+            for uid, team in state["joined"]:
+                view.joined_players.append((await self._get_member(guild, uid), team))
+            view.message = message
+            return view
+
+        if state["type"] == "boss_raid":
+            players = [(await self._get_member(guild, uid), cards) for uid, cards in state["teams"]]
+            ctx = RestoredContext(players[0][0], channel, message)
+            view = BossRaidView(ctx, state["boss"], players, self, **session)
+            view.boss_hp = state["boss_hp"]
+            view.turn = state["turn"]
+            view.log = state["log"]
+            view.player_turns = {int(pid): acted for pid, acted in state["player_turns"].items()}
+            view.update_view_buttons()
+            return view
+
+        return None
 
     def _get_gang_multiplier(self, uid: int) -> float:
         """Return stat multiplier based on user's gang/crew level.
@@ -356,27 +522,28 @@ class Combat(commands.Cog):
 
     def _grant_battle_rewards(self, winner_id, loser_id, winner_cards, loser_cards):
         """Grant EXP rewards after battle"""
-        users = load(USERS_FILE)
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
 
-        # Winner rewards
-        winner = self.ensure_user(users, str(winner_id))
-        winner_account_leveled = self._add_account_exp(
-            winner, random.randint(10, 20))
+            # Winner rewards
+            winner = self.ensure_user(users, str(winner_id))
+            winner_account_leveled = self._add_account_exp(
+                winner, random.randint(10, 20))
 
-        card_levelups = []
-        for card_name in winner_cards:
-            if self._add_card_exp(winner, card_name, random.randint(10, 30)):
-                card_levelups.append(card_name)
+            card_levelups = []
+            for card_name in winner_cards:
+                if self._add_card_exp(winner, card_name, random.randint(10, 30)):
+                    card_levelups.append(card_name)
 
-        # Loser rewards
-        loser = self.ensure_user(users, str(loser_id))
-        loser_account_leveled = self._add_account_exp(
-            loser, random.randint(5, 10))
+            # Loser rewards
+            loser = self.ensure_user(users, str(loser_id))
+            loser_account_leveled = self._add_account_exp(
+                loser, random.randint(5, 10))
 
-        for card_name in loser_cards:
-            self._add_card_exp(loser, card_name, random.randint(5, 10))
+            for card_name in loser_cards:
+                self._add_card_exp(loser, card_name, random.randint(5, 10))
 
-        save(USERS_FILE, users)
+            save(USERS_FILE, users)
 
         return {
             'winner_account_leveled': winner_account_leveled,
@@ -390,12 +557,13 @@ class Combat(commands.Cog):
         Prefers the saved team (user['team']) of card names, up to 4.
         Falls back to the first 4 owned cards if no team is set.
         """
-        users = load(USERS_FILE)
         cards_db = load(CARDS_FILE)
-        user = self.ensure_user(users, str(uid))
-        # Ensure team key exists for older data
-        user.setdefault("team", [])
-        save(USERS_FILE, users)  # Save if new user was created / upgraded
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, str(uid))
+            # Ensure team key exists for older data
+            user.setdefault("team", [])
+            save(USERS_FILE, users)  # Save if new user was created / upgraded
 
         user_cards = user.get("cards", [])
         if not user_cards:
@@ -501,10 +669,9 @@ class Combat(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        users = load(USERS_FILE)
+        # get_team saves any user it had to create
         my_team = self.get_team(ctx.author.id)
         en_team = self.get_team(target.id)
-        save(USERS_FILE, users)  # Save in case new users were created
 
         if not my_team:
             embed = discord.Embed(
@@ -559,7 +726,7 @@ class Combat(commands.Cog):
             text="Click a card button to attack with that card!")
 
         # Create battle view with buttons
-        view = BattleView(ctx, my_team, en_team, target, self.ensure_user)
+        view = BattleView(ctx, my_team, en_team, target, self)
         msg = await ctx.send(embed=init_embed, view=view)
         view.msg = msg
 
@@ -576,44 +743,6 @@ class Combat(commands.Cog):
 
         await self.start_battle(ctx, target)
 
-    @commands.command(name="fight")
-    async def fight(self, ctx):
-        """Find a random player and start a fight. Usage: ls fight"""
-        guild = ctx.guild
-        if guild is None:
-            embed = discord.Embed(
-                title="❌ Guild Only",
-                description="You can only use `ls fight` inside a server.",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
-        users = load(USERS_FILE)
-        candidate_members = []
-        for uid_str in users.keys():
-            try:
-                uid = int(uid_str)
-            except ValueError:
-                continue
-            if uid == ctx.author.id:
-                continue
-            member = guild.get_member(uid)
-            if not member or member.bot:
-                continue
-            if self.get_team(uid):
-                candidate_members.append(member)
-
-        if not candidate_members:
-            embed = discord.Embed(
-                title="❌ No Opponents Found",
-                description="No suitable opponents found. Other players must have at least one card to fight.",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
-        target = random.choice(candidate_members)
-        await self.start_battle(ctx, target)
-
     @commands.command(name="team", aliases=["teamview", "myteam"])
     async def team_view(self, ctx):
         """View your active team. Usage: ls team"""
@@ -654,22 +783,25 @@ class Combat(commands.Cog):
         if not card_name:
             return await ctx.send("❌ Usage: `ls teamadd <card name>`")
 
-        users = load(USERS_FILE)
-        user = self.ensure_user(users, str(ctx.author.id))
-        user.setdefault("team", [])
-
-        if len(user["team"]) >= 4:
-            return await ctx.send("❌ Your team is already full (max 4 cards). Use `ls teamremove` to free a slot.")
-
-        owned_name = self._fuzzy_find_owned_card_name(user, card_name)
-        if not owned_name:
-            return await ctx.send(f"❌ You don't own any card matching: **{card_name}**")
-
-        if owned_name in user["team"]:
-            return await ctx.send(f"❌ **{owned_name}** is already in your team.")
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, str(ctx.author.id))
+            user.setdefault("team", [])
+            owned_name = self._fuzzy_find_owned_card_name(user, card_name)
+
+            error = None
+            if len(user["team"]) >= 4:
+                error = "❌ Your team is already full (max 4 cards). Use `ls teamremove` to free a slot."
+            elif not owned_name:
+                error = f"❌ You don't own any card matching: **{card_name}**"
+            elif owned_name in user["team"]:
+                error = f"❌ **{owned_name}** is already in your team."
+            else:
+                user["team"].append(owned_name)
+                save(USERS_FILE, users)
 
-        user["team"].append(owned_name)
-        save(USERS_FILE, users)
+        if error:
+            return await ctx.send(error)
 
         embed = discord.Embed(
             title="✅ Team Updated",
@@ -686,19 +818,23 @@ class Combat(commands.Cog):
         if not card_name:
             return await ctx.send("❌ Usage: `ls teamremove <card name>` or `ls teamremoveall`")
 
-        users = load(USERS_FILE)
-        user = self.ensure_user(users, str(ctx.author.id))
-        user.setdefault("team", [])
-
-        if not user["team"]:
-            return await ctx.send("❌ You have no cards in your team.")
-
-        owned_name = self._fuzzy_find_owned_card_name(user, card_name)
-        if not owned_name or owned_name not in user["team"]:
-            return await ctx.send(f"❌ **{card_name}** is not in your current team.")
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, str(ctx.author.id))
+            user.setdefault("team", [])
+            owned_name = self._fuzzy_find_owned_card_name(user, card_name)
+
+            error = None
+            if not user["team"]:
+                error = "❌ You have no cards in your team."
+            elif not owned_name or owned_name not in user["team"]:
+                error = f"❌ **{card_name}** is not in your current team."
+            else:
+                user["team"] = [n for n in user["team"] if n != owned_name]
+                save(USERS_FILE, users)
 
-        user["team"] = [n for n in user["team"] if n != owned_name]
-        save(USERS_FILE, users)
+        if error:
+            return await ctx.send(error)
 
         embed = discord.Embed(
             title="✅ Team Updated",
@@ -712,16 +848,17 @@ class Combat(commands.Cog):
     @commands.command(name="teamremoveall", aliases=["teamclear"])
     async def team_remove_all(self, ctx):
         """Remove all cards from your active team. Usage: ls teamremoveall"""
-        users = load(USERS_FILE)
-        user = self.ensure_user(users, str(ctx.author.id))
-        user.setdefault("team", [])
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, str(ctx.author.id))
+            was_empty = not user.get("team")
+            if not was_empty:
+                user["team"] = []
+                save(USERS_FILE, users)
 
-        if not user["team"]:
+        if was_empty:
             return await ctx.send("ℹ️ Your team is already empty. Battles will use your first 4 cards by default.")
 
-        user["team"] = []
-        save(USERS_FILE, users)
-
         embed = discord.Embed(
             title="✅ Team Cleared",
             description="Your active team has been cleared. Battles will now use your first 4 owned cards by default.",
@@ -741,22 +878,8 @@ class Combat(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        users = load(USERS_FILE)
-        candidate_members = []
-        for uid_str in users.keys():
-            try:
-                uid = int(uid_str)
-            except ValueError:
-                continue
-            if uid == ctx.author.id:
-                continue
-            member = guild.get_member(uid)
-            if not member or member.bot:
-                continue
-            if self.get_team(uid):
-                candidate_members.append(member)
-
-        if not candidate_members:
+        target = await self._find_opponent(ctx)
+        if target is None:
             embed = discord.Embed(
                 title="❌ No Opponents Found",
                 description="No suitable opponents found. Other players must have at least one card to fight.",
@@ -764,28 +887,33 @@ class Combat(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
+        await self.start_battle(ctx, target)
+
     @commands.command(name="teamadd")
     async def team_add(self, ctx, *, card_name: str = None):
         """Add a card to your active team (max 4). Usage: ls teamadd <card name>"""
         if not card_name:
             return await ctx.send("❌ Usage: `ls teamadd <card name>`")
 
-        users = load(USERS_FILE)
-        user = self.ensure_user(users, str(ctx.author.id))
-        user.setdefault("team", [])
-
-        if len(user["team"]) >= 4:
-            return await ctx.send("❌ Your team is already full (max 4 cards). Use `ls teamremove` to free a slot.")
-
-        owned_name = self._fuzzy_find_owned_card_name(user, card_name)
-        if not owned_name:
-            return await ctx.send(f"❌ You don't own any card matching: **{card_name}**")
-
-        if owned_name in user["team"]:
-            return await ctx.send(f"❌ **{owned_name}** is already in your team.")
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, str(ctx.author.id))
+            user.setdefault("team", [])
+            owned_name = self._fuzzy_find_owned_card_name(user, card_name)
+
+            error = None
+            if len(user["team"]) >= 4:
+                error = "❌ Your team is already full (max 4 cards). Use `ls teamremove` to free a slot."
+            elif not owned_name:
+                error = f"❌ You don't own any card matching: **{card_name}**"
+            elif owned_name in user["team"]:
+                error = f"❌ **{owned_name}** is already in your team."
+            else:
+                user["team"].append(owned_name)
+                save(USERS_FILE, users)
 
-        user["team"].append(owned_name)
-        save(USERS_FILE, users)
+        if error:
+            return await ctx.send(error)
 
         embed = discord.Embed(
             title="✅ Team Updated",
@@ -802,19 +930,23 @@ class Combat(commands.Cog):
         if not card_name:
             return await ctx.send("❌ Usage: `ls teamremove <card name>` or `ls teamremoveall`")
 
-        users = load(USERS_FILE)
-        user = self.ensure_user(users, str(ctx.author.id))
-        user.setdefault("team", [])
-
-        if not user["team"]:
-            return await ctx.send("❌ You have no cards in your team.")
-
-        owned_name = self._fuzzy_find_owned_card_name(user, card_name)
-        if not owned_name or owned_name not in user["team"]:
-            return await ctx.send(f"❌ **{card_name}** is not in your current team.")
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, str(ctx.author.id))
+            user.setdefault("team", [])
+            owned_name = self._fuzzy_find_owned_card_name(user, card_name)
+
+            error = None
+            if not user["team"]:
+                error = "❌ You have no cards in your team."
+            elif not owned_name or owned_name not in user["team"]:
+                error = f"❌ **{card_name}** is not in your current team."
+            else:
+                user["team"] = [n for n in user["team"] if n != owned_name]
+                save(USERS_FILE, users)
 
-        user["team"] = [n for n in user["team"] if n != owned_name]
-        save(USERS_FILE, users)
+        if error:
+            return await ctx.send(error)
 
         embed = discord.Embed(
             title="✅ Team Updated",
@@ -828,16 +960,17 @@ class Combat(commands.Cog):
     @commands.command(name="teamremoveall", aliases=["teamclear"])
     async def team_remove_all(self, ctx):
         """Remove all cards from your active team. Usage: ls teamremoveall"""
-        users = load(USERS_FILE)
-        user = self.ensure_user(users, str(ctx.author.id))
-        user.setdefault("team", [])
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, str(ctx.author.id))
+            was_empty = not user.get("team")
+            if not was_empty:
+                user["team"] = []
+                save(USERS_FILE, users)
 
-        if not user["team"]:
+        if was_empty:
             return await ctx.send("ℹ️ Your team is already empty. Battles will use your first 4 cards by default.")
 
-        user["team"] = []
-        save(USERS_FILE, users)
-
         embed = discord.Embed(
             title="✅ Team Cleared",
             description="Your active team has been cleared. Battles will now use your first 4 owned cards by default.",
@@ -890,29 +1023,32 @@ class Combat(commands.Cog):
         if not card_name:
             return await ctx.send("❌ Usage: `ls brt add <card name>`")
 
-        users = load(USERS_FILE)
-        user = self.ensure_user(users, str(ctx.author.id))
-        user.setdefault("boss_raid_team", [])
-
-        print(f"DEBUG: Trying to add card: {card_name}")
-        print(
-            f"DEBUG: User cards: {[card.get('name', 'Unknown') for card in user.get('cards', [])[:5]]}")
-
-        if len(user["boss_raid_team"]) >= 2:
-            return await ctx.send("❌ Your boss raid team is already full (max 2 cards). Use `ls brt remove` to free a slot.")
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, str(ctx.author.id))
+            user.setdefault("boss_raid_team", [])
 
-        owned_name = self._fuzzy_find_owned_card_name(user, card_name)
-        print(f"DEBUG: Found owned card: {owned_name}")
+            print(f"DEBUG: Trying to add card: {card_name}")
+            print(
+                f"DEBUG: User cards: {[card.get('name', 'Unknown') for card in user.get('cards', [])[:5]]}")
 
-        if not owned_name:
-            return await ctx.send(f"❌ You don't own any card matching: **{card_name}**")
+            owned_name = self._fuzzy_find_owned_card_name(user, card_name)
+            print(f"DEBUG: Found owned card: {owned_name}")
 
-        if owned_name in user["boss_raid_team"]:
-            return await ctx.send(f"❌ **{owned_name}** is already in your boss raid team.")
+            error = None
+            if len(user["boss_raid_team"]) >= 2:
+                error = "❌ Your boss raid team is already full (max 2 cards). Use `ls brt remove` to free a slot."
+            elif not owned_name:
+                error = f"❌ You don't own any card matching: **{card_name}**"
+            elif owned_name in user["boss_raid_team"]:
+                error = f"❌ **{owned_name}** is already in your boss raid team."
+            else:
+                user["boss_raid_team"].append(owned_name)
+                save(USERS_FILE, users)
+                print(f"DEBUG: Added {owned_name} to boss raid team")
 
-        user["boss_raid_team"].append(owned_name)
-        save(USERS_FILE, users)
-        print(f"DEBUG: Added {owned_name} to boss raid team")
+        if error:
+            return await ctx.send(error)
 
         embed = discord.Embed(
             title="✅ Boss Raid Team Updated",
@@ -929,20 +1065,24 @@ class Combat(commands.Cog):
         if not card_name:
             return await ctx.send("❌ Usage: `ls brt remove <card name>`")
 
-        users = load(USERS_FILE)
-        user = self.ensure_user(users, str(ctx.author.id))
-        user.setdefault("boss_raid_team", [])
-
-        if not user["boss_raid_team"]:
-            return await ctx.send("❌ You have no cards in your boss raid team.")
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, str(ctx.author.id))
+            user.setdefault("boss_raid_team", [])
+            owned_name = self._fuzzy_find_owned_card_name(user, card_name)
 
-        owned_name = self._fuzzy_find_owned_card_name(user, card_name)
-        if not owned_name or owned_name not in user["boss_raid_team"]:
-            return await ctx.send(f"❌ **{card_name}** is not in your current boss raid team.")
+            error = None
+            if not user["boss_raid_team"]:
+                error = "❌ You have no cards in your boss raid team."
+            elif not owned_name or owned_name not in user["boss_raid_team"]:
+                error = f"❌ **{card_name}** is not in your current boss raid team."
+            else:
+                user["boss_raid_team"] = [
+                    n for n in user["boss_raid_team"] if n != owned_name]
+                save(USERS_FILE, users)
 
-        user["boss_raid_team"] = [
-            n for n in user["boss_raid_team"] if n != owned_name]
-        save(USERS_FILE, users)
+        if error:
+            return await ctx.send(error)
 
         embed = discord.Embed(
             title="✅ Boss Raid Team Updated",
@@ -1148,7 +1288,7 @@ class Combat(commands.Cog):
             return await ctx.send(embed=embed)
 
         # Create the ticket view
-        view = BossTicketView(ctx, boss_key, boss_data, ctx.author, team_cards)
+        view = BossTicketView(ctx, boss_key, boss_data, ctx.author, team_cards, self)
 
         # Create embed with boss info
         embed = discord.Embed(
@@ -1299,87 +1439,96 @@ class Combat(commands.Cog):
                 )
                 return await ctx.send(embed=embed)
 
-        # Check if user has enough victim fragments
-        victim_count = fragments.get(victim_fragment, 0)
-        if victim_count < amount_to_kill:
-            embed = discord.Embed(
-                title="❌ Not Enough Victim Fragments",
-                description=f"You need `{amount_to_kill}` **{victim_fragment}** fragments but only have `{victim_count}`",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
         # Get victim card data to determine rarity
         cards_db = load(CARDS_FILE)
         victim_base = next((c for c in cards_db.values()
                            if c.get('name') == victim_fragment), None)
-           if not victim_base:
-                return await ctx.send("❌ Could not find victim card data!")
+        if not victim_base:
+            return await ctx.send("❌ Could not find victim card data!")
 
-            # Get aura drop value based on rarity
-            rarities = load(RARITIES_FILE)
-            rarity = victim_base.get('rarity', 'C')
-            rarity_info = rarities.get(rarity, {})
-            aura_per_kill = rarity_info.get('aura_drop', 5)
+        # Get aura drop value based on rarity
+        rarities = load(RARITIES_FILE)
+        rarity = victim_base.get('rarity', 'C')
+        rarity_info = rarities.get(rarity, {})
+        aura_per_kill = rarity_info.get('aura_drop', 5)
 
-            # Calculate total aura gained
-            total_aura = aura_per_kill * amount_to_kill
+        # Calculate total aura gained
+        total_aura = aura_per_kill * amount_to_kill
 
-            # Remove victim fragments
-            fragments[victim_fragment] = victim_count - amount_to_kill
-            if fragments[victim_fragment] <= 0:
-                del fragments[victim_fragment]
+        # Check and spend on a fresh copy, so a concurrent kill can't spend the same fragments
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, str(ctx.author.id))
+            fragments = user.get("fragments", {})
 
-            # Add aura to killer card (find card in user's cards)
-            cards = user.get("cards", [])
-            killer_card_found = False
-            for card in cards:
-                if card.get('name') == killer_fragment:
-                    card['aura'] = card.get('aura', 0) + total_aura
-                    killer_card_found = True
-                    break
+            # Check if user has enough victim fragments
+            victim_count = fragments.get(victim_fragment, 0)
+            if victim_count >= amount_to_kill:
+                # Remove victim fragments
+                fragments[victim_fragment] = victim_count - amount_to_kill
+                if fragments[victim_fragment] <= 0:
+                    del fragments[victim_fragment]
+
+                # Add aura to killer card (find card in user's cards)
+                cards = user.get("cards", [])
+                killer_card_found = False
+                for card in cards:
+                    if card.get('name') == killer_fragment:
+                        card['aura'] = card.get('aura', 0) + total_aura
+                        killer_card_found = True
+                        break
 
-            if not killer_card_found:
-                # If killer card not owned, add aura to user's account
-                user.setdefault('aura_balance', 0)
-                user['aura_balance'] += total_aura
+                if not killer_card_found:
+                    # If killer card not owned, add aura to user's account
+                    user.setdefault('aura_balance', 0)
+                    user['aura_balance'] += total_aura
 
-            user['fragments'] = fragments
-            save(USERS_FILE, users)
+                user['fragments'] = fragments
+                save(USERS_FILE, users)
 
-            # Create result embed
+        if victim_count < amount_to_kill:
             embed = discord.Embed(
-                title="⚔️ Fragments Killed Successfully!",
-                description=(
-                    f"**{killer_fragment}** killed `{amount_to_kill}` **{victim_fragment}** fragments!\n\n"
-                    f"**Aura Gained:** `{total_aura}` points\n"
-                    f"**Rate:** `{aura_per_kill}` aura per kill"
-                ),
-                color=0x2ECC71
+                title="❌ Not Enough Victim Fragments",
+                description=f"You need `{amount_to_kill}` **{victim_fragment}** fragments but only have `{victim_count}`",
+                color=0xE74C3C
             )
-            embed.set_author(name=ctx.author.display_name,
-                             icon_url=ctx.author.display_avatar.url)
+            return await ctx.send(embed=embed)
 
-            if killer_card_found:
-                embed.add_field(
-                    name="📊 Killer Card Status",
-                    value=f"**{killer_fragment}** now has `{sum(c.get('aura', 0) for c in cards if c.get('name') == killer_fragment)}` total aura points",
-                    inline=False
-                )
-            else:
-                embed.add_field(
-                    name="📊 Aura Balance",
-                    value=f"Your aura balance is now `{user.get('aura_balance', 0)}` points",
-                    inline=False
-                )
+        record_user(ctx.author.id, user)
 
+        # Create result embed
+        embed = discord.Embed(
+            title="⚔️ Fragments Killed Successfully!",
+            description=(
+                f"**{killer_fragment}** killed `{amount_to_kill}` **{victim_fragment}** fragments!\n\n"
+                f"**Aura Gained:** `{total_aura}` points\n"
+                f"**Rate:** `{aura_per_kill}` aura per kill"
+            ),
+            color=0x2ECC71
+        )
+        embed.set_author(name=ctx.author.display_name,
+                         icon_url=ctx.author.display_avatar.url)
+
+        if killer_card_found:
+            embed.add_field(
+                name="📊 Killer Card Status",
+                value=f"**{killer_fragment}** now has `{sum(c.get('aura', 0) for c in cards if c.get('name') == killer_fragment)}` total aura points",
+                inline=False
+            )
+        else:
             embed.add_field(
-                name="🎯 Fragments Removed",
-                value=f"Removed `{amount_to_kill}` **{victim_fragment}** fragments (remaining: `{fragments.get(victim_fragment, 0)}`)",
+                name="📊 Aura Balance",
+                value=f"Your aura balance is now `{user.get('aura_balance', 0)}` points",
                 inline=False
             )
 
-            await ctx.send(embed=embed)
+        embed.add_field(
+            name="🎯 Fragments Removed",
+            value=f"Removed `{amount_to_kill}` **{victim_fragment}** fragments (remaining: `{fragments.get(victim_fragment, 0)}`)",
+            inline=False
+        )
+
+        await ctx.send(embed=embed)
 
     def _find_fragment(self, fragments, search_name):
         """Find fragment by name with fuzzy matching"""
@@ -1407,15 +1556,43 @@ class Combat(commands.Cog):
 class BossTicketView(View):
     """Interactive boss ticket view with join/start functionality"""
 
-    def __init__(self, ctx, boss_key, boss_data, host, host_team):
-        super().__init__(timeout=300)
+    def __init__(self, ctx, boss_key, boss_data, host, host_team, cog, session_id=None, expires_at=None):
+        super().__init__(timeout=None if session_id else VIEW_TIMEOUT)
+        self.session_id = session_id or secrets.token_hex(4)
+        self.expires_at = expires_at or int(time.time()) + VIEW_TIMEOUT
+        self.start_button.custom_id = f"boss_ticket:start:{self.session_id}"
+        self.join_button.custom_id = f"boss_ticket:join:{self.session_id}"
         self.ctx = ctx
+        self.cog = cog
+        self.ensure_user = cog.ensure_user
         self.boss_key = boss_key
         self.boss_data = boss_data
         self.host = host
         self.host_team = host_team
         self.joined_players = []  # List of (player, team) tuples
         self.raid_started = False
+        self.message = None
+        active_views.add(self)
+
+    def to_state(self):
+        """Compact JSON state of a lobby that hasn't started, or None."""
+        if self.raid_started or self.message is None:
+            return None
+        return {
+            "type": "boss_ticket",
+            "session_id": self.session_id,
+            "expires_at": self.expires_at,
+            "channel_id": self.message.channel.id,
+            "message_id": self.message.id,
+            "boss_key": self.boss_key,
+            "host_id": self.host.id,
+            "host_team": self.host_team,
+            "joined": [[player.id, team] for player, team in self.joined_players],
+        }
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        extend_session(self)
+        return True
 
     @button(label="🚀 START RAID", style=discord.ButtonStyle.success, custom_id="start")
     async def start_button(self, interaction: discord.Interaction, button: Button):
@@ -1429,33 +1606,36 @@ class BossTicketView(View):
             return
 
         # Consume the host's ticket
-        users = load(USERS_FILE)
-        user = self.ensure_user(users, str(self.host.id))
-        tickets = user.get("tickets", {})
-
-        # Try to consume ticket using multiple formats
-        ticket_key = None
-        possible_keys = [
-            self.boss_key,                    # "Zack Lee"
-            self.boss_data['name'],          # "Zack Lee"
-            f"{self.boss_key.lower()}_ticket",      # "zack lee_ticket"
-            # "zack_lee_ticket"
-            f"{self.boss_key.replace(' ', '_').lower()}_ticket",
-            # "zack_lee_ticket"
-            f"{self.boss_data['name'].lower().replace(' ', '_')}_ticket"
-        ]
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, str(self.host.id))
+            tickets = user.get("tickets", {})
+
+            # Try to consume ticket using multiple formats
+            ticket_key = None
+            possible_keys = [
+                self.boss_key,                    # "Zack Lee"
+                self.boss_data['name'],          # "Zack Lee"
+                f"{self.boss_key.lower()}_ticket",      # "zack lee_ticket"
+                # "zack_lee_ticket"
+                f"{self.boss_key.replace(' ', '_').lower()}_ticket",
+                # "zack_lee_ticket"
+                f"{self.boss_data['name'].lower().replace(' ', '_')}_ticket"
+            ]
+
+            for key in possible_keys:
+                if key in tickets and tickets[key] > 0:
+                    ticket_key = key
+                    break
 
-        for key in possible_keys:
-            if key in tickets and tickets[key] > 0:
-                ticket_key = key
-                break
+            if ticket_key:
+                tickets[ticket_key] = tickets[ticket_key] - 1
+                if tickets[ticket_key] <= 0:
+                    del tickets[ticket_key]
+                user["tickets"] = tickets
+                save(USERS_FILE, users)
 
         if ticket_key:
-            tickets[ticket_key] = tickets[ticket_key] - 1
-            if tickets[ticket_key] <= 0:
-                del tickets[ticket_key]
-            user["tickets"] = tickets
-            save(USERS_FILE, users)
             print(f"DEBUG: Consumed 1 {ticket_key} ticket")
         else:
             print(f"DEBUG: No ticket found to consume!")
@@ -1477,7 +1657,7 @@ class BossTicketView(View):
             'max_players': self.boss_data['max_players']
         }
 
-        raid_view = BossRaidView(self.ctx, boss, all_players)
+        raid_view = BossRaidView(self.ctx, boss, all_players, self.cog)
 
         # Update embed to show raid started
         embed = discord.Embed(
@@ -1671,7 +1851,7 @@ class BossTicketView(View):
         total_players = 1 + len(self.joined_players)
         if total_players >= self.boss_data['max_players']:
             for child in self.children:
-                if child.custom_id == "join":
+                if child is self.join_button:
                     child.disabled = True
                     child.label = "🔒 RAID FULL"
 
@@ -1681,9 +1861,13 @@ class BossTicketView(View):
 class BossRaidView(View):
     """Interactive boss raid view with action buttons"""
 
-    def __init__(self, ctx, boss, all_players):
-        super().__init__(timeout=300)
+    def __init__(self, ctx, boss, all_players, cog, session_id=None, expires_at=None):
+        super().__init__(timeout=None if session_id else VIEW_TIMEOUT)
+        self.session_id = session_id or secrets.token_hex(4)
+        self.expires_at = expires_at or int(time.time()) + VIEW_TIMEOUT
         self.ctx = ctx
+        self.cog = cog
+        self.ensure_user = cog.ensure_user
         self.boss = boss
         self.all_players = all_players  # List of (player, cards) tuples
         self.boss_hp = boss['hp']
@@ -1703,6 +1887,27 @@ class BossRaidView(View):
             })
             # All players can act initially
             self.player_turns[player.id] = True
+        self.update_view_buttons()
+        active_views.add(self)
+
+    def to_state(self):
+        """Compact JSON state of a raid in progress, or None."""
+        message = getattr(self.ctx, "message", None)
+        if not self.raid_active or message is None:
+            return None
+        return {
+            "type": "boss_raid",
+            "session_id": self.session_id,
+            "expires_at": self.expires_at,
+            "channel_id": message.channel.id,
+            "message_id": message.id,
+            "boss": self.boss,
+            "boss_hp": self.boss_hp,
+            "turn": self.turn,
+            "teams": [[td['player'].id, td['cards']] for td in self.player_teams_battle],
+            "player_turns": {str(pid): acted for pid, acted in self.player_turns.items()},
+            "log": self.log[-5:],
+        }
 
     def get_player_cards(self, player_id):
         """Get a player's cards in battle"""
@@ -1719,13 +1924,21 @@ class BossRaidView(View):
     def create_card_button(self, card, player):
         """Create a button for a specific card"""
         label = f"⚔️ {card['name']}"
-        custom_id = f"card_{player.id}_{card['name']}"
+        custom_id = f"boss_raid:{self.session_id}:card_{player.id}_{card['name']}"
 
         # Disable button if card is dead or player already acted
         disabled = card['hp'] <= 0 or not self.player_turns.get(
             player.id, False)
 
-        return Button(label=label, style=discord.ButtonStyle.primary, custom_id=custom_id, disabled=disabled, row=0)
+        return self._action_button(label=label, style=discord.ButtonStyle.primary, custom_id=custom_id, disabled=disabled, row=0)
+
+    def _action_button(self, custom_id, **kwargs):
+        """Button routed to handle_button_click, with a custom_id scoped to this raid"""
+        if not custom_id.startswith("boss_raid:"):
+            custom_id = f"boss_raid:{self.session_id}:{custom_id}"
+        action = Button(custom_id=custom_id, **kwargs)
+        action.callback = self.handle_button_click
+        return action
 
     def update_view_buttons(self):
         """Update view buttons to show only current player's cards"""
@@ -1748,11 +1961,11 @@ class BossRaidView(View):
             self.add_item(button)
 
         # Add action buttons
-        self.add_item(Button(
+        self.add_item(self._action_button(
             label="🛡️ Defend", style=discord.ButtonStyle.secondary, custom_id="defend", row=1))
-        self.add_item(Button(
+        self.add_item(self._action_button(
             label="💚 Heal", style=discord.ButtonStyle.success, custom_id="heal", row=1))
-        self.add_item(Button(label="⏭️ End Turn",
+        self.add_item(self._action_button(label="⏭️ End Turn",
                       style=discord.ButtonStyle.danger, custom_id="end_turn", row=2))
 
     async def callback(self, interaction: discord.Interaction):
@@ -1761,6 +1974,7 @@ class BossRaidView(View):
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         """Only allow the current player to interact"""
+        extend_session(self)
         current_player = None
         for player, _ in self.all_players:
             if self.player_turns.get(player.id, False):
@@ -1927,7 +2141,8 @@ class BossRaidView(View):
             await interaction.response.send_message("It's not your turn!", ephemeral=True)
             return
 
-        custom_id = interaction.data['custom_id']
+        # Strip the "boss_raid:<session>:" scope
+        custom_id = interaction.data['custom_id'].split(':', 2)[-1]
 
         if custom_id.startswith('card_'):
             # Card attack
@@ -2005,8 +2220,6 @@ class BossRaidView(View):
         """End the boss raid"""
         self.raid_active = False
 
-        users = load(USERS_FILE)
-
         if victory:
             # Victory rewards for all players
             embed = discord.Embed(
@@ -2015,36 +2228,40 @@ class BossRaidView(View):
                 color=0x2ECC71
             )
 
+            with locked(USERS_FILE):
+                users = load(USERS_FILE)
+                for player, original_cards in self.all_players:
+                    user = self.ensure_user(users, str(player.id))
+
+                    # Random reward
+                    rewards = random.choice([
+                        ("aura", random.randint(100, 500)),
+                        ("tickets", random.randint(1, 3)),
+                        ("chest", "common")
+                    ])
+
+                    if rewards[0] == "aura":
+                        user.setdefault('aura_balance', 0)
+                        user['aura_balance'] += rewards[1]
+                    elif rewards[0] == "tickets":
+                        user.setdefault('tickets', {})
+                        user['tickets'].setdefault('raid', 0)
+                        user['tickets']['raid'] += rewards[1]
+                    else:
+                        user.setdefault('chests', {})
+                        user['chests'].setdefault('common', 0)
+                        user['chests']['common'] += 1
+                save(USERS_FILE, users)
+
+            # Grant EXP rewards for surviving cards (each grant saves on its own)
             for player, original_cards in self.all_players:
-                user = self.ensure_user(users, str(player.id))
-
-                # Random reward
-                rewards = random.choice([
-                    ("aura", random.randint(100, 500)),
-                    ("tickets", random.randint(1, 3)),
-                    ("chest", "common")
-                ])
-
-                if rewards[0] == "aura":
-                    user.setdefault('aura_balance', 0)
-                    user['aura_balance'] += rewards[1]
-                elif rewards[0] == "tickets":
-                    user.setdefault('tickets', {})
-                    user['tickets'].setdefault('raid', 0)
-                    user['tickets']['raid'] += rewards[1]
-                else:
-                    user.setdefault('chests', {})
-                    user['chests'].setdefault('common', 0)
-                    user['chests']['common'] += 1
-
-                # Grant EXP rewards for surviving cards
                 team_data = next(
                     (td for td in self.player_teams_battle if td['player'].id == player.id), None)
                 if team_data:
                     winner_cards = [c["name"]
                                     for c in team_data['cards'] if c['hp'] > 0]
                     if winner_cards:
-                        battle_rewards = self._grant_battle_rewards(
+                        battle_rewards = self.cog._grant_battle_rewards(
                             player.id, 0, winner_cards, [])
                         if battle_rewards['card_levelups']:
                             embed.add_field(name=f"⭐ {player.display_name}'s Level Ups!", value=", ".join(
@@ -2056,8 +2273,6 @@ class BossRaidView(View):
                 color=0xE74C3C
             )
 
-        save(USERS_FILE, users)
-
         # Disable all buttons
         for child in self.children:
             child.disabled = True
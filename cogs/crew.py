@@ -3,7 +3,7 @@ import time
 import random
 from discord.ext import commands
 from discord.ui import View, Button
-from utils.database import load, save
+from utils.database import load, save, locked
 from utils.game_math import compute_stats
 import config
 
@@ -346,57 +346,55 @@ class Crew(commands.Cog):
                 )
                 return await ctx.send(embed=embed)
 
-            crews = load(CREWS_FILE)
-
-            # Check if 4 crews already exist
-            if len(crews) >= 4:
-                embed = discord.Embed(
-                    title="❌ Crew Limit Reached",
-                    description="Maximum 4 crews can exist in the entire bot!\n\nAll crew slots are currently taken.",
-                    color=0xE74C3C
-                )
-                crew_list = "\n".join(
-                    [f"• **{c['name']}**" for c in crews.values()])
-                embed.add_field(name="Existing Crews",
-                                value=crew_list, inline=False)
-                return await ctx.send(embed=embed)
-
-            # Check if user is already in a crew
-            cid, existing_crew = self.get_crew(ctx.author.id)
-            if existing_crew:
-                embed = discord.Embed(
-                    title="❌ Already in a Crew",
-                    description=f"You're already in **{existing_crew['name']}**!",
-                    color=0xE74C3C
-                )
-                return await ctx.send(embed=embed)
-
-            # Check if crew name already exists
-            if any(c['name'].lower() == arg.lower() for c in crews.values()):
-                embed = discord.Embed(
-                    title="❌ Crew Name Taken",
-                    description=f"A crew named **{arg}** already exists!",
-                    color=0xE74C3C
-                )
-                return await ctx.send(embed=embed)
-
-            cid = str(int(time.time()))
-            new_crew = {
-                "id": cid,
-                "name": arg,
-                "leader": str(ctx.author.id),
-                "members": [str(ctx.author.id)],
-                "territories": [],
-                "created_at": int(time.time())
-            }
-
-            crews[cid] = new_crew
-            save(CREWS_FILE, crews)
+            error = None
+            with locked(CREWS_FILE):
+                crews = load(CREWS_FILE)
+                # Check if 4 crews already exist
+                if len(crews) >= 4:
+                    error = discord.Embed(
+                        title="❌ Crew Limit Reached",
+                        description="Maximum 4 crews can exist in the entire bot!\n\nAll crew slots are currently taken.",
+                        color=0xE74C3C
+                    )
+                    crew_list = "\n".join(
+                        [f"• **{c['name']}**" for c in crews.values()])
+                    error.add_field(name="Existing Crews",
+                                    value=crew_list, inline=False)
+                else:
+                    # Check if user is already in a crew
+                    cid, existing_crew = self.get_crew(ctx.author.id)
+                    if existing_crew:
+                        error = discord.Embed(
+                            title="❌ Already in a Crew",
+                            description=f"You're already in **{existing_crew['name']}**!",
+                            color=0xE74C3C
+                        )
+                    # Check if crew name already exists
+                    elif any(c['name'].lower() == arg.lower() for c in crews.values()):
+                        error = discord.Embed(
+                            title="❌ Crew Name Taken",
+                            description=f"A crew named **{arg}** already exists!",
+                            color=0xE74C3C
+                        )
+                if error is None:
+                    cid = str(int(time.time()))
+                    crews[cid] = {
+                        "id": cid,
+                        "name": arg,
+                        "leader": str(ctx.author.id),
+                        "members": [str(ctx.author.id)],
+                        "territories": [],
+                        "created_at": int(time.time())
+                    }
+                    save(CREWS_FILE, crews)
+            if error is not None:
+                return await ctx.send(embed=error)
 
-            users = load(USERS_FILE)
-            user = self.ensure_user(users, str(ctx.author.id))
-            user["crew_name"] = arg
-            save(USERS_FILE, users)
+            with locked(USERS_FILE):
+                users = load(USERS_FILE)
+                user = self.ensure_user(users, str(ctx.author.id))
+                user["crew_name"] = arg
+                save(USERS_FILE, users)
 
             embed = discord.Embed(
                 title="✅ Crew Created!",
@@ -488,15 +486,17 @@ class Crew(commands.Cog):
                 )
                 return await ctx.send(embed=embed)
 
-            crew['members'].remove(str(ctx.author.id))
-            crews = load(CREWS_FILE)
-            crews[cid] = crew
-            save(CREWS_FILE, crews)
+            with locked(CREWS_FILE):
+                crews = load(CREWS_FILE)
+                if cid in crews and str(ctx.author.id) in crews[cid]['members']:
+                    crews[cid]['members'].remove(str(ctx.author.id))
+                    save(CREWS_FILE, crews)
 
-            users = load(USERS_FILE)
-            if str(ctx.author.id) in users:
-                users[str(ctx.author.id)]["crew_name"] = None
-            save(USERS_FILE, users)
+            with locked(USERS_FILE):
+                users = load(USERS_FILE)
+                if str(ctx.author.id) in users:
+                    users[str(ctx.author.id)]["crew_name"] = None
+                    save(USERS_FILE, users)
 
             embed = discord.Embed(
                 title="✅ Left Crew",
@@ -661,50 +661,35 @@ class Crew(commands.Cog):
         embed.set_footer(text="Prepare for battle!")
         msg = await ctx.send(embed=embed)
         view = CaptureBattleView(ctx, attacker_team, def_team, defender_name, self.ensure_user, lambda won, log: self._handle_capture_end(
-            ctx, won, log, territory_name_clean, f_type, f_id, faction, owner_type, owner_id))
+            ctx, won, log, territory_name_clean, f_type, f_id, owner_type, owner_id))
         view.msg = msg
         await msg.edit(view=view)
 
-    def _handle_capture_end(self, ctx, attacker_won, log_lines, territory_name_clean, f_type, f_id, faction, owner_type, owner_id):
+    def _handle_capture_end(self, ctx, attacker_won, log_lines, territory_name_clean, f_type, f_id, owner_type, owner_id):
         """Callback after interactive capture battle concludes to transfer territory if won"""
         if not attacker_won:
             # Battle lost; nothing to transfer
             return
 
-        gangs = load(GANGS_FILE)
-        crews = load(CREWS_FILE)
+        with locked(GANGS_FILE), locked(CREWS_FILE):
+            gangs = load(GANGS_FILE)
+            crews = load(CREWS_FILE)
 
-        # Remove territory from previous owner (if any)
-        if owner_type and owner_id:
-            if owner_type == "gang":
-                owner = gangs.get(owner_id)
-                if owner:
-                    owner.setdefault("territories", [])
-                    owner["territories"] = [t for t in owner["territories"]
-                                            if str(t).lower() != territory_name_clean.lower()]
-                    gangs[owner_id] = owner
-                    save(GANGS_FILE, gangs)
-            else:
-                owner = crews.get(owner_id)
+            # Remove territory from previous owner (if any)
+            if owner_type and owner_id:
+                owner = (gangs if owner_type == "gang" else crews).get(owner_id)
                 if owner:
-                    owner.setdefault("territories", [])
-                    owner["territories"] = [t for t in owner["territories"]
+                    owner["territories"] = [t for t in owner.get("territories", [])
                                             if str(t).lower() != territory_name_clean.lower()]
-                    crews[owner_id] = owner
-                    save(CREWS_FILE, crews)
 
-        # Add territory to attacker's faction
-        if f_type == "gang":
-            faction.setdefault("territories", [])
-            if territory_name_clean not in faction["territories"]:
-                faction["territories"].append(territory_name_clean)
-            gangs[f_id] = faction
+            # Add territory to attacker's faction, unless it was disbanded during the battle
+            faction = (gangs if f_type == "gang" else crews).get(f_id)
+            if faction:
+                faction.setdefault("territories", [])
+                if territory_name_clean not in faction["territories"]:
+                    faction["territories"].append(territory_name_clean)
+
             save(GANGS_FILE, gangs)
-        else:
-            faction.setdefault("territories", [])
-            if territory_name_clean not in faction["territories"]:
-                faction["territories"].append(territory_name_clean)
-            crews[f_id] = faction
             save(CREWS_FILE, crews)
 
     @commands.command(name="crew_add", aliases=["crewadd"])
@@ -726,42 +711,42 @@ class Crew(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        cid, crew = self.get_crew(ctx.author.id)
-        if not crew or crew['leader'] != str(ctx.author.id):
-            embed = discord.Embed(
-                title="❌ Leader Only",
-                description="Only the crew leader can add members!",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
-        # Check if target is already in a crew
-        target_cid, target_crew = self.get_crew(member.id)
-        if target_crew:
-            embed = discord.Embed(
-                title="❌ Already in a Crew",
-                description=f"{member.display_name} is already in **{target_crew['name']}**!",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
-        if str(member.id) in crew.get('members', []):
-            embed = discord.Embed(
-                title="❌ Already a Member",
-                description=f"{member.display_name} is already in your crew!",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
-        crew.setdefault('members', []).append(str(member.id))
-        crews = load(CREWS_FILE)
-        crews[cid] = crew
-        save(CREWS_FILE, crews)
+        error = None
+        with locked(CREWS_FILE):
+            crews = load(CREWS_FILE)
+            cid, crew = self.get_crew(ctx.author.id)
+            target_cid, target_crew = self.get_crew(member.id)
+            if not crew or crew['leader'] != str(ctx.author.id):
+                error = discord.Embed(
+                    title="❌ Leader Only",
+                    description="Only the crew leader can add members!",
+                    color=0xE74C3C
+                )
+            # Check if target is already in a crew
+            elif target_crew:
+                error = discord.Embed(
+                    title="❌ Already in a Crew",
+                    description=f"{member.display_name} is already in **{target_crew['name']}**!",
+                    color=0xE74C3C
+                )
+            elif str(member.id) in crew.get('members', []):
+                error = discord.Embed(
+                    title="❌ Already a Member",
+                    description=f"{member.display_name} is already in your crew!",
+                    color=0xE74C3C
+                )
+            else:
+                crew = crews[cid]
+                crew.setdefault('members', []).append(str(member.id))
+                save(CREWS_FILE, crews)
+        if error is not None:
+            return await ctx.send(embed=error)
 
-        users = load(USERS_FILE)
-        user = self.ensure_user(users, str(member.id))
-        user["crew_name"] = crew['name']
-        save(USERS_FILE, users)
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, str(member.id))
+            user["crew_name"] = crew['name']
+            save(USERS_FILE, users)
 
         embed = discord.Embed(
             title="✅ Member Added",
@@ -785,40 +770,40 @@ class Crew(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        cid, crew = self.get_crew(ctx.author.id)
-        if not crew or crew['leader'] != str(ctx.author.id):
-            embed = discord.Embed(
-                title="❌ Leader Only",
-                description="Only the crew leader can remove members!",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
-        if str(member.id) not in crew.get('members', []):
-            embed = discord.Embed(
-                title="❌ Not a Member",
-                description=f"{member.display_name} is not in your crew!",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
-        if crew['leader'] == str(member.id):
-            embed = discord.Embed(
-                title="❌ Cannot Remove Leader",
-                description="You cannot remove yourself as leader!",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
-        crew['members'].remove(str(member.id))
-        crews = load(CREWS_FILE)
-        crews[cid] = crew
-        save(CREWS_FILE, crews)
+        error = None
+        with locked(CREWS_FILE):
+            crews = load(CREWS_FILE)
+            cid, crew = self.get_crew(ctx.author.id)
+            if not crew or crew['leader'] != str(ctx.author.id):
+                error = discord.Embed(
+                    title="❌ Leader Only",
+                    description="Only the crew leader can remove members!",
+                    color=0xE74C3C
+                )
+            elif str(member.id) not in crew.get('members', []):
+                error = discord.Embed(
+                    title="❌ Not a Member",
+                    description=f"{member.display_name} is not in your crew!",
+                    color=0xE74C3C
+                )
+            elif crew['leader'] == str(member.id):
+                error = discord.Embed(
+                    title="❌ Cannot Remove Leader",
+                    description="You cannot remove yourself as leader!",
+                    color=0xE74C3C
+                )
+            else:
+                crew = crews[cid]
+                crew['members'].remove(str(member.id))
+                save(CREWS_FILE, crews)
+        if error is not None:
+            return await ctx.send(embed=error)
 
-        users = load(USERS_FILE)
-        if str(member.id) in users:
-            users[str(member.id)]["crew_name"] = None
-        save(USERS_FILE, users)
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            if str(member.id) in users:
+                users[str(member.id)]["crew_name"] = None
+                save(USERS_FILE, users)
 
         embed = discord.Embed(
             title="✅ Member Removed",
@@ -3,8 +3,10 @@ import time
 import random
 from discord.ext import commands
 from discord.ui import View, Button, button
-from utils.database import load, save
-from utils.game_math import regenerate_pulls
+from utils.database import load, save, locked
+from utils.game_math import regenerate_pulls, pulls_full_at
+from utils.scheduler import scheduler
+from utils.leaderboard_index import record_user
 import config
 
 USERS_FILE = "data/users.json"
@@ -13,6 +15,8 @@ USERS_FILE = "data/users.json"
 class Economy(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        scheduler.register("daily_claim")  # cooldown marker
+        scheduler.register("pull_regen")  # cooldown marker
 
     def ensure_user(self, users, uid):
         """Ensure user exists in database"""
@@ -37,11 +41,18 @@ class Economy(commands.Cog):
     @commands.command(name="reset", aliases=["resetpulls", "reset_pulls", "rpulls"])
     async def reset_pulls(self, ctx):
         """Reset your pulls using a reset token. Usage: ls reset"""
-        users = load(USERS_FILE)
         uid = str(ctx.author.id)
-        user = self.ensure_user(users, uid)
-
-        reset_tokens = user.get("reset_tokens", 0)
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, uid)
+            reset_tokens = user.get("reset_tokens", 0)
+            current_pulls = user.get("pulls", 0)
+            if reset_tokens >= 1 and current_pulls < config.MAX_PULLS:
+                # Consume one reset token and refill pulls
+                user["pulls"] = config.MAX_PULLS
+                user["reset_tokens"] = reset_tokens - 1
+                user["last_pull_regen_ts"] = int(time.time())
+                save(USERS_FILE, users)
 
         if reset_tokens < 1:
             embed = discord.Embed(
@@ -58,7 +69,6 @@ class Economy(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        current_pulls = user.get("pulls", 0)
         if current_pulls >= config.MAX_PULLS:
             embed = discord.Embed(
                 title="❌ Already Full",
@@ -74,11 +84,7 @@ class Economy(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        # Consume one reset token and refill pulls
-        user["pulls"] = config.MAX_PULLS
-        user["reset_tokens"] = reset_tokens - 1
-        user["last_pull_regen_ts"] = int(time.time())
-        save(USERS_FILE, users)
+        scheduler.cancel("pull_regen", uid)
 
         embed = discord.Embed(
             title="✅ Pulls Reset!",
@@ -96,9 +102,10 @@ class Economy(commands.Cog):
 
     @commands.command(name="bal", aliases=["balance", "money"])
     async def bal(self, ctx):
-        users = load(USERS_FILE)
-        user = self.ensure_user(users, str(ctx.author.id))
-        save(USERS_FILE, users)  # Save if new user was created
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, str(ctx.author.id))
+            save(USERS_FILE, users)  # Save if new user was created
 
         yen = user.get("yen", 0)
         tokens = user.get("reset_tokens", 0)
@@ -139,15 +146,47 @@ class Economy(commands.Cog):
 
     @commands.command(name="claim", aliases=["daily"])
     async def claim(self, ctx):
-        users = load(USERS_FILE)
         uid = str(ctx.author.id)
-        user = self.ensure_user(users, uid)
-
         now = int(time.time())
-        last = user.get("last_claim_ts", 0)
-
-        # Check cooldown (24 hours = 86400 seconds)
-        if now - last < config.DAILY_COOLDOWN:
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, uid)
+            last = user.get("last_claim_ts", 0)
+
+            # Check cooldown (24 hours = 86400 seconds)
+            on_cooldown = now - last < config.DAILY_COOLDOWN
+            if not on_cooldown:
+                # Calculate streak
+                streak = user.get("claim_streak", 0)
+                # If more than 2 days passed, reset streak
+                if now - last > (config.DAILY_COOLDOWN * 2):
+                    streak = 0
+
+                # Increment streak (cycles 1-5)
+                streak = (streak % 5) + 1
+
+                user.setdefault("chests", {})
+                rw_msg = ""
+                yen_gain = streak * 1000
+
+                if streak == 1:
+                    user["chests"]["locker"] = user["chests"].get("locker", 0) + 1
+                    rw_msg = "🗄️ +1 Locker Chest"
+                elif streak == 2:
+                    user["chests"]["locker"] = user["chests"].get("locker", 0) + 2
+                    rw_msg = "🗄️ +2 Locker Chests"
+                elif streak == 5:
+                    user["chests"]["vvip"] = user["chests"].get("vvip", 0) + 1
+                    rw_msg = "💎 +1 VVIP Chest"
+                else:
+                    rw_msg = "No bonus chest"
+
+                user["yen"] = user.get("yen", 0) + yen_gain
+                user["claim_streak"] = streak
+                user["last_claim_ts"] = now  # Update timestamp
+                save(USERS_FILE, users)
+
+        if on_cooldown:
             rem = config.DAILY_COOLDOWN - (now - last)
             hours = rem // 3600
             minutes = (rem % 3600) // 60
@@ -163,35 +202,8 @@ class Economy(commands.Cog):
             embed.set_footer(text="Daily reset in 24 hours")
             return await ctx.send(embed=embed)
 
-        # Calculate streak
-        streak = user.get("claim_streak", 0)
-        # If more than 2 days passed, reset streak
-        if now - last > (config.DAILY_COOLDOWN * 2):
-            streak = 0
-
-        # Increment streak (cycles 1-5)
-        streak = (streak % 5) + 1
-
-        user.setdefault("chests", {})
-        rw_msg = ""
-        yen_gain = streak * 1000
-
-        if streak == 1:
-            user["chests"]["locker"] = user["chests"].get("locker", 0) + 1
-            rw_msg = "🗄️ +1 Locker Chest"
-        elif streak == 2:
-            user["chests"]["locker"] = user["chests"].get("locker", 0) + 2
-            rw_msg = "🗄️ +2 Locker Chests"
-        elif streak == 5:
-            user["chests"]["vvip"] = user["chests"].get("vvip", 0) + 1
-            rw_msg = "💎 +1 VVIP Chest"
-        else:
-            rw_msg = "No bonus chest"
-
-        user["yen"] = user.get("yen", 0) + yen_gain
-        user["claim_streak"] = streak
-        user["last_claim_ts"] = now  # Update timestamp
-        save(USERS_FILE, users)
+        record_user(uid, user)
+        scheduler.schedule("daily_claim", uid, now + config.DAILY_COOLDOWN)
 
         embed = discord.Embed(
             title=f"📅 Day {streak} Claimed!",
@@ -232,11 +244,40 @@ class Economy(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        users = load(USERS_FILE)
         uid = str(ctx.author.id)
-        user = self.ensure_user(users, uid)
-        chests = user.get("chests", {})
-        available = chests.get(chest_type, 0)
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, uid)
+            chests = user.get("chests", {})
+            available = chests.get(chest_type, 0)
+
+            if available >= 1:
+                # Limit quantity to available
+                quantity = min(quantity, available)
+
+                # Calculate total rewards
+                total_yen = 0
+                total_pulls = 0
+
+                for _ in range(quantity):
+                    # RNG rewards based on chest type
+                    if chest_type == "vvip":
+                        yen = random.randint(5000, 20000)
+                        bonus_pulls = random.choice([0, 0, 0, 1])  # 25% chance
+                    else:  # locker
+                        yen = random.randint(1000, 10000)
+                        bonus_pulls = 0
+
+                    total_yen += yen
+                    total_pulls += bonus_pulls
+
+                # Consume chests
+                user["chests"][chest_type] -= quantity
+                user["yen"] = user.get("yen", 0) + total_yen
+                if total_pulls > 0:
+                    user["pulls"] = min(12, user.get("pulls", 0) + total_pulls)
+
+                save(USERS_FILE, users)
 
         if available < 1:
             embed = discord.Embed(
@@ -248,32 +289,7 @@ class Economy(commands.Cog):
                              icon_url=ctx.author.display_avatar.url)
             return await ctx.send(embed=embed)
 
-        # Limit quantity to available
-        quantity = min(quantity, available)
-
-        # Calculate total rewards
-        total_yen = 0
-        total_pulls = 0
-
-        for _ in range(quantity):
-            # RNG rewards based on chest type
-            if chest_type == "vvip":
-                yen = random.randint(5000, 20000)
-                bonus_pulls = random.choice([0, 0, 0, 1])  # 25% chance
-            else:  # locker
-                yen = random.randint(1000, 10000)
-                bonus_pulls = 0
-
-            total_yen += yen
-            total_pulls += bonus_pulls
-
-        # Consume chests
-        user["chests"][chest_type] -= quantity
-        user["yen"] = user.get("yen", 0) + total_yen
-        if total_pulls > 0:
-            user["pulls"] = min(12, user.get("pulls", 0) + total_pulls)
-
-        save(USERS_FILE, users)
+        record_user(uid, user)
 
         embed = discord.Embed(
             title=f"📦 Opened {quantity}x {chest_type.upper()} Chest{'s' if quantity > 1 else ''}!",
@@ -303,19 +319,25 @@ class Economy(commands.Cog):
 
     @commands.command(name="cd", aliases=["cooldown", "cooldowns"])
     async def cd(self, ctx):
-        users = load(USERS_FILE)
         uid = str(ctx.author.id)
-        user = self.ensure_user(users, uid)
-        user = regenerate_pulls(user)
-        save(USERS_FILE, users)
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, uid)
+            user = regenerate_pulls(user)
+            save(USERS_FILE, users)
+        scheduler.schedule("pull_regen", uid, pulls_full_at(user))
 
         now = int(time.time())
         pulls = user.get("pulls", 0)
         last_pull = user.get("last_pull_regen_ts", now)
         next_pull = max(0, config.PULL_REGEN_SECONDS - (now - last_pull))
 
-        last_claim = user.get("last_claim_ts", 0)
-        daily = max(0, config.DAILY_COOLDOWN - (now - last_claim))
+        if scheduler.due_at("daily_claim", uid) is not None:
+            daily = scheduler.remaining("daily_claim", uid, now)
+        else:
+            # Claimed before the scheduler existed
+            last_claim = user.get("last_claim_ts", 0)
+            daily = max(0, config.DAILY_COOLDOWN - (now - last_claim))
 
         embed = discord.Embed(
             title="⏱️ Cooldowns",
@@ -330,6 +352,9 @@ class Economy(commands.Cog):
         pull_status = f"`{pulls}/12`" + \
             (f" (Next in: {pull_hours}h {pull_mins}m)" if next_pull >
              0 else " (Full!)")
+        full_in = scheduler.remaining("pull_regen", uid, now)
+        if full_in > 0:
+            pull_status += f"\nFull in: {full_in // 3600}h {(full_in % 3600) // 60}m"
         embed.add_field(
             name="🃏 Pulls",
             value=pull_status,
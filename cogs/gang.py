@@ -3,7 +3,10 @@ import time
 import random
 from discord.ext import commands
 from discord.ui import View, Button
-from utils.database import load, save
+from utils.database import load, save, locked
+from utils.business_income import accrue, DAY_SECONDS
+from utils.scheduler import scheduler
+from utils.leaderboard_index import record_user, record_gang, forget_gang
 import config
 import json
 
@@ -30,44 +33,34 @@ class GangInviteView(View):
                 await interaction.response.send_message("❌ Only the invited user can respond to this invitation.", ephemeral=True)
                 return
 
-            gid, gang = self.gang_cog.get_gang(self.leader.id)
-            if not gang or str(self.leader.id) != gang.get("leader") or gid != self.gid:
+            problem = None
+            with locked(GANGS_FILE):
+                gangs = load(GANGS_FILE)
+                gid, gang = self.gang_cog.get_gang(self.leader.id)
+                target_gid, target_gang = self.gang_cog.get_gang(self.member.id)
+                if not gang or str(self.leader.id) != gang.get("leader") or gid != self.gid:
+                    problem = "❌ This gang invitation is no longer valid."
+                elif len(gang.get("members", [])) >= (10 if gang.get("type", "gang") == "gang" else 50):
+                    problem = f"❌ This {gang.get('type', 'gang')} has reached its member cap."
+                elif target_gang:
+                    problem = f"❌ {self.member.display_name} is already in **{target_gang.get('name', 'a gang')}**."
+                elif str(self.member.id) in gang.get("members", []):
+                    problem = f"ℹ️ {self.member.display_name} is already a member of **{gang.get('name', 'the gang')}**."
+                else:
+                    gang = gangs[self.gid]
+                    gang.setdefault("members", []).append(str(self.member.id))
+                    save(GANGS_FILE, gangs)
+            if problem:
                 for child in self.children:
                     child.disabled = True
-                await interaction.response.edit_message(content="❌ This gang invitation is no longer valid.", view=self)
+                await interaction.response.edit_message(content=problem, view=self)
                 return
 
-            gang_type = gang.get("type", "gang")
-            max_members = 10 if gang_type == "gang" else 50
-            if len(gang.get("members", [])) >= max_members:
-                for child in self.children:
-                    child.disabled = True
-                await interaction.response.edit_message(content=f"❌ This {gang_type} has reached its member cap.", view=self)
-                return
-
-            target_gid, target_gang = self.gang_cog.get_gang(self.member.id)
-            if target_gang:
-                for child in self.children:
-                    child.disabled = True
-                await interaction.response.edit_message(content=f"❌ {self.member.display_name} is already in **{target_gang.get('name', 'a gang')}**.", view=self)
-                return
-
-            gangs = load(GANGS_FILE)
-            gang = gangs.get(self.gid, gang)
-            if str(self.member.id) in gang.get("members", []):
-                for child in self.children:
-                    child.disabled = True
-                await interaction.response.edit_message(content=f"ℹ️ {self.member.display_name} is already a member of **{gang.get('name', 'the gang')}**.", view=self)
-                return
-
-            gang.setdefault("members", []).append(str(self.member.id))
-            gangs[self.gid] = gang
-            save(GANGS_FILE, gangs)
-
-            users = load(USERS_FILE)
-            user_data = self.gang_cog.ensure_user(users, str(self.member.id))
-            user_data["gang_name"] = gang.get("name")
-            save(USERS_FILE, users)
+            with locked(USERS_FILE):
+                users = load(USERS_FILE)
+                user_data = self.gang_cog.ensure_user(users, str(self.member.id))
+                user_data["gang_name"] = gang.get("name")
+                save(USERS_FILE, users)
 
             for child in self.children:
                 child.disabled = True
@@ -104,6 +97,62 @@ class Gang(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_load(self):
+        # Income is credited lazily when a gang is read (settle_income); payout
+        # deadlines left in older schedule files are simply dropped when due
+        scheduler.register("gang_income")
+        # Gangs are shared by the cluster: only the primary worker charges upkeep
+        scheduler.register("wt_upkeep", self._on_upkeep_due, primary_only=True)
+        # One-time migration: register upkeep for agents hired before the scheduler
+        if scheduler.owns("wt_upkeep") and not scheduler.has_kind("wt_upkeep"):
+            now = int(time.time())
+            for gid, g in load(GANGS_FILE).items():
+                if g.get("defense_agent"):
+                    scheduler.schedule("wt_upkeep", gid, now + DAY_SECONDS)
+        scheduler.start()
+
+    async def _on_upkeep_due(self, items):
+        """Scheduler handler: charge hired White Tiger agents their daily_cost.
+
+        A gang whose bank can't cover the upkeep loses its defense agent.
+        """
+        agents = self.load_white_tiger_agents()
+        with locked(GANGS_FILE):
+            gangs = load(GANGS_FILE)
+            for gid, _ in items:
+                gang = gangs.get(gid)
+                if not gang or not gang.get("defense_agent"):
+                    continue
+                cost = int(agents.get(gang["defense_agent"], {}).get("daily_cost", 0))
+                self.settle_income(gang)
+                if gang.get("bank", 0) >= cost:
+                    gang["bank"] = gang.get("bank", 0) - cost
+                    scheduler.schedule("wt_upkeep", gid,
+                                       int(time.time()) + DAY_SECONDS)
+                else:
+                    print(
+                        f"Gang {gid} could not pay {cost:,} yen upkeep, dismissing {gang['defense_agent']}")
+                    gang["defense_agent"] = None
+            save(GANGS_FILE, gangs)
+
+    def settle_income(self, gang):
+        """Credit owed business income to the gang bank, computed from each `last_accrued_ts`.
+
+        Called whenever a gang is read or spent from, so no job has to pay it out.
+        Callers are responsible for saving the gang afterwards. Returns the yen credited.
+        """
+        return accrue(gang)
+
+    def _find_business(self, businesses, name):
+        """(id, business) picked by case-insensitive name, or the only one when no name is given"""
+        if len(businesses) == 1 and not name:
+            return next(iter(businesses.items()))
+        if name:
+            for bid, b in businesses.items():
+                if str(b.get('name', '')).lower() == name.lower():
+                    return bid, b
+        return None, None
+
     def get_gang(self, uid):
         data = load(GANGS_FILE)
         for gid, g in data.items():
@@ -153,9 +202,13 @@ class Gang(commands.Cog):
                 )
                 return await ctx.send(embed=embed)
 
-            gangs = load(GANGS_FILE)
-            gang = gangs.get(gid, gang)
-            gang.setdefault("exp", 0)
+            with locked(GANGS_FILE):
+                gangs = load(GANGS_FILE)
+                gang = gangs.get(gid, gang)
+                gang.setdefault("exp", 0)
+                if self.settle_income(gang):
+                    gangs[gid] = gang
+                    save(GANGS_FILE, gangs)
 
             members_count = len(gang.get("members", []))
             leader_mention = f"<@{gang['leader']}>"
@@ -231,50 +284,49 @@ class Gang(commands.Cog):
                 )
                 return await ctx.send(embed=embed)
 
-            # Check if user is already in a gang
-            gid, existing_gang = self.get_gang(ctx.author.id)
-            if existing_gang:
-                embed = discord.Embed(
-                    title="❌ Already in a Gang",
-                    description=f"You're already in **{existing_gang['name']}**!\n\nLeave your current gang first.",
-                    color=0xE74C3C
-                )
-                return await ctx.send(embed=embed)
-
-            users = load(USERS_FILE)
-            u = self.ensure_user(users, str(ctx.author.id))
-
-            if u.get("yen", 0) < config.GANG_CREATE_COST:
-                embed = discord.Embed(
-                    title="❌ Insufficient Funds",
-                    description=f"You need **{config.GANG_CREATE_COST:,}** yen to create a gang!\n\nCurrent balance: `{u.get('yen', 0):,}` yen",
-                    color=0xE74C3C
-                )
-                return await ctx.send(embed=embed)
-
-            u["yen"] -= config.GANG_CREATE_COST
-            save(USERS_FILE, users)
-
-            gid = str(int(time.time()))
-            new_gang = {
-                "id": gid,
-                "name": arg,
-                "leader": str(ctx.author.id),
-                "members": [str(ctx.author.id)],
-                "bank": 0,
-                "businesses": {},
-                "raid_logs": [],
-                "exp": 0,
-                "level": 0,
-                "type": "gang",
-            }
-            gangs = load(GANGS_FILE)
-            gangs[gid] = new_gang
-            save(GANGS_FILE, gangs)
-
-            # Update user's gang name
-            u["gang_name"] = arg
-            save(USERS_FILE, users)
+            error = None
+            with locked(USERS_FILE), locked(GANGS_FILE):
+                # Check if user is already in a gang
+                gid, existing_gang = self.get_gang(ctx.author.id)
+                users = load(USERS_FILE)
+                u = self.ensure_user(users, str(ctx.author.id))
+                if existing_gang:
+                    error = discord.Embed(
+                        title="❌ Already in a Gang",
+                        description=f"You're already in **{existing_gang['name']}**!\n\nLeave your current gang first.",
+                        color=0xE74C3C
+                    )
+                elif u.get("yen", 0) < config.GANG_CREATE_COST:
+                    error = discord.Embed(
+                        title="❌ Insufficient Funds",
+                        description=f"You need **{config.GANG_CREATE_COST:,}** yen to create a gang!\n\nCurrent balance: `{u.get('yen', 0):,}` yen",
+                        color=0xE74C3C
+                    )
+                else:
+                    u["yen"] -= config.GANG_CREATE_COST
+                    u["gang_name"] = arg
+
+                    gid = str(int(time.time()))
+                    new_gang = {
+                        "id": gid,
+                        "name": arg,
+                        "leader": str(ctx.author.id),
+                        "members": [str(ctx.author.id)],
+                        "bank": 0,
+                        "businesses": {},
+                        "raid_logs": [],
+                        "exp": 0,
+                        "level": 0,
+                        "type": "gang",
+                    }
+                    gangs = load(GANGS_FILE)
+                    gangs[gid] = new_gang
+                    save(USERS_FILE, users)
+                    save(GANGS_FILE, gangs)
+            if error is not None:
+                return await ctx.send(embed=error)
+            record_user(ctx.author.id, u)
+            record_gang(gid, new_gang)
 
             embed = discord.Embed(
                 title="✅ Gang Created!",
@@ -300,6 +352,12 @@ class Gang(commands.Cog):
                 )
                 return await ctx.send(embed=embed)
 
+            with locked(GANGS_FILE):
+                gangs = load(GANGS_FILE)
+                gang = gangs.get(gid, gang)
+                if self.settle_income(gang):
+                    save(GANGS_FILE, gangs)
+
             members_list = "\n".join(
                 [f"• <@{uid}>" + (" 👑" if uid == gang['leader'] else "") for uid in gang['members']])
 
@@ -371,15 +429,17 @@ class Gang(commands.Cog):
                 )
                 return await ctx.send(embed=embed)
 
-            gang['members'].remove(str(ctx.author.id))
-            gangs = load(GANGS_FILE)
-            gangs[gid] = gang
-            save(GANGS_FILE, gangs)
+            with locked(GANGS_FILE):
+                gangs = load(GANGS_FILE)
+                if gid in gangs and str(ctx.author.id) in gangs[gid]['members']:
+                    gangs[gid]['members'].remove(str(ctx.author.id))
+                    save(GANGS_FILE, gangs)
 
-            users = load(USERS_FILE)
-            if str(ctx.author.id) in users:
-                users[str(ctx.author.id)]["gang_name"] = None
-            save(USERS_FILE, users)
+            with locked(USERS_FILE):
+                users = load(USERS_FILE)
+                if str(ctx.author.id) in users:
+                    users[str(ctx.author.id)]["gang_name"] = None
+                    save(USERS_FILE, users)
 
             embed = discord.Embed(
                 title="✅ Left Gang",
@@ -407,20 +467,20 @@ class Gang(commands.Cog):
                 )
                 return await ctx.send(embed=embed)
 
-            gangs = load(GANGS_FILE)
-            users = load(USERS_FILE)
-
-            # Clear gang_name for all members
-            for member_id in gang.get("members", []):
-                if str(member_id) in users:
-                    users[str(member_id)]["gang_name"] = None
+            with locked(USERS_FILE), locked(GANGS_FILE):
+                gangs = load(GANGS_FILE)
+                users = load(USERS_FILE)
 
-            # Remove gang from gangs.json
-            if gid in gangs:
-                del gangs[gid]
+                # Remove gang from gangs.json, clearing gang_name for its current members
+                gang = gangs.pop(gid, gang)
+                for member_id in gang.get("members", []):
+                    if str(member_id) in users:
+                        users[str(member_id)]["gang_name"] = None
+                scheduler.cancel("wt_upkeep", gid)
 
-            save(GANGS_FILE, gangs)
-            save(USERS_FILE, users)
+                save(GANGS_FILE, gangs)
+                save(USERS_FILE, users)
+            forget_gang(gid)
 
             embed = discord.Embed(
                 title="💥 Gang Dismantled",
@@ -511,40 +571,40 @@ class Gang(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        gid, gang = self.get_gang(ctx.author.id)
-        if not gang or gang['leader'] != str(ctx.author.id):
-            embed = discord.Embed(
-                title="❌ Leader Only",
-                description="Only the gang leader can remove members!",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
-        if str(member.id) not in gang['members']:
-            embed = discord.Embed(
-                title="❌ Not a Member",
-                description=f"{member.display_name} is not in your gang!",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
-        if gang['leader'] == str(member.id):
-            embed = discord.Embed(
-                title="❌ Cannot Remove Leader",
-                description="You cannot remove yourself as leader!",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
-        gang['members'].remove(str(member.id))
-        gangs = load(GANGS_FILE)
-        gangs[gid] = gang
-        save(GANGS_FILE, gangs)
+        error = None
+        with locked(GANGS_FILE):
+            gangs = load(GANGS_FILE)
+            gid, gang = self.get_gang(ctx.author.id)
+            if not gang or gang['leader'] != str(ctx.author.id):
+                error = discord.Embed(
+                    title="❌ Leader Only",
+                    description="Only the gang leader can remove members!",
+                    color=0xE74C3C
+                )
+            elif str(member.id) not in gang['members']:
+                error = discord.Embed(
+                    title="❌ Not a Member",
+                    description=f"{member.display_name} is not in your gang!",
+                    color=0xE74C3C
+                )
+            elif gang['leader'] == str(member.id):
+                error = discord.Embed(
+                    title="❌ Cannot Remove Leader",
+                    description="You cannot remove yourself as leader!",
+                    color=0xE74C3C
+                )
+            else:
+                gang = gangs[gid]
+                gang['members'].remove(str(member.id))
+                save(GANGS_FILE, gangs)
+        if error is not None:
+            return await ctx.send(embed=error)
 
-        users = load(USERS_FILE)
-        if str(member.id) in users:
-            users[str(member.id)]["gang_name"] = None
-        save(USERS_FILE, users)
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            if str(member.id) in users:
+                users[str(member.id)]["gang_name"] = None
+                save(USERS_FILE, users)
 
         embed = discord.Embed(
             title="✅ Member Removed",
@@ -563,15 +623,6 @@ class Gang(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        gid, gang = self.get_gang(ctx.author.id)
-        if not gang or gang['leader'] != str(ctx.author.id):
-            embed = discord.Embed(
-                title="❌ Leader Only",
-                description="Only the gang leader can pay members!",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
         if amount <= 0:
             embed = discord.Embed(
                 title="❌ Invalid Amount",
@@ -580,23 +631,36 @@ class Gang(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        if gang['bank'] < amount:
-            embed = discord.Embed(
-                title="❌ Insufficient Gang Funds",
-                description=f"Gang bank has `{gang['bank']:,}` yen, but you need `{amount:,}` yen!",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
-        gang['bank'] -= amount
-        users = load(USERS_FILE)
-        user_data = self.ensure_user(users, str(member.id))
-        user_data['yen'] = user_data.get('yen', 0) + amount
-        save(USERS_FILE, users)
-
-        gangs_data = load(GANGS_FILE)
-        gangs_data[gid] = gang
-        save(GANGS_FILE, gangs_data)
+        error = None
+        with locked(USERS_FILE), locked(GANGS_FILE):
+            gangs_data = load(GANGS_FILE)
+            gid, gang = self.get_gang(ctx.author.id)
+            if not gang or gang['leader'] != str(ctx.author.id):
+                error = discord.Embed(
+                    title="❌ Leader Only",
+                    description="Only the gang leader can pay members!",
+                    color=0xE74C3C
+                )
+            else:
+                gang = gangs_data[gid]
+                self.settle_income(gang)
+                if gang['bank'] < amount:
+                    error = discord.Embed(
+                        title="❌ Insufficient Gang Funds",
+                        description=f"Gang bank has `{gang['bank']:,}` yen, but you need `{amount:,}` yen!",
+                        color=0xE74C3C
+                    )
+                else:
+                    gang['bank'] -= amount
+                    users = load(USERS_FILE)
+                    user_data = self.ensure_user(users, str(member.id))
+                    user_data['yen'] = user_data.get('yen', 0) + amount
+                    save(USERS_FILE, users)
+                # Income settled above is kept even when the payment is refused
+                save(GANGS_FILE, gangs_data)
+        if error is not None:
+            return await ctx.send(embed=error)
+        record_user(member.id, user_data)
 
         embed = discord.Embed(
             title="💸 Payment Sent",
@@ -619,33 +683,35 @@ class Gang(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        gid, gang = self.get_gang(ctx.author.id)
-        if not gang:
-            embed = discord.Embed(
-                title="❌ Not in a Gang",
-                description="You must be in a gang to add funds to its bank.",
-                color=0xE74C3C,
-            )
-            return await ctx.send(embed=embed)
-
-        users = load(USERS_FILE)
-        user = self.ensure_user(users, str(ctx.author.id))
-        if user.get("yen", 0) < amount:
-            embed = discord.Embed(
-                title="❌ Not Enough Yen",
-                description=f"You don't have enough yen to deposit that amount. Current balance: `{user.get('yen', 0):,}` yen.",
-                color=0xE74C3C,
-            )
-            return await ctx.send(embed=embed)
-
-        user["yen"] = user.get("yen", 0) - amount
-        users[str(ctx.author.id)] = user
-        save(USERS_FILE, users)
+        error = None
+        with locked(USERS_FILE), locked(GANGS_FILE):
+            gangs = load(GANGS_FILE)
+            users = load(USERS_FILE)
+            gid, gang = self.get_gang(ctx.author.id)
+            user = self.ensure_user(users, str(ctx.author.id))
+            if not gang:
+                error = discord.Embed(
+                    title="❌ Not in a Gang",
+                    description="You must be in a gang to add funds to its bank.",
+                    color=0xE74C3C,
+                )
+            elif user.get("yen", 0) < amount:
+                error = discord.Embed(
+                    title="❌ Not Enough Yen",
+                    description=f"You don't have enough yen to deposit that amount. Current balance: `{user.get('yen', 0):,}` yen.",
+                    color=0xE74C3C,
+                )
+            else:
+                user["yen"] = user.get("yen", 0) - amount
+                save(USERS_FILE, users)
 
-        gang["bank"] = gang.get("bank", 0) + amount
-        gangs = load(GANGS_FILE)
-        gangs[gid] = gang
-        save(GANGS_FILE, gangs)
+                gang = gangs[gid]
+                self.settle_income(gang)
+                gang["bank"] = gang.get("bank", 0) + amount
+                save(GANGS_FILE, gangs)
+        if error is not None:
+            return await ctx.send(embed=error)
+        record_user(ctx.author.id, user)
 
         embed = discord.Embed(
             title="🏦 Funds Added to Gang Bank",
@@ -668,58 +734,61 @@ class Gang(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        gid, gang = self.get_gang(ctx.author.id)
-        if not gang or gang['leader'] != str(ctx.author.id):
-            embed = discord.Embed(
-                title="❌ Leader Only",
-                description="Only the gang leader can create businesses!",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
-        # Ensure businesses is a dict (migrate from old list format if needed)
-        if isinstance(gang.get('businesses', {}), list):
-            migrated = {}
-            for old in gang['businesses']:
-                if isinstance(old, dict):
-                    bid_old = old.get('id') or f"b_{int(time.time())}"
-                    migrated[bid_old] = {
-                        "name": old.get("name", "Unknown"),
-                        "income": old.get("income", 0),
-                        "is_stolen": old.get("is_stolen", False),
+        error = None
+        with locked(GANGS_FILE):
+            gangs_data = load(GANGS_FILE)
+            gid, gang = self.get_gang(ctx.author.id)
+            if not gang or gang['leader'] != str(ctx.author.id):
+                error = discord.Embed(
+                    title="❌ Leader Only",
+                    description="Only the gang leader can create businesses!",
+                    color=0xE74C3C
+                )
+            else:
+                gang = gangs_data[gid]
+                # Ensure businesses is a dict (migrate from old list format if needed)
+                if isinstance(gang.get('businesses', {}), list):
+                    migrated = {}
+                    for old in gang['businesses']:
+                        if isinstance(old, dict):
+                            bid_old = old.get('id') or f"b_{int(time.time())}"
+                            migrated[bid_old] = {
+                                "name": old.get("name", "Unknown"),
+                                "income": old.get("income", 0),
+                                "is_stolen": old.get("is_stolen", False),
+                                "last_accrued_ts": old.get("last_accrued_ts"),
+                            }
+                    gang['businesses'] = migrated
+
+                cost = 100_000
+                if len(gang['businesses']) >= 2:
+                    error = discord.Embed(
+                        title="❌ Business Limit Reached",
+                        description="Maximum 2 businesses per gang!",
+                        color=0xE74C3C
+                    )
+                else:
+                    self.settle_income(gang)
+                    if gang.get("bank", 0) < cost:
+                        error = discord.Embed(
+                            title="❌ Insufficient Gang Funds",
+                            description=f"Your gang bank needs **{cost:,}** yen to buy a new business. Current bank: `{gang.get('bank', 0):,}` yen.",
+                            color=0xE74C3C,
+                        )
+                if error is None:
+                    gang["bank"] = gang.get("bank", 0) - cost
+
+                    income = random.choice([25000, 40000, 50000, 60000])
+                    bid = f"b_{int(time.time())}"
+                    gang.setdefault('businesses', {})[bid] = {
+                        "name": name,
+                        "income": income,
+                        "is_stolen": False,
+                        "last_accrued_ts": int(time.time()),
                     }
-            gang['businesses'] = migrated
-
-        if len(gang['businesses']) >= 2:
-            embed = discord.Embed(
-                title="❌ Business Limit Reached",
-                description="Maximum 2 businesses per gang!",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
-        cost = 100_000
-        if gang.get("bank", 0) < cost:
-            embed = discord.Embed(
-                title="❌ Insufficient Gang Funds",
-                description=f"Your gang bank needs **{cost:,}** yen to buy a new business. Current bank: `{gang.get('bank', 0):,}` yen.",
-                color=0xE74C3C,
-            )
-            return await ctx.send(embed=embed)
-
-        gang["bank"] = gang.get("bank", 0) - cost
-
-        income = random.choice([25000, 40000, 50000, 60000])
-        bid = f"b_{int(time.time())}"
-        gang.setdefault('businesses', {})[bid] = {
-            "name": name,
-            "income": income,
-            "is_stolen": False,
-        }
-
-        gangs_data = load(GANGS_FILE)
-        gangs_data[gid] = gang
-        save(GANGS_FILE, gangs_data)
+                    save(GANGS_FILE, gangs_data)
+        if error is not None:
+            return await ctx.send(embed=error)
 
         embed = discord.Embed(
             title="🏢 Business Created!",
@@ -732,112 +801,95 @@ class Gang(commands.Cog):
                         value=f"`{income:,}` yen/day", inline=True)
         embed.add_field(name="📊 Total Businesses",
                         value=f"`{len(gang['businesses'])}/2`", inline=True)
-        embed.set_footer(text="Businesses generate income daily!")
+        embed.set_footer(
+            text="Business income is credited to the gang bank every hour!")
         await ctx.send(embed=embed)
 
     @commands.command(name="businessrework", aliases=["bre"])
     async def business_rework(self, ctx, *, name: str = None):
         """Rework one of your gang businesses to reroll its income. Usage: ls businessrework [business name]"""
-        gid, gang = self.get_gang(ctx.author.id)
-        if not gang or gang['leader'] != str(ctx.author.id):
-            embed = discord.Embed(
-                title="❌ Leader Only",
-                description="Only the gang leader can rework businesses!",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
-        # Cost: 100,000 yen from leader's personal balance
-        users = load(USERS_FILE)
-        leader = self.ensure_user(users, str(ctx.author.id))
-        cost = 100_000
-        if leader.get("yen", 0) < cost:
-            embed = discord.Embed(
-                title="❌ Not Enough Yen",
-                description=f"You need **{cost:,}** yen to rework a business!\n\nCurrent balance: `{leader.get('yen', 0):,}` yen",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
-        leader["yen"] = leader.get("yen", 0) - cost
-        users[str(ctx.author.id)] = leader
-        save(USERS_FILE, users)
-
-        # Ensure businesses is a dict (migrate from old list format if needed)
-        if isinstance(gang.get('businesses', {}), list):
-            migrated = {}
-            for old in gang['businesses']:
-                if isinstance(old, dict):
-                    bid_old = old.get('id') or f"b_{int(time.time())}"
-                    migrated[bid_old] = {
-                        "name": old.get("name", "Unknown"),
-                        "income": old.get("income", 0),
-                        "is_stolen": old.get("is_stolen", False),
-                    }
-            gang['businesses'] = migrated
-
-        businesses = gang.get('businesses', {})
-        if not businesses:
-            embed = discord.Embed(
-                title="❌ No Businesses",
-                description="Your gang has no businesses to rework. Create one first with `ls business_create <name>`.",
-                color=0xE74C3C
-            )
-            return await ctx.send(embed=embed)
-
-        # Select target business
-        target_id = None
-        target_biz = None
-
-        # If only one business and no name provided, use it
-        if len(businesses) == 1 and not name:
-            target_id, target_biz = next(iter(businesses.items()))
-        else:
-            if not name:
-                # Ask user to specify which business
-                biz_names = ", ".join(
-                    f"**{b['name']}**" for b in businesses.values())
-                embed = discord.Embed(
-                    title="❌ Specify Business",
-                    description=f"You have multiple businesses. Please specify which one to rework.\n\nAvailable: {biz_names}",
+        error = None
+        with locked(USERS_FILE), locked(GANGS_FILE):
+            gangs_data = load(GANGS_FILE)
+            users = load(USERS_FILE)
+            gid, gang = self.get_gang(ctx.author.id)
+            # Cost: 100,000 yen from leader's personal balance
+            leader = self.ensure_user(users, str(ctx.author.id))
+            cost = 100_000
+            if not gang or gang['leader'] != str(ctx.author.id):
+                error = discord.Embed(
+                    title="❌ Leader Only",
+                    description="Only the gang leader can rework businesses!",
                     color=0xE74C3C
                 )
-                return await ctx.send(embed=embed)
-
-            # Case-insensitive match on business name
-            name_lower = name.lower()
-            for bid, b in businesses.items():
-                if str(b.get('name', '')).lower() == name_lower:
-                    target_id, target_biz = bid, b
-                    break
-
-            if target_biz is None:
-                embed = discord.Embed(
-                    title="❌ Business Not Found",
-                    description=f"No business named **{name}** was found in your gang.",
+            elif leader.get("yen", 0) < cost:
+                error = discord.Embed(
+                    title="❌ Not Enough Yen",
+                    description=f"You need **{cost:,}** yen to rework a business!\n\nCurrent balance: `{leader.get('yen', 0):,}` yen",
                     color=0xE74C3C
                 )
-                return await ctx.send(embed=embed)
-
-        old_income = int(target_biz.get('income', 0))
-
-        # Reroll income: values between 25k and 60k (using existing high tiers)
-        possible_incomes = [25000, 40000, 50000, 60000]
-        new_income = random.choice(possible_incomes)
-        # Try to avoid rolling the exact same income if possible
-        if len(possible_incomes) > 1:
-            attempts = 0
-            while new_income == old_income and attempts < 5:
+            else:
+                gang = gangs_data[gid]
+                # Ensure businesses is a dict (migrate from old list format if needed)
+                if isinstance(gang.get('businesses', {}), list):
+                    migrated = {}
+                    for old in gang['businesses']:
+                        if isinstance(old, dict):
+                            bid_old = old.get('id') or f"b_{int(time.time())}"
+                            migrated[bid_old] = {
+                                "name": old.get("name", "Unknown"),
+                                "income": old.get("income", 0),
+                                "is_stolen": old.get("is_stolen", False),
+                                "last_accrued_ts": old.get("last_accrued_ts"),
+                            }
+                    gang['businesses'] = migrated
+
+                businesses = gang.get('businesses', {})
+                _, target_biz = self._find_business(businesses, name)
+                if not businesses:
+                    error = discord.Embed(
+                        title="❌ No Businesses",
+                        description="Your gang has no businesses to rework. Create one first with `ls business_create <name>`.",
+                        color=0xE74C3C
+                    )
+                elif not name and target_biz is None:
+                    # Ask user to specify which business
+                    biz_names = ", ".join(
+                        f"**{b['name']}**" for b in businesses.values())
+                    error = discord.Embed(
+                        title="❌ Specify Business",
+                        description=f"You have multiple businesses. Please specify which one to rework.\n\nAvailable: {biz_names}",
+                        color=0xE74C3C
+                    )
+                elif target_biz is None:
+                    error = discord.Embed(
+                        title="❌ Business Not Found",
+                        description=f"No business named **{name}** was found in your gang.",
+                        color=0xE74C3C
+                    )
+            if error is None:
+                leader["yen"] = leader.get("yen", 0) - cost
+
+                # Pay out what was earned at the old rate before changing it
+                self.settle_income(gang)
+                old_income = int(target_biz.get('income', 0))
+
+                # Reroll income: values between 25k and 60k (using existing high tiers)
+                possible_incomes = [25000, 40000, 50000, 60000]
                 new_income = random.choice(possible_incomes)
-                attempts += 1
-
-        target_biz['income'] = new_income
-        businesses[target_id] = target_biz
-        gang['businesses'] = businesses
-
-        gangs_data = load(GANGS_FILE)
-        gangs_data[gid] = gang
-        save(GANGS_FILE, gangs_data)
+                # Try to avoid rolling the exact same income if possible
+                if len(possible_incomes) > 1:
+                    attempts = 0
+                    while new_income == old_income and attempts < 5:
+                        new_income = random.choice(possible_incomes)
+                        attempts += 1
+
+                target_biz['income'] = new_income
+                save(USERS_FILE, users)
+                save(GANGS_FILE, gangs_data)
+        if error is not None:
+            return await ctx.send(embed=error)
+        record_user(ctx.author.id, leader)
 
         embed = discord.Embed(
             title="🔁 Business Reworked",
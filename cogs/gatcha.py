@@ -5,8 +5,12 @@ import time
 import config
 from discord.ext import commands
 from discord.ui import View, Button, button
-from utils.database import load, save
-from utils.game_math import regenerate_pulls
+from utils.database import load, save, locked
+from utils.game_math import regenerate_pulls, pulls_full_at
+from utils.scheduler import scheduler
+from utils.patrons import patrons
+from utils.outbox import outbox, LOW
+from utils.metrics import registry, in_flight
 
 USERS_FILE = "data/users.json"
 CARDS_FILE = "data/cards.json"
@@ -14,20 +18,23 @@ RARITIES_FILE = "data/rarities.json"
 BOSSES_FILE = "data/bosses.json"
 EMOJI_FILE = "data/emoji.json"
 
+# Past these the pull skips the animation and answers with a single message
+QUICK_PULL_OUTBOX_DEPTH = 20  # queued outbound sends/edits
+QUICK_PULL_IN_FLIGHT = 25  # commands (running or queued) and View callbacks running
+
+pull_modes = registry.counter(
+    "gacha_pulls_total", "Pulls by presentation (animated, or quick and why)", ["mode"])
+
 
 def has_patreon_role(member):
-    """Check if member has any patreon role or is marked as a patron in the database"""
+    """Check if member has any patreon role or is marked as a patron in the registry"""
     if not member:
         return False
 
     try:
-        # First check database
-        users = load(USERS_FILE)
-        uid = str(member.id)
-        if uid in users and "patreon" in users[uid]:
-            # Check if the subscription is still valid
-            if users[uid]["patreon"].get("expires_at", 0) > time.time():
-                return True
+        # First check the patron registry (no users.json load)
+        if patrons.is_patron(member.id):
+            return True
 
         # Then check roles
         if hasattr(member, 'roles'):
@@ -51,6 +58,7 @@ class PullAgainView(View):
 class Gacha(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        scheduler.register("pull_regen")  # cooldown marker
 
     def ensure_user(self, users, uid):
         """Ensure user exists in database"""
@@ -78,6 +86,16 @@ class Gacha(commands.Cog):
                 users[uid]["last_pull_regen_ts"] = int(time.time())
         return users[uid]
 
+    def quick_pull_reason(self, user):
+        """Why this pull should skip the animation ("setting", "outbox", "load"), or None"""
+        if user.get("quick_pull"):
+            return "setting"
+        if outbox.depth >= QUICK_PULL_OUTBOX_DEPTH:
+            return "outbox"
+        if in_flight() >= QUICK_PULL_IN_FLIGHT:
+            return "load"
+        return None
+
     def get_card_type(self, stats):
         """Determine card type based on stats"""
         attack = stats.get('attack', 0)
@@ -104,24 +122,39 @@ class Gacha(commands.Cog):
     @commands.command(name="pull")
     async def pull(self, ctx):
         """Summon a character! Usage: ls pull"""
-        users = load(USERS_FILE)
+        cards_dict = load(CARDS_FILE)
+        rarities = load(RARITIES_FILE)
+
+        if not cards_dict:
+            embed = discord.Embed(
+                title="❌ No Cards Available",
+                description="Card database is empty! Please add cards first.",
+                color=0xE74C3C
+            )
+            return await ctx.send(embed=embed)
+
         uid = str(ctx.author.id)
-        user = self.ensure_user(users, uid)
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, uid)
 
-        if "max_pulls" not in user:
-            user["max_pulls"] = config.MAX_PULLS
+            if "max_pulls" not in user:
+                user["max_pulls"] = config.MAX_PULLS
 
-        user = regenerate_pulls(user)
+            user = regenerate_pulls(user)
 
-        max_pulls = user["max_pulls"]
-        if user.get("pulls", 0) > max_pulls:
-            user["pulls"] = max_pulls
-            user["last_pull_regen_ts"] = int(time.time())
+            max_pulls = user["max_pulls"]
+            if user.get("pulls", 0) > max_pulls:
+                user["pulls"] = max_pulls
+                user["last_pull_regen_ts"] = int(time.time())
 
-        users[uid] = user
-        save(USERS_FILE, users)
+            # Spend the pull now, so pulls started meanwhile (here or on another worker) see it
+            current_pulls = user.get("pulls", 0)
+            if current_pulls > 0:
+                user["pulls"] -= 1
+            users[uid] = user
+            save(USERS_FILE, users)
 
-        current_pulls = user.get("pulls", 0)
         if current_pulls <= 0:
             embed = discord.Embed(
                 title="❌ Out of Pulls!",
@@ -132,29 +165,34 @@ class Gacha(commands.Cog):
                              icon_url=ctx.author.display_avatar.url)
             return await ctx.send(embed=embed)
 
-        # Animation
-        embed = discord.Embed(
-            title="✨ Summoning Character...",
-            description="The summoning orb is glowing...",
-            color=0x5865F2
-        )
-        embed.set_author(name=ctx.author.display_name,
-                         icon_url=ctx.author.display_avatar.url)
-        print(f"Using GIF URL: {config.IMG_SUMMON_ORB}")
-        embed.set_image(url=config.IMG_SUMMON_ORB)
-        embed.set_footer(text="Summoning in progress...")
-        try:
-            msg = await ctx.send(embed=embed)
-        except Exception as e:
-            print(f"Error sending embed with GIF: {e}")
-            # Fallback without GIF
-            embed.remove_image()
-            msg = await ctx.send(embed=embed)
-
-        await asyncio.sleep(random.uniform(1.0, 2.0))
-
-        # Logic
-        user["pulls"] -= 1
+        # Quick pulls (opted in, or the bot is busy) skip the animation and the
+        # sleep; the result then goes out as a single message
+        quick = self.quick_pull_reason(user)
+        pull_modes.inc(f"quick_{quick}" if quick else "animated")
+        msg = None
+        if not quick:
+            embed = discord.Embed(
+                title="✨ Summoning Character...",
+                description="The summoning orb is glowing...",
+                color=0x5865F2
+            )
+            embed.set_author(name=ctx.author.display_name,
+                             icon_url=ctx.author.display_avatar.url)
+            embed.set_image(url=config.IMG_SUMMON_ORB)
+            embed.set_footer(text="Summoning in progress...")
+            # The animation is cosmetic: under backlog the outbox drops it (msg is None)
+            # and the result is sent as a new message instead of an edit
+            try:
+                msg = await outbox.send(ctx.channel, priority=LOW, embed=embed)
+            except Exception as e:
+                print(f"Error sending embed with GIF: {e}")
+                # Fallback without GIF
+                embed.remove_image()
+                msg = await outbox.send(ctx.channel, priority=LOW, embed=embed)
+
+            # Nothing to animate if the outbox dropped it
+            if msg is not None:
+                await asyncio.sleep(random.uniform(1.0, 2.0))
 
         # 1. Ticket Logic (2.5% Chance)
         ticket_drop = None
@@ -172,27 +210,10 @@ class Gacha(commands.Cog):
                         if r <= curr:
                             ticket_drop = b
                             break
-
-            if ticket_drop:
-                user.setdefault("tickets", {})
-                tid = f"{ticket_drop.get('name', '').lower().replace(' ', '_')}_ticket"
-                user["tickets"][tid] = user["tickets"].get(tid, 0) + 1
         except Exception as e:
             print(f"Error loading bosses: {e}")
 
         # 2. Card Logic
-        cards_dict = load(CARDS_FILE)
-        rarities = load(RARITIES_FILE)
-
-        if not cards_dict:
-            embed = discord.Embed(
-                title="❌ No Cards Available",
-                description="Card database is empty! Please add cards first.",
-                color=0xE74C3C
-            )
-            await msg.edit(embed=embed)
-            return
-
         cards_list = list(cards_dict.values())
         weights = []
         for card in cards_list:
@@ -204,30 +225,41 @@ class Gacha(commands.Cog):
         chosen = random.choices(cards_list, weights=weights, k=1)[0]
         chosen_rarity = chosen.get('rarity', 'C')
         rarity_info = rarities.get(chosen_rarity, {})
-
-        user.setdefault("cards", [])
-        user.setdefault("unlocked", [])
-        is_new = False
         card_name = chosen.get('name', 'Unknown')
 
-        if card_name not in user.get("unlocked", []):
-            is_new = True
-            user.setdefault("unlocked", []).append(card_name)
-            user["cards"].append({
-                "name": card_name,
-                "rarity": chosen_rarity,
-                "level": 1,
-                "exp": 0,
-                "evo": 0,
-                "aura": 0
-            })
-        else:
-            user.setdefault("fragments", {})
-            user["fragments"][card_name] = user["fragments"].get(
-                card_name, 0) + 1
+        # Apply the rewards to a fresh copy: the record loaded above is stale after
+        # the animation, and other commands (or cluster workers) may have saved since
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, uid)
 
-        users[uid] = user
-        save(USERS_FILE, users)
+            if ticket_drop:
+                user.setdefault("tickets", {})
+                tid = f"{ticket_drop.get('name', '').lower().replace(' ', '_')}_ticket"
+                user["tickets"][tid] = user["tickets"].get(tid, 0) + 1
+
+            user.setdefault("cards", [])
+            user.setdefault("unlocked", [])
+            is_new = False
+
+            if card_name not in user.get("unlocked", []):
+                is_new = True
+                user.setdefault("unlocked", []).append(card_name)
+                user["cards"].append({
+                    "name": card_name,
+                    "rarity": chosen_rarity,
+                    "level": 1,
+                    "exp": 0,
+                    "evo": 0,
+                    "aura": 0
+                })
+            else:
+                user.setdefault("fragments", {})
+                user["fragments"][card_name] = user["fragments"].get(
+                    card_name, 0) + 1
+
+            save(USERS_FILE, users)
+        scheduler.schedule("pull_regen", uid, pulls_full_at(user))
 
         # Result Embed
         try:
@@ -283,7 +315,37 @@ class Gacha(commands.Cog):
             footer_parts.append(f"Shards: {frag_count}")
 
         final_embed.set_footer(text=" • ".join(footer_parts))
-        await msg.edit(embed=final_embed, view=None)
+        await self._show_result(ctx, msg, embed=final_embed, view=None)
+
+    async def _show_result(self, ctx, msg, **kwargs):
+        """Replace the animation with the result, or send it if the animation was dropped"""
+        if msg is None:
+            kwargs.pop("view", None)
+            return await outbox.send(ctx.channel, **kwargs)
+        return await outbox.edit(msg, **kwargs)
+
+    @commands.command(name="quickpull", aliases=["qp"])
+    async def quickpull(self, ctx, setting: str = None):
+        """Toggle pulling without the summoning animation. Usage: ls quickpull [on|off]"""
+        if setting is not None and setting.lower() not in ("on", "off"):
+            return await ctx.send("❌ Usage: `ls quickpull [on|off]`")
+
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = self.ensure_user(users, str(ctx.author.id))
+            enabled = not user.get("quick_pull", False) if setting is None else setting.lower() == "on"
+            user["quick_pull"] = enabled
+            save(USERS_FILE, users)
+
+        embed = discord.Embed(
+            title="⚡ Quick Pull",
+            description=("Quick pull is **on**: `ls pull` shows your card right away."
+                         if enabled else "Quick pull is **off**: `ls pull` plays the summoning animation."),
+            color=0x2ECC71 if enabled else 0x5865F2
+        )
+        embed.set_author(name=ctx.author.display_name,
+                         icon_url=ctx.author.display_avatar.url)
+        await ctx.send(embed=embed)
 
 
 async def setup(bot):
@@ -57,6 +57,7 @@ class HelpCategorySelect(Select):
                 name="🎴 Gacha",
                 value=(
                     "`ls pull` - Summon a character\n"
+                    "`ls quickpull` - Toggle pulls without the summoning animation\n"
                     "`ls mp` - Mass pull all remaining pulls (Patreon only)\n"
                     "`ls inv` - View your collection\n"
                     "`ls ci` - Quick card inventory\n"
@@ -150,7 +151,7 @@ class HelpCategorySelect(Select):
                     "`ls profile` - View profile\n"
                     "`ls inv` - View cards\n"
                     "`ls finv` - View fragments\n"
-                    "`ls lb` - Leaderboard"
+                    "`ls lb [yen|wins|streak|aura|level|gang] [server]` - Leaderboards"
                 ),
                 inline=False,
             )
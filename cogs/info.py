@@ -1,7 +1,7 @@
 import discord
 from discord.ext import commands
 from discord.ui import View, Select, Button
-from utils.database import load, save
+from utils.database import load, save, locked
 from utils.game_math import compute_stats
 
 USERS_FILE = "data/users.json"
@@ -545,9 +545,10 @@ class Info(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        users = load(USERS_FILE)
-        user = ensure_user(users, str(ctx.author.id))
-        save(USERS_FILE, users)
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = ensure_user(users, str(ctx.author.id))
+            save(USERS_FILE, users)
 
         user_cards = user.get("cards", [])
 
@@ -602,9 +603,10 @@ class Info(commands.Cog):
 
     @commands.command(name="inv", aliases=["inventory", "cards"])
     async def inventory(self, ctx):
-        users = load(USERS_FILE)
-        user = ensure_user(users, str(ctx.author.id))
-        save(USERS_FILE, users)
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = ensure_user(users, str(ctx.author.id))
+            save(USERS_FILE, users)
         cards = user.get("cards", [])
         tickets = user.get("tickets", {})
         chests = user.get("chests", {})
@@ -716,9 +718,10 @@ class Info(commands.Cog):
     @commands.command(name="finv", aliases=["fragments", "fragment", "shards"])
     async def fragment_inventory(self, ctx):
         """Interactive fragment inventory with rarity selector. Usage: ls finv"""
-        users = load(USERS_FILE)
-        user = ensure_user(users, str(ctx.author.id))
-        save(USERS_FILE, users)
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = ensure_user(users, str(ctx.author.id))
+            save(USERS_FILE, users)
         fragments = user.get("fragments", {})
 
         if not fragments or all(count == 0 for count in fragments.values()):
@@ -858,18 +861,42 @@ class Info(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        users = load(USERS_FILE)
-        uid = str(ctx.author.id)
-        user = ensure_user(users, uid)
-        save(USERS_FILE, users)
-
-        # 1. Find Card (Simple Search)
-        target_card = None
-        for c in user.get("cards", []):
-            if card_name.lower() in c['name'].lower():
-                target_card = c
+        # 1. Find Item
+        weapons = load(WEAPONS_FILE)
+        item_id = None
+        for wid, w in weapons.items():
+            if item_name.lower() in w['name'].lower():
+                item_id = wid
                 break
 
+        uid = str(ctx.author.id)
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = ensure_user(users, uid)
+
+            # 2. Find Card (Simple Search)
+            target_card = None
+            for c in user.get("cards", []):
+                if card_name.lower() in c['name'].lower():
+                    target_card = c
+                    break
+
+            inv = user.get("equipment", {})
+            owned = item_id is not None and inv.get(item_id, 0) >= 1
+
+            # 3. Equip Logic
+            old_item_name = None
+            if target_card and owned:
+                if target_card.get("equipped_item_id"):
+                    old = target_card["equipped_item_id"]
+                    old_item_name = weapons.get(old, {}).get('name', 'Unknown')
+                    inv[old] = inv.get(old, 0) + 1  # Return old item
+
+                target_card["equipped_item_id"] = item_id
+                inv[item_id] -= 1
+
+            save(USERS_FILE, users)
+
         if not target_card:
             embed = discord.Embed(
                 title="❌ Card Not Found",
@@ -878,14 +905,6 @@ class Info(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        # 2. Find Item in Inventory
-        weapons = load(WEAPONS_FILE)
-        item_id = None
-        for wid, w in weapons.items():
-            if item_name.lower() in w['name'].lower():
-                item_id = wid
-                break
-
         if not item_id:
             embed = discord.Embed(
                 title="❌ Item Not Found",
@@ -894,8 +913,7 @@ class Info(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        inv = user.get("equipment", {})
-        if inv.get(item_id, 0) < 1:
+        if not owned:
             embed = discord.Embed(
                 title="❌ Item Not Owned",
                 description=f"You don't own **{weapons[item_id]['name']}**!\n\nGet items from raid drops.",
@@ -903,18 +921,6 @@ class Info(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        # 3. Equip Logic
-        old_item_name = None
-        if target_card.get("equipped_item_id"):
-            old = target_card["equipped_item_id"]
-            old_item_name = weapons.get(old, {}).get('name', 'Unknown')
-            inv[old] = inv.get(old, 0) + 1  # Return old item
-
-        target_card["equipped_item_id"] = item_id
-        inv[item_id] -= 1
-
-        save(USERS_FILE, users)
-
         embed = discord.Embed(
             title="✅ Equipment Updated",
             description=f"**{weapons[item_id]['name']}** has been equipped to **{target_card['name']}**!",
@@ -927,9 +933,10 @@ class Info(commands.Cog):
 
     @commands.command(name="profile", aliases=["p", "stats"])
     async def profile(self, ctx):
-        users = load(USERS_FILE)
-        user = ensure_user(users, str(ctx.author.id))
-        save(USERS_FILE, users)
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = ensure_user(users, str(ctx.author.id))
+            save(USERS_FILE, users)
 
         wins = user.get("wins", 0)
         streak = user.get("streak", 0)
@@ -972,9 +979,10 @@ class Info(commands.Cog):
     @commands.command(name="tickets", aliases=["ticket"])
     async def ticket_inventory(self, ctx):
         """View your boss tickets. Usage: ls tickets or ls ticket"""
-        users = load(USERS_FILE)
-        user = ensure_user(users, str(ctx.author.id))
-        save(USERS_FILE, users)
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = ensure_user(users, str(ctx.author.id))
+            save(USERS_FILE, users)
 
         tickets = user.get("tickets", {})
 
@@ -1,48 +1,160 @@
 import discord
 from discord.ext import commands
+from discord.ui import View, Button
 from utils.database import load
+from utils.leaderboard_index import boards, ensure_loaded, guild_ranking, cached_guild_ranking
+from utils.leaderboard_snapshots import snapshots
+from utils.member_cache import member_cache
 
-USERS_FILE = "data/users.json"
+GANGS_FILE = "data/gangs.json"
+PAGE_SIZE = 10
+
+# Board name -> (title, unit shown after the score)
+BOARDS = {
+    "yen": ("Richest Players", "💴 `{:,}` yen"),
+    "wins": ("Most Wins", "🏆 `{:,}` wins"),
+    "streak": ("Longest Win Streaks", "🔥 `{:,}` streak"),
+    "aura": ("Highest Total Aura", "✨ `{:,}` aura"),
+    "level": ("Highest Account Level", "⭐ Level `{:,}`"),
+    "gang": ("Top Gangs & Crews", "📈 `{:,}` EXP"),
+}
+BOARD_ALIASES = {
+    "money": "yen", "bal": "yen", "win": "wins", "lvl": "level",
+    "account": "level", "exp": "gang", "gangs": "gang", "crew": "gang", "crews": "gang",
+}
+SERVER_SCOPES = ("server", "local", "guild")
+
+
+class LeaderboardView(View):
+    """Cursor-based pager over a ranked index (global or per-server)"""
+
+    def __init__(self, cog, ctx, board, index, local):
+        super().__init__(timeout=120)
+        self.cog = cog
+        self.ctx = ctx
+        self.board = board
+        self.index = index
+        self.local = local
+        self.cursors = [None]  # cursor that produced each visited page
+        self.rows, self.offset = index.page(PAGE_SIZE)
+
+        self.prev_button = Button(label="⬅️ Previous", style=discord.ButtonStyle.primary)
+        self.next_button = Button(label="➡️ Next", style=discord.ButtonStyle.primary)
+        self.prev_button.callback = self.prev_callback
+        self.next_button.callback = self.next_callback
+        self.add_item(self.prev_button)
+        self.add_item(self.next_button)
+        self.update_buttons()
+
+    def update_buttons(self):
+        self.prev_button.disabled = len(self.cursors) <= 1
+        self.next_button.disabled = self.offset + len(self.rows) >= len(self.index)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user != self.ctx.author:
+            await interaction.response.send_message("❌ This isn't your leaderboard!", ephemeral=True)
+            return False
+        return True
+
+    async def show(self, interaction):
+        self.update_buttons()
+        embed = self.cog.build_embed(self.ctx, self.board, self.index, self.rows, self.offset, self.local)
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    async def next_callback(self, interaction: discord.Interaction):
+        if self.rows:
+            cursor = self.rows[-1]
+            self.cursors.append(cursor)
+            self.rows, self.offset = self.index.page(PAGE_SIZE, cursor)
+        await self.show(interaction)
+
+    async def prev_callback(self, interaction: discord.Interaction):
+        if len(self.cursors) > 1:
+            self.cursors.pop()
+            self.rows, self.offset = self.index.page(PAGE_SIZE, self.cursors[-1])
+        await self.show(interaction)
 
 
 class Leaderboard(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    @commands.command(name="lb", aliases=["leaderboard", "top"])
-    async def lb(self, ctx):
-        users = load(USERS_FILE)
-        # Filter out users with no yen data and sort
-        valid_users = [(uid, u) for uid, u in users.items()
-                       if isinstance(u, dict) and 'yen' in u]
-        sorted_users = sorted(
-            valid_users, key=lambda x: x[1].get('yen', 0), reverse=True)
-
-        if not sorted_users:
-            embed = discord.Embed(
-                title="🏆 Leaderboard",
-                description="No players found!",
-                color=0xFFD700
-            )
-            return await ctx.send(embed=embed)
+    async def cog_load(self):
+        # Build the indexes on the loop before the snapshot thread reads them
+        ensure_loaded()
+        snapshots.start()
+
+    def build_embed(self, ctx, board, index, rows, offset, local):
+        title, fmt = BOARDS[board]
+        gangs = load(GANGS_FILE) if board == "gang" and rows else {}
 
         desc = ""
         medals = ["🥇", "🥈", "🥉"]
 
-        for i, (uid, u) in enumerate(sorted_users[:10]):
+        for i, (key, score) in enumerate(rows, start=offset):
             medal = medals[i] if i < 3 else f"**{i+1}.**"
-            yen = u.get('yen', 0)
-            desc += f"{medal} <@{uid}> - 💴 `{yen:,}` yen\n"
+            if board == "gang":
+                g = gangs.get(key, {})
+                name = f"**{g.get('name', 'Unknown')}** ({g.get('type', 'gang').title()})"
+            else:
+                name = f"<@{key}>"
+            desc += f"{medal} {name} - {fmt.format(score)}\n"
 
         embed = discord.Embed(
-            title="🏆 Global Rankings",
+            title=f"🏆 {ctx.guild.name} Rankings" if local else "🏆 Global Rankings",
             description=desc or "No players yet!",
             color=0xFFD700
         )
-        embed.set_author(name="Top 10 Richest Players",
+        embed.set_author(name=title,
                          icon_url=ctx.guild.icon.url if ctx.guild.icon else None)
-        embed.set_footer(text="Compete to reach the top!")
-        await ctx.send(embed=embed)
+
+        pages = max(1, -(-len(index) // PAGE_SIZE))
+        page = offset // PAGE_SIZE + 1
+        footer = f"Page {page}/{pages}"
+        rank = index.rank(ctx.author.id) if board != "gang" else None
+        if rank:
+            footer += f" • Your rank: #{rank:,} of {len(index):,}"
+        embed.set_footer(text=footer + " • Compete to reach the top!")
+        return embed
+
+    @commands.command(name="lb", aliases=["leaderboard", "top"])
+    async def lb(self, ctx, board: str = "yen", scope: str = None):
+        """Show a leaderboard. Usage: ls lb [yen|wins|streak|aura|level|gang] [server]"""
+        board = board.lower()
+        if board in SERVER_SCOPES:
+            board, scope = (scope or "yen").lower(), board
+        board = BOARD_ALIASES.get(board, board)
+        if board not in BOARDS:
+            embed = discord.Embed(
+                title="❌ Unknown Leaderboard",
+                description="Available boards: " + ", ".join(f"`{b}`" for b in BOARDS)
+                + "\n\nAdd `server` to rank only this server's members.",
+                color=0xE74C3C
+            )
+            return await ctx.send(embed=embed)
+
+        ensure_loaded()
+        local = scope is not None and scope.lower() in SERVER_SCOPES and board != "gang"
+        if local:
+            # The member set is only needed to rebuild an expired ranking
+            index = cached_guild_ranking(ctx.guild, board)
+            if index is None:
+                index = guild_ranking(ctx.guild, board, await member_cache.member_ids(ctx.guild))
+        else:
+            index = boards[board]
+        if not len(index):
+            embed = discord.Embed(
+                title="🏆 Leaderboard",
+                description="No players found!",
+                color=0xFFD700
+            )
+            return await ctx.send(embed=embed)
+
+        view = LeaderboardView(self, ctx, board, index, local)
+        embed = self.build_embed(ctx, board, index, view.rows, view.offset, local)
+        if len(index) <= PAGE_SIZE:
+            return await ctx.send(embed=embed)
+        await ctx.send(embed=embed, view=view)
 
 
 async def setup(bot):
@@ -1,19 +1,35 @@
 import discord
+import random
 import time
 import json
 import os
 from discord.ext import commands
 from discord.ui import View, Select
+from utils.scheduler import scheduler
+from utils.patrons import patrons
+from utils import io_stats
+from utils.database import locked
+from utils.member_cache import member_cache
 import config
 
 USERS_FILE = "data/users.json"
+CARDS_FILE = "data/cards.json"
+RARITIES_FILE = "data/rarities.json"
+BOSSES_FILE = "data/bosses.json"
+EMOJI_FILE = "data/emoji.json"
 
 
 def load(filename):
     try:
         if os.path.exists(filename):
-            with open(filename, 'r') as f:
-                return json.load(f)
+            started = time.perf_counter()
+            with locked(filename, shared=True), open(filename, 'r') as f:
+                text = f.read()
+            read_done = time.perf_counter()
+            data = json.loads(text)
+            io_stats.record("load", filename, len(text), read_done - started,
+                            time.perf_counter() - read_done, __name__)
+            return data
         return {}
     except:
         return {}
@@ -22,8 +38,13 @@ def load(filename):
 def save(data, filename):
     try:
         os.makedirs(os.path.dirname(filename), exist_ok=True)
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        started = time.perf_counter()
+        text = json.dumps(data, indent=2)
+        encoded = time.perf_counter()
+        with locked(filename), open(filename, 'w') as f:
+            f.write(text)
+        io_stats.record("save", filename, len(text), time.perf_counter() - encoded,
+                        encoded - started, __name__)
     except Exception as e:
         print(f"Error saving {filename}: {e}")
 
@@ -205,18 +226,47 @@ class Patreon(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    def check_patreon_expiration(self, users):
-        """Check and remove expired Patreon subscriptions"""
-        now = int(time.time())
-        expired_users = []
-
-        for uid, user_data in users.items():
-            if "patreon" in user_data:
-                if user_data["patreon"]["expires_at"] <= now:
-                    expired_users.append(uid)
-                    # Remove Patreon status
-                    del user_data["patreon"]
-                    user_data["max_pulls"] = 12  # Reset to default
+    async def cog_load(self):
+        # Patrons are shared by the cluster: only the primary worker expires them
+        scheduler.register("patreon_expiry", self._on_patreon_expired, primary_only=True)
+        # One-time migration: register expiries for patrons added before the scheduler
+        if scheduler.owns("patreon_expiry") and not scheduler.has_kind("patreon_expiry"):
+            for uid, p in patrons.items():
+                scheduler.schedule("patreon_expiry", uid, p["expires_at"])
+        scheduler.start()
+
+    async def _on_patreon_expired(self, items):
+        """Scheduler handler: a patron's expiry came due, pop expired registry heads."""
+        expired = self.check_patreon_expiration()
+        if expired:
+            print(f"Expired Patreon for {len(expired)} user(s)")
+
+    def clear_patreon(self, user_data):
+        """Remove Patreon status from a user dict and reset pulls to default"""
+        user_data.pop("patreon", None)
+        user_data["max_pulls"] = 12  # Reset to default
+
+    def check_patreon_expiration(self, users=None):
+        """Remove expired Patreon subscriptions.
+
+        Expired uids are popped from the patron registry; only those users are
+        touched. If `users` is given it is updated in place and the caller saves,
+        otherwise users.json is loaded and saved here when anything expired.
+        """
+        expired_users = patrons.pop_expired()
+        if not expired_users:
+            return expired_users
+
+        owns_users = users is None
+        with locked(USERS_FILE):
+            if owns_users:
+                users = load(USERS_FILE)
+            for uid in expired_users:
+                scheduler.cancel("patreon_expiry", uid)
+                if uid in users and "patreon" in users[uid]:
+                    self.clear_patreon(users[uid])
+            if owns_users:
+                save(users, USERS_FILE)
 
         return expired_users
 
@@ -225,12 +275,6 @@ class Patreon(commands.Cog):
         """Interactive Patreon information command"""
         print(f"Patreon command called by {ctx.author.name}")
 
-        # Check for expired subscriptions
-        users = load(USERS_FILE)
-        expired = self.check_patreon_expiration(users)
-        if expired:
-            save(users, USERS_FILE)
-
         # Main Patreon info embed
         embed = discord.Embed(
             title="👑 Patreon Support Tiers",
@@ -290,72 +334,77 @@ class Patreon(commands.Cog):
                 await ctx.send(f"❌ User with ID {user_id} not found!")
                 return
 
-            # Store Patreon info in user data
-            users = load(USERS_FILE)
-            uid = str(user_id)
-
-            if uid not in users:
-                users[uid] = {}
-
-            users[uid]["patreon"] = {
-                "tier": tier,
-                "name": tier_info["name"],
-                "added_at": int(time.time()),
-                # 30 days from now
-                "expires_at": int(time.time()) + (30 * 24 * 60 * 60),
-                "perks": tier_info["perks"]
-            }
-
-            # Apply perks based on tier
-            if tier == "1":
-                users[uid]["max_pulls"] = 14  # +2 extra pulls
-                # -1 hour in seconds
-                users[uid]["quest_cooldown_reduction"] = 3600
-                users[uid]["exp_multiplier"] = 1.1  # 10% more exp
-                users[uid]["yen_per_bundle"] = 2000
-                users[uid]["multiroll"] = True
-                users[uid]["bundle_command"] = True
-                users[uid]["patreon_tier"] = 1
-            elif tier == "2":
-                users[uid]["max_pulls"] = 17  # +5 extra pulls
-                # -1.5 hours in seconds
-                users[uid]["quest_cooldown_reduction"] = 5400
-                users[uid]["exp_multiplier"] = 1.15  # 15% more exp
-                users[uid]["yen_per_bundle"] = 3000
-                users[uid]["tickets"] = users[uid].get("tickets", {})
-                users[uid]["tickets"]["default"] = users[uid]["tickets"].get(
-                    "default", 0) + 1
-                users[uid]["multiroll"] = True
-                users[uid]["locker_loot_crate"] = True
-                users[uid]["bounty_rates"] = {
-                    "vasco": 0.05, "zack": 0.07, "jace": 0.88}
-                users[uid]["patreon_tier"] = 2
-            elif tier == "3":
-                users[uid]["max_pulls"] = 22  # +10 extra pulls
-                # -2 hours in seconds
-                users[uid]["quest_cooldown_reduction"] = 7200
-                users[uid]["exp_multiplier"] = 1.2  # 20% more exp
-                users[uid]["yen_per_bundle"] = 5000
-                users[uid]["tickets"] = users[uid].get("tickets", {})
-                users[uid]["tickets"]["vasco"] = users[uid]["tickets"].get(
-                    "vasco", 0) + 1
-                users[uid]["tickets"]["jace"] = users[uid]["tickets"].get(
-                    "jace", 0) + 1
-                users[uid]["tickets"]["zack"] = users[uid]["tickets"].get(
-                    "zack", 0) + 1
-                users[uid]["multiroll"] = True
-                users[uid]["random_crate"] = True
-                users[uid]["bounty_rates"] = {
-                    "vasco": 0.10, "zack": 0.15, "jace": 0.75}
-                users[uid]["aura_multiplier"] = 1.5
-                users[uid]["bounty_multiplier"] = 1.5
-                users[uid]["patreon_tier"] = 3
-
-            # Set current pulls to max_pulls when applying perks
-            users[uid]["pulls"] = users[uid]["max_pulls"]
-
-            # Save the updated user data
-            save(users, USERS_FILE)
+            with locked(USERS_FILE):
+                # Store Patreon info in user data
+                users = load(USERS_FILE)
+                uid = str(user_id)
+
+                if uid not in users:
+                    users[uid] = {}
+
+                users[uid]["patreon"] = {
+                    "tier": tier,
+                    "name": tier_info["name"],
+                    "added_at": int(time.time()),
+                    # 30 days from now
+                    "expires_at": int(time.time()) + (30 * 24 * 60 * 60),
+                    "perks": tier_info["perks"]
+                }
+
+                # Apply perks based on tier
+                if tier == "1":
+                    users[uid]["max_pulls"] = 14  # +2 extra pulls
+                    # -1 hour in seconds
+                    users[uid]["quest_cooldown_reduction"] = 3600
+                    users[uid]["exp_multiplier"] = 1.1  # 10% more exp
+                    users[uid]["yen_per_bundle"] = 2000
+                    users[uid]["multiroll"] = True
+                    users[uid]["bundle_command"] = True
+                    users[uid]["patreon_tier"] = 1
+                elif tier == "2":
+                    users[uid]["max_pulls"] = 17  # +5 extra pulls
+                    # -1.5 hours in seconds
+                    users[uid]["quest_cooldown_reduction"] = 5400
+                    users[uid]["exp_multiplier"] = 1.15  # 15% more exp
+                    users[uid]["yen_per_bundle"] = 3000
+                    users[uid]["tickets"] = users[uid].get("tickets", {})
+                    users[uid]["tickets"]["default"] = users[uid]["tickets"].get(
+                        "default", 0) + 1
+                    users[uid]["multiroll"] = True
+                    users[uid]["locker_loot_crate"] = True
+                    users[uid]["bounty_rates"] = {
+                        "vasco": 0.05, "zack": 0.07, "jace": 0.88}
+                    users[uid]["patreon_tier"] = 2
+                elif tier == "3":
+                    users[uid]["max_pulls"] = 22  # +10 extra pulls
+                    # -2 hours in seconds
+                    users[uid]["quest_cooldown_reduction"] = 7200
+                    users[uid]["exp_multiplier"] = 1.2  # 20% more exp
+                    users[uid]["yen_per_bundle"] = 5000
+                    users[uid]["tickets"] = users[uid].get("tickets", {})
+                    users[uid]["tickets"]["vasco"] = users[uid]["tickets"].get(
+                        "vasco", 0) + 1
+                    users[uid]["tickets"]["jace"] = users[uid]["tickets"].get(
+                        "jace", 0) + 1
+                    users[uid]["tickets"]["zack"] = users[uid]["tickets"].get(
+                        "zack", 0) + 1
+                    users[uid]["multiroll"] = True
+                    users[uid]["random_crate"] = True
+                    users[uid]["bounty_rates"] = {
+                        "vasco": 0.10, "zack": 0.15, "jace": 0.75}
+                    users[uid]["aura_multiplier"] = 1.5
+                    users[uid]["bounty_multiplier"] = 1.5
+                    users[uid]["patreon_tier"] = 3
+
+                # Set current pulls to max_pulls when applying perks
+                users[uid]["pulls"] = users[uid]["max_pulls"]
+
+                # Save the updated user data
+                save(users, USERS_FILE)
+            patrons.add(uid, tier, tier_info["name"],
+                        users[uid]["patreon"]["expires_at"])
+            scheduler.schedule("patreon_expiry", uid,
+                               users[uid]["patreon"]["expires_at"])
 
             # Reload the user data to ensure it's up to date
             users = load(USERS_FILE)
@@ -363,7 +412,7 @@ class Patreon(commands.Cog):
             # Try to assign Discord role if role_id is set
             guild = ctx.guild
             if guild and tier_info["role_id"]:
-                member = guild.get_member(user_id)
+                member = await member_cache.fetch(guild, user_id)
                 if member:
                     try:
                         await member.add_roles(guild.get_role(tier_info["role_id"]))
@@ -404,20 +453,25 @@ class Patreon(commands.Cog):
                 return
 
             # Remove Patreon info from user data
-            users = load(USERS_FILE)
             uid = str(user_id)
+            tier_name = None
+            with locked(USERS_FILE):
+                users = load(USERS_FILE)
+                if uid in users and "patreon" in users[uid]:
+                    tier_name = users[uid]["patreon"]["name"]
+                    del users[uid]["patreon"]
 
-            if uid in users and "patreon" in users[uid]:
-                tier_name = users[uid]["patreon"]["name"]
-                del users[uid]["patreon"]
+                    # Reset max pulls to default and update current pulls if needed
+                    users[uid]["max_pulls"] = 12
+                    if users[uid].get("pulls", 0) > 12:
+                        users[uid]["pulls"] = 12
+                        users[uid]["last_pull_regen_ts"] = int(time.time())
 
-                # Reset max pulls to default and update current pulls if needed
-                users[uid]["max_pulls"] = 12
-                if users[uid].get("pulls", 0) > 12:
-                    users[uid]["pulls"] = 12
-                    users[uid]["last_pull_regen_ts"] = int(time.time())
+                    save(users, USERS_FILE)
 
-                save(users, USERS_FILE)
+            if tier_name is not None:
+                patrons.remove(uid)
+                scheduler.cancel("patreon_expiry", uid)
 
                 # Reload the user data to ensure it's up to date
                 users = load(USERS_FILE)
@@ -439,37 +493,34 @@ class Patreon(commands.Cog):
     async def patreon_list(self, ctx):
         """List all current patrons with their tier and expiration"""
 
-        users = load(USERS_FILE)
-        patrons = []
+        patron_list = []
         now = int(time.time())
 
         # First, check for expired patrons
-        expired = self.check_patreon_expiration(users)
+        expired = self.check_patreon_expiration()
         if expired:
-            save(users, USERS_FILE)
             print(f"Cleaned up {len(expired)} expired patrons")
 
-        # Gather current patrons
-        for uid, user_data in users.items():
-            if "patreon" in user_data:
-                try:
-                    user = await self.bot.fetch_user(int(uid))
-                    if user:
-                        patrons.append({
-                            "user": user,
-                            "tier": user_data["patreon"]["tier"],
-                            "name": user_data["patreon"].get("name", "Unknown"),
-                            "expires_at": user_data["patreon"].get("expires_at", 0)
-                        })
-                except (discord.NotFound, discord.HTTPException):
-                    continue
-
-        if not patrons:
+        # Gather current patrons from the registry
+        for uid, p in patrons.items():
+            try:
+                user = await self.bot.fetch_user(int(uid))
+                if user:
+                    patron_list.append({
+                        "user": user,
+                        "tier": p["tier"],
+                        "name": p.get("name", "Unknown"),
+                        "expires_at": p.get("expires_at", 0)
+                    })
+            except (discord.NotFound, discord.HTTPException):
+                continue
+
+        if not patron_list:
             await ctx.send("📭 No current patrons found!")
             return
 
         # Sort by tier (1,2,3) and then by username
-        patrons_sorted = sorted(patrons, key=lambda x: (
+        patrons_sorted = sorted(patron_list, key=lambda x: (
             int(x['tier']), x['user'].name.lower()))
 
         embed = discord.Embed(
@@ -496,100 +547,28 @@ class Patreon(commands.Cog):
             }.get(tier_num, f'Tier {tier_num}')
 
             # Format patron list with mentions and expiration
-            patron_list = []
+            lines = []
             for patron in tier_patrons:
                 days_left = (patron['expires_at'] - now) // (24 * 3600)
                 if days_left > 0:
-                    patron_list.append(
+                    lines.append(
                         f"• {patron['user'].mention} ({patron['name']}) - {days_left} days left"
                     )
                 else:
-                    patron_list.append(
+                    lines.append(
                         f"• {patron['user'].mention} ({patron['name']}) - Expired!"
                     )
 
             embed.add_field(
                 name=f"{tier_name} ({len(tier_patrons)})",
-                value="\n".join(patron_list) or "No patrons in this tier",
+                value="\n".join(lines) or "No patrons in this tier",
                 inline=False
             )
 
         await ctx.send(embed=embed)
 
-    @commands.command(name="mp", aliases=["mass_pull", "masspull"])
-    async def mass_pull(self, ctx):
-        """Mass pull all remaining pulls at once (Patreon only)! Usage: ls mp"""
-        # Check patreon status
-        users = load(USERS_FILE)
-        uid = str(ctx.author.id)
-        if uid not in users or "patreon" not in users[uid]:
-            embed = discord.Embed(
-                title="❌ Patreon Only",
-                description="This command is only available to **Patreon members**!\n\nUse `ls patreon` to learn more about supporting us!",
-                color=0xE74C3C,
-            )
-            embed.set_author(
-                name=ctx.author.display_name,
-                icon_url=ctx.author.display_avatar.url,
-            )
-            return await ctx.send(embed=embed)
-
-        user = users[uid]
-        amount = user.get("pulls", 0)
-        if amount <= 0:
-            max_pulls = user.get("max_pulls", 12)
-            embed = discord.Embed(
-                title="❌ Out of Pulls!",
-                description=(
-                    f"You have `{user.get('pulls', 0)}/{max_pulls}` pulls left. "
-                    "Nothing to mass pull.\n\nUse `ls cd` to check cooldowns."
-                ),
-                color=0xE74C3C,
-            )
-            embed.set_author(
-                name=ctx.author.display_name,
-                icon_url=ctx.author.display_avatar.url,
-            )
-            return await ctx.send(embed=embed)
-
-        # Start mass pull
-        loading_embed = discord.Embed(
-            title="✨ Mass Pulling...",
-            description=f"Pulling **{amount}** characters...",
-            color=0x5865F2,
-        )
-        loading_embed.set_author(
-            name=ctx.author.display_name,
-            icon_url=ctx.author.display_avatar.url,
-        )
-        loading_embed.set_footer(text="This may take a moment...")
-        msg = await ctx.send(embed=loading_embed)
-
-        # Import needed modules for gacha logic
-        import random
-        import asyncio
-        from utils.game_math import regenerate_pulls
-
-        CARDS_FILE = "data/cards.json"
-        RARITIES_FILE = "data/rarities.json"
-        BOSSES_FILE = "data/bosses.json"
-        EMOJI_FILE = "data/emoji.json"
-
-        # Load data
-        cards_dict = load(CARDS_FILE)
-        rarities = load(RARITIES_FILE)
-        bosses = load(BOSSES_FILE)
-
-        if not cards_dict:
-            embed = discord.Embed(
-                title="❌ No Cards Available",
-                description="Card database is empty!",
-                color=0xE74C3C,
-            )
-            await msg.edit(embed=embed)
-            return
-
-        # Prepare card pool and weights
+    def _roll_pulls(self, amount, cards_dict, rarities, bosses):
+        """Roll `amount` pulls: a list of (card, ticket_id or None). Touches no user data."""
         cards_list = list(cards_dict.values())
         weights = []
         for card in cards_list:
@@ -598,18 +577,10 @@ class Patreon(commands.Cog):
             weight = rarity_info.get("weight_multiplier", 5)
             weights.append(weight)
 
-        # Load per-card emojis for fragments
-        emojis = load(EMOJI_FILE) or {}
-
-        # Aggregated results
-        new_counts = {}      # card_name -> (count, rarity_emoji)
-        shard_counts = {}    # card_name -> (count, card_emoji)
-        tickets_gained = {}
-
-        user["pulls"] -= amount
-
+        rolls = []
         for _ in range(amount):
             # Ticket chance (2.5%)
+            tid = None
             if bosses and random.random() * 100 <= 2.5:
                 total = sum(b.get("ticket_drop_rate", 0)
                             for b in bosses.values())
@@ -620,27 +591,39 @@ class Patreon(commands.Cog):
                         curr += b.get("ticket_drop_rate", 0)
                         if r <= curr:
                             tid = f"{b.get('name', '').lower().replace(' ', '_')}_ticket"
-                            tickets_gained[tid] = tickets_gained.get(
-                                tid, 0) + 1
-                            user.setdefault("tickets", {})
-                            user["tickets"][tid] = user["tickets"].get(
-                                tid, 0) + 1
                             break
 
             # Card pull
             chosen = random.choices(cards_list, weights=weights, k=1)[0]
+            rolls.append((chosen, tid))
+        return rolls
+
+    def _apply_pulls(self, user, rolls, rarities, emojis):
+        """Give `user` the rolled cards, fragments and tickets.
+
+        Returns (new_counts, shard_counts, tickets_gained) for the result embed.
+        """
+        new_counts = {}      # card_name -> (count, rarity_emoji)
+        shard_counts = {}    # card_name -> (count, card_emoji)
+        tickets_gained = {}
+
+        user.setdefault("cards", [])
+        user.setdefault("unlocked", [])
+        user.setdefault("fragments", {})
+
+        for chosen, tid in rolls:
+            if tid:
+                tickets_gained[tid] = tickets_gained.get(tid, 0) + 1
+                user.setdefault("tickets", {})
+                user["tickets"][tid] = user["tickets"].get(tid, 0) + 1
+
             card_name = chosen.get("name", "Unknown")
             rarity_key = chosen.get("rarity", "C")
-            rarity_info = rarities.get(rarity_key, {})
-            rarity_emoji = rarity_info.get("emoji", "⭐")
+            rarity_emoji = rarities.get(rarity_key, {}).get("emoji", "⭐")
 
-            user.setdefault("cards", [])
-            user.setdefault("unlocked", [])
-            user.setdefault("fragments", {})
-
-            if card_name not in user.get("unlocked", []):
+            if card_name not in user["unlocked"]:
                 # New unlock
-                user.setdefault("unlocked", []).append(card_name)
+                user["unlocked"].append(card_name)
                 user["cards"].append(
                     {
                         "name": card_name,
@@ -661,9 +644,86 @@ class Patreon(commands.Cog):
                 count, _ = shard_counts.get(card_name, (0, card_emoji))
                 shard_counts[card_name] = (count + 1, card_emoji)
 
-        # Save user data
-        users[uid] = user
-        save(users, USERS_FILE)
+        return new_counts, shard_counts, tickets_gained
+
+    @commands.command(name="mp", aliases=["mass_pull", "masspull"])
+    async def mass_pull(self, ctx):
+        """Mass pull all remaining pulls at once (Patreon only)! Usage: ls mp"""
+        # Check patreon status
+        uid = str(ctx.author.id)
+        if not patrons.is_patron(uid):
+            embed = discord.Embed(
+                title="❌ Patreon Only",
+                description="This command is only available to **Patreon members**!\n\nUse `ls patreon` to learn more about supporting us!",
+                color=0xE74C3C,
+            )
+            embed.set_author(
+                name=ctx.author.display_name,
+                icon_url=ctx.author.display_avatar.url,
+            )
+            return await ctx.send(embed=embed)
+
+        cards_dict = load(CARDS_FILE)
+        rarities = load(RARITIES_FILE)
+        bosses = load(BOSSES_FILE)
+        if not cards_dict:
+            embed = discord.Embed(
+                title="❌ No Cards Available",
+                description="Card database is empty!",
+                color=0xE74C3C,
+            )
+            return await ctx.send(embed=embed)
+
+        # Spend the pulls up front, so pulls started meanwhile (here or on another worker) see it
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = users.get(uid, {})
+            amount = user.get("pulls", 0)
+            if amount > 0:
+                user["pulls"] -= amount
+                users[uid] = user
+                save(users, USERS_FILE)
+
+        if amount <= 0:
+            max_pulls = user.get("max_pulls", 12)
+            embed = discord.Embed(
+                title="❌ Out of Pulls!",
+                description=(
+                    f"You have `{user.get('pulls', 0)}/{max_pulls}` pulls left. "
+                    "Nothing to mass pull.\n\nUse `ls cd` to check cooldowns."
+                ),
+                color=0xE74C3C,
+            )
+            embed.set_author(
+                name=ctx.author.display_name,
+                icon_url=ctx.author.display_avatar.url,
+            )
+            return await ctx.send(embed=embed)
+
+        # Start mass pull
+        loading_embed = discord.Embed(
+            title="✨ Mass Pulling...",
+            description=f"Pulling **{amount}** characters...",
+            color=0x5865F2,
+        )
+        loading_embed.set_author(
+            name=ctx.author.display_name,
+            icon_url=ctx.author.display_avatar.url,
+        )
+        loading_embed.set_footer(text="This may take a moment...")
+        msg = await ctx.send(embed=loading_embed)
+
+        rolls = self._roll_pulls(amount, cards_dict, rarities, bosses)
+        emojis = load(EMOJI_FILE) or {}
+
+        # Apply the results to a fresh copy: other commands (or cluster workers)
+        # may have saved while the loading message was sent
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = users.setdefault(uid, {})
+            new_counts, shard_counts, tickets_gained = self._apply_pulls(
+                user, rolls, rarities, emojis)
+            save(users, USERS_FILE)
 
         # Result embed
         result_embed = discord.Embed(
@@ -730,9 +790,8 @@ class Patreon(commands.Cog):
     async def mass_reset_and_pull(self, ctx):
         """Patreon-only: use one reset token to refill pulls, then mass pull all at once."""
         # Check patreon status
-        users = load(USERS_FILE)
         uid = str(ctx.author.id)
-        if uid not in users or "patreon" not in users[uid]:
+        if not patrons.is_patron(uid):
             embed = discord.Embed(
                 title="❌ Patreon Only",
                 description="This command is only available to **Patreon members**!\n\nUse `ls patreon` to learn more about supporting us!",
@@ -744,10 +803,32 @@ class Patreon(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        user = users[uid]
+        cards_dict = load(CARDS_FILE)
+        rarities = load(RARITIES_FILE)
+        bosses = load(BOSSES_FILE)
+        if not cards_dict:
+            embed = discord.Embed(
+                title="❌ No Cards Available",
+                description="Card database is empty!",
+                color=0xE74C3C,
+            )
+            return await ctx.send(embed=embed)
+
+        # Refill pulls using one reset token and spend them all in the same write
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = users.get(uid, {})
+            reset_tokens = user.get("reset_tokens", 0)
+            if reset_tokens >= 1:
+                user["pulls"] = user.get("max_pulls", 12)
+                user["reset_tokens"] = reset_tokens - 1
+                user["last_pull_regen_ts"] = int(time.time())
+                amount = user["pulls"]
+                user["pulls"] -= max(amount, 0)
+                users[uid] = user
+                save(users, USERS_FILE)
 
         # Check reset tokens
-        reset_tokens = user.get("reset_tokens", 0)
         if reset_tokens < 1:
             embed = discord.Embed(
                 title="❌ No Reset Tokens",
@@ -763,15 +844,7 @@ class Patreon(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        # Refill pulls using one reset token
-        user["pulls"] = user.get("max_pulls", 12)
-        user["reset_tokens"] = reset_tokens - 1
-        user["last_pull_regen_ts"] = int(time.time())
-        users[uid] = user
-        save(users, USERS_FILE)
-
         # Now perform the same mass pull logic as mp
-        amount = user.get("pulls", 0)
         if amount <= 0:
             max_pulls = user.get("max_pulls", 12)
             embed = discord.Embed(
@@ -803,94 +876,16 @@ class Patreon(commands.Cog):
         loading_embed.set_footer(text="This may take a moment...")
         msg = await ctx.send(embed=loading_embed)
 
-        # Import needed modules and load data
-        import random
-        import asyncio
-        CARDS_FILE = "data/cards.json"
-        RARITIES_FILE = "data/rarities.json"
-        BOSSES_FILE = "data/bosses.json"
-        EMOJI_FILE = "data/emoji.json"
-
-        cards_dict = load(CARDS_FILE)
-        rarities = load(RARITIES_FILE)
-        bosses = load(BOSSES_FILE)
-
-        if not cards_dict:
-            embed = discord.Embed(
-                title="❌ No Cards Available",
-                description="Card database is empty!",
-                color=0xE74C3C,
-            )
-            await msg.edit(embed=embed)
-            return
-
-        cards_list = list(cards_dict.values())
-        weights = []
-        for card in cards_list:
-            rarity_key = card.get("rarity", "C")
-            rarity_info = rarities.get(rarity_key, {})
-            weight = rarity_info.get("weight_multiplier", 5)
-            weights.append(weight)
-
+        rolls = self._roll_pulls(amount, cards_dict, rarities, bosses)
         emojis = load(EMOJI_FILE) or {}
 
-        new_counts = {}
-        shard_counts = {}
-        tickets_gained = {}
-
-        user["pulls"] -= amount
-
-        for _ in range(amount):
-            if bosses and random.random() * 100 <= 2.5:
-                total = sum(b.get("ticket_drop_rate", 0)
-                            for b in bosses.values())
-                if total > 0:
-                    r = random.uniform(0, total)
-                    curr = 0
-                    for b in bosses.values():
-                        curr += b.get("ticket_drop_rate", 0)
-                        if r <= curr:
-                            tid = f"{b.get('name', '').lower().replace(' ', '_')}_ticket"
-                            tickets_gained[tid] = tickets_gained.get(
-                                tid, 0) + 1
-                            user.setdefault("tickets", {})
-                            user["tickets"][tid] = user["tickets"].get(
-                                tid, 0) + 1
-                            break
-
-            chosen = random.choices(cards_list, weights=weights, k=1)[0]
-            card_name = chosen.get("name", "Unknown")
-            rarity_key = chosen.get("rarity", "C")
-            rarity_info = rarities.get(rarity_key, {})
-            rarity_emoji = rarity_info.get("emoji", "⭐")
-
-            user.setdefault("cards", [])
-            user.setdefault("unlocked", [])
-            user.setdefault("fragments", {})
-
-            if card_name not in user.get("unlocked", []):
-                user.setdefault("unlocked", []).append(card_name)
-                user["cards"].append(
-                    {
-                        "name": card_name,
-                        "rarity": rarity_key,
-                        "level": 1,
-                        "exp": 0,
-                        "evo": 0,
-                        "aura": 0,
-                    }
-                )
-                count, _ = new_counts.get(card_name, (0, rarity_emoji))
-                new_counts[card_name] = (count + 1, rarity_emoji)
-            else:
-                user["fragments"][card_name] = user["fragments"].get(
-                    card_name, 0) + 1
-                card_emoji = emojis.get(card_name) or "🧩"
-                count, _ = shard_counts.get(card_name, (0, card_emoji))
-                shard_counts[card_name] = (count + 1, card_emoji)
-
-        users[uid] = user
-        save(users, USERS_FILE)
+        # Apply the results to a fresh copy, as in mp
+        with locked(USERS_FILE):
+            users = load(USERS_FILE)
+            user = users.setdefault(uid, {})
+            new_counts, shard_counts, tickets_gained = self._apply_pulls(
+                user, rolls, rarities, emojis)
+            save(users, USERS_FILE)
 
         result_embed = discord.Embed(
             title="✨ Reset + Mass Pull Complete!",
@@ -1,29 +1,41 @@
 import discord
 import random
 import asyncio
+import time
 from discord.ext import commands
 from discord.ui import View, Button
-from utils.database import load, save
+from utils.database import load, save, locked
 from utils.battle_engine import BattleEngine
 from utils.game_math import compute_stats
+from utils.sessions import sessions
+from utils.scheduler import scheduler
+from utils.outbox import outbox
 
 BOSSES_FILE = "data/bosses.json"
 USERS_FILE = "data/users.json"
 CARDS_FILE = "data/cards.json"
 
-# Memory Lobby: { "CODE": { "host": int, "boss": str, "members": [int] } }
+# Memory Lobby: { "CODE": { "host": int, "boss": dict, "members": [int], "channel_id": int, "message_id": int } }
+# Saved on shutdown and reloaded on start
 active_lobbies = {}
+lobby_views = {}  # code -> LobbyView, so expired lobbies can stop their buttons
+LOBBY_TTL = 600
 
 
 class LobbyView(View):
+    """Lobby buttons; custom_ids carry the lobby code so the view can be re-attached after a restart"""
+
     def __init__(self, code, boss_data, max_players):
-        super().__init__(timeout=600)
+        # Expiry is handled by the scheduler ("raid_lobby"), so the view itself never times out
+        super().__init__(timeout=None)
         self.code = code
         self.boss = boss_data
         self.max = max_players
+        self.join.custom_id = f"raid_lobby:join:{code}"
+        self.start.custom_id = f"raid_lobby:start:{code}"
 
     @discord.ui.button(label="Join Raid", style=discord.ButtonStyle.green, emoji="⚔️")
-    async def join(self, button, interaction):
+    async def join(self, interaction, button):
         lobby = active_lobbies.get(self.code)
         if not lobby:
             return await interaction.response.send_message("❌ Lobby has expired or been closed.", ephemeral=True)
@@ -46,7 +58,7 @@ class LobbyView(View):
         await interaction.followup.send(f"✅ Joined raid! ({len(lobby['members'])}/{self.max})", ephemeral=True)
 
     @discord.ui.button(label="Start Raid", style=discord.ButtonStyle.danger, emoji="🚀")
-    async def start(self, button, interaction):
+    async def start(self, interaction, button):
         lobby = active_lobbies.get(self.code)
         if not lobby:
             return await interaction.response.send_message("❌ Lobby not found.", ephemeral=True)
@@ -59,6 +71,9 @@ class LobbyView(View):
 
         # Cleanup
         del active_lobbies[self.code]
+        lobby_views.pop(self.code, None)
+        scheduler.cancel("raid_lobby", self.code)
+        self.stop()
         await interaction.response.edit_message(
             content="⚔️ **Raid Starting...**",
             view=None,
@@ -113,8 +128,6 @@ class LobbyView(View):
             inline=True
         )
 
-        await interaction.channel.send(embed=result_embed)
-
         # Rewards
         if result['win']:
             rewards_embed = discord.Embed(
@@ -124,29 +137,64 @@ class LobbyView(View):
             )
             rewards_text = ""
 
-            for uid in lobby['members']:
-                u = users.get(str(uid), {})
-                # Shard
-                s_name = self.boss['name']
-                u.setdefault("fragments", {})
-                u["fragments"][s_name] = u["fragments"].get(s_name, 0) + 2
-                rewards_text += f"<@{uid}>: 💎 **2x {s_name} Shards**\n"
-
-                # Weapon Chance
-                if random.random() * 100 < self.boss['weapon_drop_rate']:
-                    wid = self.boss['weapon_id']
-                    u.setdefault("equipment", {})
-                    u["equipment"][wid] = u["equipment"].get(wid, 0) + 1
-                    rewards_text += f"✨ <@{uid}> **DROPPED {wid}!**\n"
-
-            save(USERS_FILE, users)
+            # `users` is stale by now; hand out the rewards on a fresh copy
+            with locked(USERS_FILE):
+                users = load(USERS_FILE)
+                for uid in lobby['members']:
+                    u = users.get(str(uid), {})
+                    # Shard
+                    s_name = self.boss['name']
+                    u.setdefault("fragments", {})
+                    u["fragments"][s_name] = u["fragments"].get(s_name, 0) + 2
+                    rewards_text += f"<@{uid}>: 💎 **2x {s_name} Shards**\n"
+
+                    # Weapon Chance
+                    if random.random() * 100 < self.boss['weapon_drop_rate']:
+                        wid = self.boss['weapon_id']
+                        u.setdefault("equipment", {})
+                        u["equipment"][wid] = u["equipment"].get(wid, 0) + 1
+                        rewards_text += f"✨ <@{uid}> **DROPPED {wid}!**\n"
+
+                save(USERS_FILE, users)
             rewards_embed.description = rewards_text
-            await interaction.channel.send(embed=rewards_embed)
+            # Results and rewards go out as one message
+            await outbox.send(interaction.channel, embeds=[result_embed, rewards_embed])
+        else:
+            await outbox.send(interaction.channel, embed=result_embed)
 
 
 class Raid(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        sessions.register("raid_lobbies", lambda: active_lobbies)
+
+    async def cog_load(self):
+        scheduler.register("raid_lobby", self._on_lobby_expired)
+        scheduler.start()
+
+        # Re-attach the buttons of lobbies that were open at the last shutdown
+        now = int(time.time())
+        for code, lobby in sessions.take("raid_lobbies", {}).items():
+            if scheduler.due_at("raid_lobby", code) is None:
+                scheduler.schedule("raid_lobby", code, now + LOBBY_TTL)
+            active_lobbies[code] = lobby
+            if lobby.get("message_id"):
+                view = LobbyView(code, lobby["boss"], lobby["boss"]["max_players"])
+                self.bot.add_view(view, message_id=lobby["message_id"])
+                lobby_views[code] = view
+
+    async def cog_unload(self):
+        # On reload the new module takes the open lobbies over with fresh views
+        sessions.hand_over("raid_lobbies", dict(active_lobbies))
+        for view in lobby_views.values():
+            view.stop()
+
+    async def _on_lobby_expired(self, items):
+        for code, _ in items:
+            active_lobbies.pop(code, None)
+            view = lobby_views.pop(code, None)
+            if view:
+                view.stop()
 
     def ensure_user(self, users, uid):
         """Ensure user exists in database"""
@@ -192,12 +240,17 @@ class Raid(commands.Cog):
                 )
                 return await ctx.send(embed=embed)
 
-            users = load(USERS_FILE)
-            user = self.ensure_user(users, str(ctx.author.id))
-            save(USERS_FILE, users)
             tid = f"{boss['name'].lower().replace(' ', '_')}_ticket"
-
-            if user.get("tickets", {}).get(tid, 0) < 1:
+            with locked(USERS_FILE):
+                users = load(USERS_FILE)
+                user = self.ensure_user(users, str(ctx.author.id))
+                has_ticket = user.get("tickets", {}).get(tid, 0) >= 1
+                if has_ticket:
+                    # Consume
+                    user["tickets"][tid] -= 1
+                save(USERS_FILE, users)
+
+            if not has_ticket:
                 embed = discord.Embed(
                     title="❌ Missing Ticket",
                     description=f"You need a **{boss['name']} Ticket** to create this raid!\n\nGet tickets from `ls pull` (2.5% chance).",
@@ -205,10 +258,6 @@ class Raid(commands.Cog):
                 )
                 return await ctx.send(embed=embed)
 
-            # Consume
-            user["tickets"][tid] -= 1
-            save(USERS_FILE, users)
-
             # Code
             code = f"{boss['name'][:3].upper()}-{random.randint(1000, 9999)}"
             active_lobbies[code] = {"host": ctx.author.id,
@@ -242,7 +291,12 @@ class Raid(commands.Cog):
 
             embed.set_footer(text="Host can start the raid when ready!")
 
-            await ctx.send(embed=embed, view=LobbyView(code, boss, boss['max_players']))
+            view = LobbyView(code, boss, boss['max_players'])
+            msg = await ctx.send(embed=embed, view=view)
+            active_lobbies[code]["channel_id"] = msg.channel.id
+            active_lobbies[code]["message_id"] = msg.id
+            lobby_views[code] = view
+            scheduler.schedule("raid_lobby", code, int(time.time()) + LOBBY_TTL)
 
     @commands.command(name="party")
     async def party_join(self, ctx, action: str, code: str = None):
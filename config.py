@@ -7,8 +7,6 @@ load_dotenv('token.env')
 
 # Read token from environment variables
 TOKEN = os.getenv('DISCORD_TOKEN')
-print(f"Token loaded: {TOKEN[:10]}..." if TOKEN else "Token not found")
-
 if not TOKEN:
     print("Token not found")
     raise ValueError("DISCORD_TOKEN not found in environment variables!")
@@ -25,6 +23,15 @@ ADMINS = [1315746066900975770,
           1311982479032193065,
           818132161534230559]  # Your User ID
 
+# Sharding: unset runs one gateway connection, "auto" lets Discord pick the
+# shard count, a number runs that many (or only SHARD_IDS, e.g. "0-3")
+SHARD_COUNT = os.getenv('SHARD_COUNT')
+SHARD_IDS = os.getenv('SHARD_IDS')
+
+# Member cache: "all" caches every guild member (discord.py default), "players"
+# only keeps recently active or looked-up members in a bounded LRU
+MEMBER_CACHE = os.getenv('MEMBER_CACHE', 'all').lower()
+
 # Constants
 MAX_PULLS = 12
 PULL_REGEN_SECONDS = 900
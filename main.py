@@ -1,47 +1,85 @@
+import time
+STARTED_AT = time.perf_counter()  # before the heavy imports, for the startup breakdown
+
 import discord
 import os
 import config
 import asyncio
 import sys
 import platform
-from discord.ext import commands
-from flask import Flask
-from threading import Thread
-
-# Flask web server for keeping bot alive
-app = Flask('')
-
-
-@app.route('/')
-def home():
-    return "Bot is running!"
-
-
-@app.route('/health')
-def health():
-    return {"status": "healthy", "bot": "online"}
-
-
-def run_flask():
-    """Run Flask app in a way that doesn't block the event loop"""
-    import os
-    from werkzeug.serving import make_server
+from utils.scheduler import scheduler
+from utils.leaderboard_snapshots import snapshots
+from utils.metrics import registry, instrument_bot, instrument_views
+from utils import io_stats
+from utils.loop_monitor import loop_monitor
+from utils import health as bot_health
+from utils.shutdown import shutdown
+from utils import sharding
+from utils.governor import governor
+from utils.cog_loader import cog_loader
+from utils import member_cache
+from utils.prefix import PrefixMatcher
+from aiohttp import web
+
+cog_loader.record("imports", time.perf_counter() - STARTED_AT)
+
+
+# Health/metrics web server, served from the bot's own event loop
+async def home(request):
+    return web.Response(text="Bot is running!")
+
+
+async def health(request):
+    """Liveness: 503 once the bot is closed, its gateway has been down too long or the loop lags"""
+    healthy, details = bot_health.report(bot)
+    return web.json_response(details, status=200 if healthy else 503)
+
+
+async def ready(request):
+    """Readiness: 200 only while the gateway is connected and schedule changes keep reaching disk"""
+    healthy, details = bot_health.report(bot)
+    details["ready"] = (healthy and details["gateway"]["connected"]
+                        and details["storage"]["schedule_unflushed_for"] <= bot_health.FLUSH_LIMIT)
+    return web.json_response(details, status=200 if details["ready"] else 503)
+
+
+async def leaderboards(request):
+    """Read-only JSON rankings from the latest precomputed snapshot"""
+    board = request.match_info.get("board")
+    payload = snapshots.get(board)
+    if payload is None:
+        if board is not None and snapshots.get() is not None:
+            return web.json_response({"error": f"unknown board '{board}'"}, status=404)
+        return web.json_response({"error": "snapshot not ready"}, status=503)
+    return web.Response(text=payload, content_type="application/json")
+
+
+async def metrics(request):
+    """Prometheus text exposition of the in-process metrics registry"""
+    sharding.update_latency(bot)
+    member_cache.member_cache.stats(bot)
+    return web.Response(text=registry.render(),
+                        headers={"Content-Type": "text/plain; version=0.0.4"})
+
+
+async def start_web_server():
+    """Start the web server on the running loop and return its runner"""
+    app = web.Application()
+    app.add_routes([
+        web.get('/', home),
+        web.get('/health', health),
+        web.get('/ready', ready),
+        web.get('/leaderboards', leaderboards),
+        web.get('/leaderboards/{board}', leaderboards),
+        web.get('/metrics', metrics),
+    ])
+    runner = web.AppRunner(app)
+    await runner.setup()
 
     port = int(os.environ.get('PORT', 8080))
-    print(f"Starting Flask server on port {port}...")
-    try:
-        server = make_server('0.0.0.0', port, app)
-        server.serve_forever()
-    except Exception as e:
-        print(f"Flask server error: {e}")
-
-
-def keep_alive():
-    """Start Flask server in a separate daemon thread"""
-    print("Starting keep-alive Flask server...")
-    flask_thread = Thread(target=run_flask, daemon=True)
-    flask_thread.start()
-    print("Keep-alive Flask server started in background thread")
+    await web.TCPSite(runner, '0.0.0.0', port).start()
+    print(f"Web server listening on port {port}")
+    return runner
 
 
 # Enable Intents (Required for Pycord)
@@ -49,44 +87,71 @@ intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
 
-bot = commands.Bot(command_prefix=config.PREFIXES,
-                   intents=intents, help_command=None, case_insensitive=True)
+prefix_matcher = PrefixMatcher(config.PREFIXES)
+bot = sharding.create_bot(command_prefix=prefix_matcher,
+                          intents=intents, help_command=None, case_insensitive=True,
+                          **member_cache.client_options())
+instrument_bot(bot)
+instrument_views()
+bot_health.track(bot)
+sharding.track(bot)
+member_cache.track(bot)
+
+
+# Loaded before logging in: the everyday commands
+initial_extensions = [
+    'cogs.admin',
+    'cogs.economy',
+    'cogs.gatcha',
+    'cogs.help',
+]
+
+# Loaded in the background after on_ready, or on the spot when one of their
+# commands is used first (the heavy modules and those reading data at setup)
+deferred_extensions = [
+    'cogs.info',
+    'cogs.leaderboard',
+    'cogs.raid',
+    'cogs.gang',
+    'cogs.crew',  # Crew system (max 4 crews)
+    'cogs.combat',  # Restored PvP
+    'cogs.patreon'  # Patreon system
+]
 
 
 async def load_extensions(bot):
-    """Load all cogs asynchronously"""
+    """Load the initial cogs and queue the rest for after on_ready"""
     # Ensure data folder exists
     if not os.path.exists("./data"):
         os.makedirs("./data")
         print("Created ./data directory")
 
-    # Load all Cogs
-    initial_extensions = [
-        'cogs.admin',
-        'cogs.economy',
-        'cogs.gatcha',
-        'cogs.info',
-        'cogs.raid',
-        'cogs.gang',
-        'cogs.crew',  # Crew system (max 4 crews)
-        'cogs.leaderboard',
-        'cogs.help',
-        'cogs.combat',  # Restored PvP
-        'cogs.patreon'  # Patreon system
-    ]
-
-    # Load cogs
+    # Deadline handlers live in deferred cogs; hold dispatch until they're in
+    scheduler.pause()
     for extension in initial_extensions:
-        try:
-            await bot.load_extension(extension)
-            print(f"Loaded {extension}")
-        except Exception as e:
-            print(f"Failed to load {extension}: {e}")
+        await cog_loader.load(bot, extension)
+    cog_loader.deferred = list(deferred_extensions)
+
+
+async def load_deferred_extensions(bot):
+    await cog_loader.load_deferred(bot)
+    scheduler.resume()
+    cog_loader.record("deferred_cogs", time.perf_counter() - ready_at)
+    print(cog_loader.report())
 
 
 async def main():
-    # Load extensions first
+    # Bind the port first so the host sees the service while the bot logs in
+    phase_started = time.perf_counter()
+    web_runner = await start_web_server()
+    shutdown.install(bot)
+    cog_loader.record("web_server", time.perf_counter() - phase_started)
+
+    # Load extensions
     await load_extensions(bot)
+    io_stats.start_reporting()
+    loop_monitor.start()
+    cog_loader.record("before_login", time.perf_counter() - STARTED_AT)
 
     # Start the bot with retry logic
     max_retries = 5
@@ -106,14 +171,37 @@ async def main():
                 else:
                     raise e
     finally:
-        # Properly close the bot session
-        if not bot.is_closed():
-            await bot.close()
+        # Drain, persist sessions and pending deadlines, and close the bot session
+        await shutdown.run(bot, "exit")
+        await web_runner.cleanup()
+
+
+@bot.event
+async def on_message(message):
+    # Refuse new commands while draining for shutdown
+    if shutdown.draining or message.author.bot:
+        return
+    # Drop chatter before discord.py builds a Context for it
+    if not prefix_matcher.is_command(bot, message.content, cog_loader.pending_owner):
+        return
+    # Same as bot.process_commands, but each user's commands go through the governor
+    ctx = await bot.get_context(message)
+    ctx = await cog_loader.resolve(bot, ctx)  # loads a deferred cog on its first command
+    await governor.invoke(bot, ctx)
+
+
+ready_at = None
 
 
 @bot.event
 async def on_ready():
+    global ready_at
     print(f"Bot Online as {bot.user}")
+    if not cog_loader.started:
+        cog_loader.started = True
+        ready_at = time.perf_counter()
+        cog_loader.record("time_to_ready", ready_at - STARTED_AT)
+        asyncio.create_task(load_deferred_extensions(bot))
     await bot.change_presence(activity=discord.Game(name="ls help | Lookism Gacha"))
 
 
@@ -122,23 +210,15 @@ if __name__ == "__main__":
     if platform.system() == 'Windows':
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-    # Run the async main function first
     print("Starting Discord bot...")
     try:
         asyncio.run(main())
-        print("Bot started successfully!")
+        print("Bot stopped")
     except KeyboardInterrupt:
         print("Bot stopped by user")
     except Exception as e:
         print(f"Failed to start bot: {e}")
         import traceback
         traceback.print_exc()
-        print("Bot crashed, starting Flask for keep-alive...")
-    finally:
-        # Start Flask keep-alive after Discord bot setup
-        print("Starting keep-alive Flask server...")
-        keep_alive()
-        print("Flask server started. Keeping process alive...")
-        import time
-        while True:
-            time.sleep(60)  # Keep the process alive
+        # Exit non-zero so the host restarts us instead of keeping a zombie alive
+        sys.exit(1)
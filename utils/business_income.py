@@ -0,0 +1,50 @@
+import time
+
+DAY_SECONDS = 86400
+ACCRUAL_STEP = 3600  # income is credited in whole hours
+
+
+def iter_businesses(gang):
+    """Yield business dicts for both dict- and list-based gang structures."""
+    businesses = gang.get("businesses", {})
+    if isinstance(businesses, dict):
+        businesses = businesses.values()
+    elif not isinstance(businesses, list):
+        return
+    for biz in businesses:
+        if isinstance(biz, dict):
+            yield biz
+
+
+def accrue_business(biz, now=None):
+    """Return the yen owed by one business and advance its `last_accrued_ts`.
+
+    Owed income is computed in closed form from the elapsed whole steps, so it
+    does not matter how rarely this is called. Stolen businesses earn nothing
+    but keep their clock moving so they are not back-paid later.
+    """
+    now = int(now if now is not None else time.time())
+    last = biz.get("last_accrued_ts")
+    if last is None:
+        # Businesses created before accrual existed start earning from now
+        biz["last_accrued_ts"] = now
+        return 0
+
+    steps = (now - int(last)) // ACCRUAL_STEP
+    if steps <= 0:
+        return 0
+
+    biz["last_accrued_ts"] = int(last) + steps * ACCRUAL_STEP
+    if biz.get("is_stolen"):
+        return 0
+    return int(biz.get("income", 0)) * steps * ACCRUAL_STEP // DAY_SECONDS
+
+
+def accrue(gang, now=None):
+    """Credit every business's owed income to the gang bank. Returns the amount credited."""
+    now = int(now if now is not None else time.time())
+    owed = sum(accrue_business(biz, now) for biz in iter_businesses(gang))
+    if owed:
+        gang["bank"] = gang.get("bank", 0) + owed
+    return owed
+
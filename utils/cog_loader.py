@@ -0,0 +1,107 @@
+import ast
+import asyncio
+import time
+from utils.metrics import registry
+
+startup_seconds = registry.gauge(
+    "bot_startup_seconds", "Time spent in each startup phase", ["phase"])
+
+
+def command_names(extension):
+    """Top-level command names and aliases a cog module declares, read with ast (no import)."""
+    path = extension.replace(".", "/") + ".py"
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    names = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for dec in node.decorator_list:
+            # @commands.command(...) / @commands.group(...); subcommands hang off their group
+            if not (isinstance(dec, ast.Call) and isinstance(dec.func, ast.Attribute)
+                    and dec.func.attr in ("command", "group")
+                    and isinstance(dec.func.value, ast.Name) and dec.func.value.id == "commands"):
+                continue
+            name = node.name
+            for kw in dec.keywords:
+                if kw.arg == "name" and isinstance(kw.value, ast.Constant):
+                    name = kw.value.value
+                elif kw.arg == "aliases" and isinstance(kw.value, (ast.List, ast.Tuple)):
+                    names.update(e.value.lower() for e in kw.value.elts if isinstance(e, ast.Constant))
+            names.add(name.lower())
+    return names
+
+
+class CogLoader:
+    """Loads extensions eagerly or in the background, and times every startup phase.
+
+    Deferred extensions are loaded one by one after on_ready. A command for one
+    that hasn't loaded yet loads it on the spot: the owning extension is found
+    by scanning the cog sources with ast, which only happens on such a miss.
+    """
+
+    def __init__(self):
+        self.timings = {}  # phase -> seconds, in the order they happened
+        self.deferred = []
+        self.started = False
+        self._owners = None  # command name/alias -> deferred extension, built on the first miss
+        self._locks = {}
+
+    def record(self, phase, seconds):
+        self.timings[phase] = seconds
+        startup_seconds.set(round(seconds, 3), phase)
+
+    async def load(self, bot, extension):
+        """Load `extension` once (concurrent callers wait for the same load)."""
+        lock = self._locks.setdefault(extension, asyncio.Lock())
+        async with lock:
+            if extension in bot.extensions:
+                return
+            started = time.perf_counter()
+            try:
+                await bot.load_extension(extension)
+                print(f"Loaded {extension}")
+            except Exception as e:
+                print(f"Failed to load {extension}: {e}")
+            finally:
+                if extension in self.deferred:
+                    self.deferred.remove(extension)
+            self.record(f"cog:{extension}", time.perf_counter() - started)
+
+    async def load_deferred(self, bot):
+        """Load the deferred extensions in the background, yielding between each."""
+        for extension in list(self.deferred):
+            await self.load(bot, extension)
+            await asyncio.sleep(0)
+
+    def pending_owner(self, name):
+        """Deferred extension that will provide command `name`, or None once everything is loaded."""
+        if not self.deferred:
+            return None
+        if self._owners is None:
+            self._owners = {cmd: ext for ext in self.deferred for cmd in command_names(ext)}
+        extension = self._owners.get(name.lower())
+        return extension if extension in self.deferred else None
+
+    async def resolve(self, bot, ctx):
+        """Context for ctx.message once the extension owning its command is loaded."""
+        if ctx.command is not None or not ctx.invoked_with:
+            return ctx
+        extension = self.pending_owner(ctx.invoked_with)
+        if extension is None:
+            return ctx
+        await self.load(bot, extension)
+        return await bot.get_context(ctx.message)
+
+    def report(self):
+        """One line per phase, slowest cogs first."""
+        cogs = sorted(((p, s) for p, s in self.timings.items() if p.startswith("cog:")),
+                      key=lambda kv: kv[1], reverse=True)
+        phases = [(p, s) for p, s in self.timings.items() if not p.startswith("cog:")]
+        lines = ["Startup breakdown:"]
+        lines += [f"  {phase}: {seconds * 1000:,.0f} ms" for phase, seconds in phases + cogs]
+        return "\n".join(lines)
+
+
+# Shared loader used by main.py
+cog_loader = CogLoader()
@@ -1,5 +1,49 @@
 import json
 import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from utils import io_stats
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, cluster mode is POSIX-only
+    fcntl = None
+
+# Set by cluster.py for each worker; JSON files are then shared between processes
+CLUSTER_ID = os.environ.get("CLUSTER_ID")
+# Worker 0 (or the only process) runs the jobs that must happen once per cluster
+PRIMARY = CLUSTER_ID is None or CLUSTER_ID == "0"
+_local = threading.local()  # .held: path -> open lock file, for locks this thread holds
+
+
+@contextmanager
+def locked(path, shared=False):
+    """Hold an advisory lock on `path` across processes (a no-op outside cluster mode).
+
+    Wrap a load -> modify -> save sequence in `with locked(path):` so another
+    worker can't save in between. Re-entrant within a thread; other threads
+    (the leaderboard snapshot thread) open their own lock file and wait like
+    another worker would. Don't await while holding it, the lock blocks other
+    workers for that long.
+    """
+    held = getattr(_local, "held", None)
+    if held is None:
+        held = _local.held = {}
+    if CLUSTER_ID is None or fcntl is None or path in held:
+        yield
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    f = open(path + ".lock", "a")
+    try:
+        fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        held[path] = f
+        yield
+    finally:
+        held.pop(path, None)
+        f.close()  # closing releases the lock
+
 
 def load(path, default=None):
     """Loads JSON data safely."""
@@ -10,14 +54,38 @@ def load(path, default=None):
             json.dump(default, f)
         return default
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        started = time.perf_counter()
+        with locked(path, shared=True), open(path, "r", encoding="utf-8") as f:
+            nbytes = os.fstat(f.fileno()).st_size
+            text = f.read()
+        read_done = time.perf_counter()
+        data = json.loads(text)
     except Exception as e:
         print(f"Error loading {path}: {e}")
         return default
+    io_stats.record("load", path, nbytes, read_done - started,
+                    time.perf_counter() - read_done, sys._getframe(1).f_globals.get("__name__"))
+    return data
 
 def save(path, data):
     """Saves dictionary to JSON."""
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
\ No newline at end of file
+    started = time.perf_counter()
+    text = json.dumps(data, indent=4, ensure_ascii=False)
+    encoded = time.perf_counter()
+    with locked(path):
+        if CLUSTER_ID is None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                nbytes = os.fstat(f.fileno()).st_size
+        else:
+            # Readers in other workers must never see a half-written file
+            tmp = f"{path}.{CLUSTER_ID}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                nbytes = os.fstat(f.fileno()).st_size
+            os.replace(tmp, path)
+    io_stats.record("save", path, nbytes, time.perf_counter() - encoded,
+                    encoded - started, sys._getframe(1).f_globals.get("__name__"))
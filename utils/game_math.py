@@ -55,3 +55,16 @@ def regenerate_pulls(user):
         else:
             user["last_pull_regen_ts"] += (gained * config.PULL_REGEN_SECONDS)
     return user
+
+
+def pulls_full_at(user):
+    """Timestamp at which the user's pulls will be full again, or None if already full.
+
+    Expects `regenerate_pulls` to have been applied first.
+    """
+    max_pulls = user.get("max_pulls", config.MAX_PULLS)
+    curr = user.get("pulls", max_pulls)
+    if curr >= max_pulls:
+        return None
+    last = user.get("last_pull_regen_ts", int(time.time()))
+    return last + (max_pulls - curr) * config.PULL_REGEN_SECONDS
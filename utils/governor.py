@@ -0,0 +1,142 @@
+import asyncio
+import time
+import config
+from utils.metrics import registry, commands_queued
+
+BUCKET_SIZE = 6  # command cost a user can spend in a burst
+REFILL_RATE = 0.5  # cost regained per second
+MAX_IN_FLIGHT = 1  # commands per user running at once
+MAX_QUEUED = 2  # further commands per user allowed to wait for a slot
+QUEUE_TIMEOUT = 10  # seconds a queued command waits before it is dropped
+NOTICE_INTERVAL = 10  # seconds between "slow down" replies to the same user
+PRUNE_INTERVAL = 60
+
+# Cost of one invocation by command name; anything else costs 1.
+# Commands that load/save users.json and sleep through an animation cost more.
+COMMAND_WEIGHTS = {
+    "pull": 2,
+    "mp": 4,
+    "mr": 4,
+    "chest": 2,
+    "claim": 2,
+    "fight": 2,
+    "challenge": 2,
+    "bossraid": 3,
+    "raid": 2,
+    "capture": 2,
+    "kill": 2,
+}
+
+governor_rejected = registry.counter(
+    "governor_rejected_total", "Commands refused by the per-user governor", ["command", "reason"])
+# Lives in utils.metrics so in_flight() counts queued commands (shutdown drains them too)
+governor_queued = commands_queued
+
+NOTICES = {
+    "rate": "⏳ Slow down! You're sending commands too fast.",
+    "busy": "⏳ You already have commands running, wait for them to finish.",
+    "timeout": "⏳ Your previous command is taking a while, try again in a moment.",
+}
+
+
+class _UserState:
+    __slots__ = ("tokens", "updated", "slots", "waiting", "noticed_at")
+
+    def __init__(self, now):
+        self.tokens = BUCKET_SIZE
+        self.updated = now
+        self.slots = asyncio.Semaphore(MAX_IN_FLIGHT)
+        self.waiting = 0
+        self.noticed_at = 0
+
+
+class CommandGovernor:
+    """Per-user token bucket plus a cap on concurrently running commands.
+
+    Each command spends its weight from the user's bucket; a user who runs
+    dry is refused at once. Admitted commands then wait for one of the
+    user's MAX_IN_FLIGHT slots, with at most MAX_QUEUED waiting, so spamming
+    `ls pull` runs the pulls one after another instead of racing each other
+    over users.json, and the rest are rejected before doing any work.
+    """
+
+    def __init__(self):
+        self._users = {}
+        self._pruned_at = time.monotonic()
+
+    def _state(self, uid, now):
+        state = self._users.get(uid)
+        if state is None:
+            state = self._users[uid] = _UserState(now)
+        else:
+            state.tokens = min(BUCKET_SIZE, state.tokens + (now - state.updated) * REFILL_RATE)
+            state.updated = now
+        return state
+
+    def _prune(self, now):
+        """Forget idle users whose bucket has refilled."""
+        self._pruned_at = now
+        full_after = BUCKET_SIZE / REFILL_RATE
+        idle = [uid for uid, s in self._users.items()
+                if not s.waiting and not s.slots.locked() and now - s.updated >= full_after]
+        for uid in idle:
+            del self._users[uid]
+
+    async def acquire(self, uid, command):
+        """Wait for a slot. Returns None once admitted, else the reason for refusing."""
+        now = time.monotonic()
+        if now - self._pruned_at > PRUNE_INTERVAL:
+            self._prune(now)
+        state = self._state(uid, now)
+        weight = COMMAND_WEIGHTS.get(command, 1)
+        if state.tokens < weight:
+            return "rate"
+        if state.slots.locked() and state.waiting >= MAX_QUEUED:
+            return "busy"
+        state.tokens -= weight
+        state.waiting += 1
+        governor_queued.inc()
+        try:
+            await asyncio.wait_for(state.slots.acquire(), QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            return "timeout"
+        finally:
+            state.waiting -= 1
+            governor_queued.dec()
+        return None
+
+    def release(self, uid):
+        state = self._users.get(uid)
+        if state:
+            state.slots.release()
+
+    async def invoke(self, bot, ctx):
+        """bot.invoke(ctx) under the author's limits (admins are exempt)."""
+        if ctx.command is None or ctx.author.id in config.ADMINS:
+            return await bot.invoke(ctx)
+        name = ctx.command.qualified_name
+        reason = await self.acquire(ctx.author.id, name)
+        if reason:
+            governor_rejected.inc(name, reason)
+            await self._notify(ctx, reason)
+            return
+        try:
+            await bot.invoke(ctx)
+        finally:
+            self.release(ctx.author.id)
+
+    async def _notify(self, ctx, reason):
+        # One short-lived reply per window, so the replies don't become spam themselves
+        state = self._users.get(ctx.author.id)
+        now = time.monotonic()
+        if state is None or now - state.noticed_at < NOTICE_INTERVAL:
+            return
+        state.noticed_at = now
+        try:
+            await ctx.send(NOTICES[reason], delete_after=5)
+        except Exception:
+            pass
+
+
+# Shared instance used by main.on_message
+governor = CommandGovernor()
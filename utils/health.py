@@ -0,0 +1,84 @@
+import math
+import time
+from utils import io_stats
+from utils.loop_monitor import loop_monitor
+from utils.scheduler import scheduler, FLUSH_INTERVAL
+
+GATEWAY_GRACE = 300  # seconds without a gateway connection before we report unhealthy
+LAG_LIMIT = 5  # seconds of p99 loop lag before we report unhealthy
+FLUSH_LIMIT = 3 * FLUSH_INTERVAL  # seconds a schedule change may wait for disk before we report not ready
+
+started_at = time.time()
+disconnected_since = started_at  # None while the gateway is connected
+
+
+def track(bot):
+    """Follow the bot's gateway connection through its connect/disconnect events."""
+
+    @bot.listen()
+    async def on_ready():
+        global disconnected_since
+        disconnected_since = None
+
+    @bot.listen()
+    async def on_resumed():
+        global disconnected_since
+        disconnected_since = None
+
+    @bot.listen()
+    async def on_disconnect():
+        global disconnected_since
+        if disconnected_since is None:
+            disconnected_since = time.time()
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1) if math.isfinite(seconds) else None
+
+
+def _age(ts, now):
+    return round(now - ts, 1) if ts else None
+
+
+def report(bot):
+    """Return (healthy, details) for the liveness/readiness endpoints."""
+    now = time.time()
+    connected = bot.is_ready() and not bot.is_closed() and disconnected_since is None
+
+    shards = getattr(bot, "shards", None)
+    if shards:
+        shard_info = [{"id": sid, "connected": not s.is_closed(), "latency_ms": _ms(s.latency)}
+                      for sid, s in sorted(shards.items())]
+    else:
+        shard_info = [{"id": bot.shard_id or 0, "connected": connected, "latency_ms": _ms(bot.latency)}]
+
+    lag_p99 = loop_monitor.percentile(0.99)
+    problems = []
+    if bot.is_closed():
+        problems.append("bot closed")
+    elif disconnected_since is not None and now - disconnected_since > GATEWAY_GRACE:
+        problems.append("gateway disconnected")
+    if lag_p99 > LAG_LIMIT:
+        problems.append("event loop lagging")
+
+    details = {
+        "status": "degraded" if problems else "healthy",
+        "problems": problems,
+        "uptime": round(now - started_at),
+        "gateway": {
+            "connected": connected,
+            "latency_ms": _ms(bot.latency),
+            "disconnected_for": _age(disconnected_since, now),
+        },
+        "shards": shard_info,
+        "storage": {
+            "last_save_age": _age(io_stats.last_save_at, now),
+            "last_schedule_flush_age": _age(scheduler.last_flush, now),
+            "schedule_unflushed_for": round(scheduler.unflushed_for(now), 1),
+        },
+        "event_loop": {
+            "lag_p50_ms": _ms(loop_monitor.percentile(0.5)),
+            "lag_p99_ms": _ms(lag_p99),
+        },
+    }
+    return not problems, details
@@ -0,0 +1,71 @@
+import asyncio
+import os
+import time
+from utils.metrics import registry, current_source
+
+REPORT_INTERVAL = 900  # seconds between printed I/O reports
+
+storage_calls = registry.counter(
+    "storage_calls_total", "JSON storage loads/saves", ["op", "file", "source"])
+storage_bytes = registry.counter(
+    "storage_bytes_total", "Bytes read or written by JSON storage", ["op", "file", "source"])
+storage_io_seconds = registry.histogram(
+    "storage_io_seconds", "Time spent reading or writing the file", ["op", "file"])
+storage_codec_seconds = registry.histogram(
+    "storage_codec_seconds", "Time spent parsing or serializing JSON", ["op", "file"])
+
+last_save_at = 0  # wall time of the last completed save
+
+
+def record(op, path, nbytes, io_seconds, codec_seconds, caller=None):
+    """Account one load/save. `caller` is the calling module, used outside commands."""
+    global last_save_at
+    if op == "save":
+        last_save_at = time.time()
+    name = os.path.basename(path)
+    source = current_source.get() or caller or "unknown"
+    storage_calls.inc(op, name, source)
+    storage_bytes.inc(op, name, source, amount=nbytes)
+    storage_io_seconds.observe(io_seconds, op, name)
+    storage_codec_seconds.observe(codec_seconds, op, name)
+
+
+def report(limit=10):
+    """Plain-text summary of which sources and files generate the most I/O."""
+    calls = {}
+    totals = {}
+    files = {}
+    for (op, name, source), value in storage_bytes.items():
+        totals.setdefault(source, [0, 0])[op == "save"] += value
+        files.setdefault(name, [0, 0])[op == "save"] += value
+    for (op, name, source), value in storage_calls.items():
+        calls[source] = calls.get(source, 0) + value
+    if not calls:
+        return "No storage I/O recorded yet."
+
+    lines = ["Storage I/O by source (calls, read, written):"]
+    ranked = sorted(totals.items(), key=lambda kv: kv[1][0] + kv[1][1], reverse=True)
+    for source, (read, written) in ranked[:limit]:
+        lines.append(f"  {source}: {calls.get(source, 0)} calls, "
+                     f"{read / 1024:,.0f} KiB read, {written / 1024:,.0f} KiB written")
+    lines.append("Storage I/O by file (read, written):")
+    ranked = sorted(files.items(), key=lambda kv: kv[1][0] + kv[1][1], reverse=True)
+    for name, (read, written) in ranked[:limit]:
+        lines.append(f"  {name}: {read / 1024:,.0f} KiB read, {written / 1024:,.0f} KiB written")
+    return "\n".join(lines)
+
+
+async def _report_loop():
+    while True:
+        await asyncio.sleep(REPORT_INTERVAL)
+        print(report())
+
+
+_task = None
+
+
+def start_reporting():
+    """Print report() every REPORT_INTERVAL seconds on the running loop (idempotent)."""
+    global _task
+    if _task is None or _task.done():
+        _task = asyncio.create_task(_report_loop())
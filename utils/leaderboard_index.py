@@ -0,0 +1,267 @@
+import os
+import time
+from bisect import bisect_left, bisect_right, insort
+from utils.database import load, CLUSTER_ID
+
+USERS_FILE = "data/users.json"
+GANGS_FILE = "data/gangs.json"
+GUILD_CACHE_TTL = 60  # seconds a per-server ranking is reused
+CLUSTER_RESYNC = 60  # seconds between re-reads of files other cluster workers save
+
+
+class RankedIndex:
+    """Players kept sorted by score so rankings never need a full sort.
+
+    Entries are (-score, uid) tuples in a plain sorted list: top(k) is a
+    slice and rank() is a binary search. update() moves a single entry.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._scores = {}
+
+    def __len__(self):
+        return len(self._scores)
+
+    def __contains__(self, uid):
+        return str(uid) in self._scores
+
+    def update(self, uid, score):
+        uid = str(uid)
+        old = self._scores.get(uid)
+        if old == score:
+            return
+        if old is not None:
+            i = bisect_left(self._keys, (-old, uid))
+            del self._keys[i]
+        self._scores[uid] = score
+        insort(self._keys, (-score, uid))
+
+    def remove(self, uid):
+        uid = str(uid)
+        old = self._scores.pop(uid, None)
+        if old is not None:
+            i = bisect_left(self._keys, (-old, uid))
+            del self._keys[i]
+
+    def ids(self):
+        """Snapshot of every id in the index."""
+        return list(self._scores)
+
+    def score(self, uid):
+        return self._scores.get(str(uid))
+
+    def top(self, k, offset=0):
+        """[(uid, score)] for ranks offset+1 .. offset+k."""
+        return [(uid, -neg) for neg, uid in self._keys[offset:offset + k]]
+
+    def rank(self, uid):
+        """1-based rank of uid, or None if it isn't indexed."""
+        uid = str(uid)
+        score = self._scores.get(uid)
+        if score is None:
+            return None
+        return bisect_left(self._keys, (-score, uid)) + 1
+
+    def page(self, k, after=None):
+        """Rows following the cursor `after` (the last (uid, score) row already shown).
+
+        Returns (rows, offset) where offset is the 0-based rank of the first row.
+        The cursor is resolved with a binary search, so paging stays cheap and
+        does not skip or repeat rows when scores above it change in between.
+        """
+        start = 0
+        if after is not None:
+            uid, score = after
+            start = bisect_right(self._keys, (-score, str(uid)))
+        return self.top(k, start), start
+
+    def subset(self, uids):
+        """Ranked [(uid, score)] restricted to `uids` (a set of str ids).
+
+        Small sets are looked up and sorted directly; sets comparable to the
+        whole index are filtered in rank order instead, whichever is cheaper.
+        """
+        if len(uids) * 4 < len(self._keys):
+            keys = sorted((-self._scores[uid], uid) for uid in uids if uid in self._scores)
+        else:
+            keys = [key for key in self._keys if key[1] in uids]
+        return [(uid, -neg) for neg, uid in keys]
+
+
+class GuildRanking:
+    """Frozen ranking of one server's members with the RankedIndex read API."""
+
+    def __init__(self, rows, member_ids):
+        self.rows = rows
+        self.member_ids = member_ids
+        self.expires_at = time.time() + GUILD_CACHE_TTL
+        self._positions = {uid: i for i, (uid, _) in enumerate(rows)}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def top(self, k, offset=0):
+        return self.rows[offset:offset + k]
+
+    def rank(self, uid):
+        i = self._positions.get(str(uid))
+        return None if i is None else i + 1
+
+    def page(self, k, after=None):
+        start = 0
+        if after is not None:
+            i = self._positions.get(str(after[0]))
+            start = 0 if i is None else i + 1
+        return self.top(k, start), start
+
+
+def total_aura(user):
+    return sum(int(card.get("aura", 0)) for card in user.get("cards", [])
+               if isinstance(card, dict))
+
+
+# Board name -> score of a user record
+USER_METRICS = {
+    "yen": lambda u: u.get("yen", 0),
+    "wins": lambda u: u.get("wins", 0),
+    "streak": lambda u: u.get("streak", 0),
+    "aura": total_aura,
+    "level": lambda u: u.get("account_level", 1),
+}
+
+boards = {name: RankedIndex() for name in USER_METRICS}
+boards["gang"] = RankedIndex()  # gang/crew exp, keyed by gang id
+yen_index = boards["yen"]
+gang_index = boards["gang"]
+_bootstrapped = False
+_guild_cache = {}  # (guild_id, board) -> GuildRanking
+_synced_at = 0
+_synced_mtimes = {}  # path -> mtime last read by _resync()
+
+
+def ensure_loaded():
+    """Build the indexes from users.json and gangs.json the first time they're needed."""
+    global _bootstrapped
+    if _bootstrapped:
+        if CLUSTER_ID is not None:
+            _resync()
+        return
+    _bootstrapped = True
+    for uid, user in load(USERS_FILE).items():
+        record_user(uid, user)
+    for gid, gang in load(GANGS_FILE).items():
+        record_gang(gid, gang)
+
+
+def rebuild():
+    """Rebuild every index from disk and swap the new ones in.
+
+    Readers that already hold an index (an open leaderboard page) keep the
+    old one until they're done; anything looking the board up afterwards
+    gets the rebuilt one.
+    """
+    global _bootstrapped, yen_index, gang_index
+    fresh = {name: RankedIndex() for name in boards}
+    for uid, user in load(USERS_FILE).items():
+        if isinstance(user, dict) and "yen" in user:
+            for name, metric in USER_METRICS.items():
+                fresh[name].update(uid, metric(user))
+    for gid, gang in load(GANGS_FILE).items():
+        if isinstance(gang, dict):
+            fresh["gang"].update(gid, int(gang.get("exp", 0)))
+    boards.update(fresh)
+    yen_index = boards["yen"]
+    gang_index = boards["gang"]
+    _guild_cache.clear()
+    _bootstrapped = True
+
+
+def _resync():
+    """Pick up changes saved by other cluster workers, at most every CLUSTER_RESYNC seconds."""
+    global _synced_at
+    now = time.time()
+    if now - _synced_at < CLUSTER_RESYNC:
+        return
+    _synced_at = now
+    for path, record in ((USERS_FILE, record_user), (GANGS_FILE, record_gang)):
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            continue
+        if _synced_mtimes.get(path) != mtime:
+            _synced_mtimes[path] = mtime
+            # update() is a no-op for unchanged scores, so only moved players cost a bisect
+            for key, data in load(path).items():
+                record(key, data)
+
+
+def record_user(uid, user):
+    """Refresh a player's entries after their data changed. Call after saving."""
+    if not _bootstrapped:
+        # The first ensure_loaded() will pick the change up from disk
+        return
+    if isinstance(user, dict) and "yen" in user:
+        for name, metric in USER_METRICS.items():
+            boards[name].update(uid, metric(user))
+        _invalidate_guilds(uid)
+
+
+def forget_user(uid):
+    """Drop a player from every index (e.g. after a data wipe)."""
+    for name in USER_METRICS:
+        boards[name].remove(uid)
+    _invalidate_guilds(uid)
+
+
+def _invalidate_guilds(uid):
+    """Drop cached server rankings that include uid."""
+    uid = str(uid)
+    stale = [key for key, ranking in _guild_cache.items() if uid in ranking.member_ids]
+    for key in stale:
+        del _guild_cache[key]
+
+
+def forget_guilds(guild_ids):
+    """Drop cached rankings of servers whose member cache went away (shard reconnect, guild removed)."""
+    guild_ids = set(guild_ids)
+    stale = [key for key in _guild_cache if key[0] in guild_ids]
+    for key in stale:
+        del _guild_cache[key]
+
+
+def guild_ranking(guild, board, member_ids=None):
+    """Ranking of `board` restricted to the guild's cached members.
+
+    The member id set is read once from the guild cache (no per-user
+    get_member calls), unless the caller already has it (`member_ids`), and
+    the result is kept for GUILD_CACHE_TTL seconds or until one of the
+    members' stats change.
+    """
+    ranking = cached_guild_ranking(guild, board)
+    if ranking is not None:
+        return ranking
+    if member_ids is None:
+        member_ids = {str(m.id) for m in guild.members if not m.bot}
+    ranking = GuildRanking(boards[board].subset(member_ids), member_ids)
+    _guild_cache[(guild.id, board)] = ranking
+    return ranking
+
+
+def cached_guild_ranking(guild, board):
+    """The cached server ranking of `board`, or None if it has to be rebuilt."""
+    ensure_loaded()
+    ranking = _guild_cache.get((guild.id, board))
+    if ranking and ranking.expires_at > time.time():
+        return ranking
+    return None
+
+
+def record_gang(gid, gang):
+    """Refresh a gang's exp entry after it changed. Call after saving."""
+    if _bootstrapped and isinstance(gang, dict):
+        gang_index.update(gid, int(gang.get("exp", 0)))
+
+
+def forget_gang(gid):
+    gang_index.remove(gid)
@@ -0,0 +1,64 @@
+import json
+import threading
+import time
+from utils.database import load
+from utils.leaderboard_index import boards, GANGS_FILE
+
+SNAPSHOT_INTERVAL = 60  # seconds between rebuilds
+SNAPSHOT_SIZE = 100  # rows kept per board
+
+
+class SnapshotPublisher:
+    """Periodically materializes the ranked indexes into ready-to-serve JSON.
+
+    Runs in a daemon thread so serializing never blocks the bot's event loop
+    (where the web server lives); requests just return the latest string.
+    The indexes are only read (slices), never mutated, from this thread.
+    """
+
+    def __init__(self, interval=SNAPSHOT_INTERVAL, size=SNAPSHOT_SIZE):
+        self.interval = interval
+        self.size = size
+        self._payloads = {}  # board name (or None for all boards) -> JSON str
+        self._thread = None
+
+    def refresh(self):
+        now = int(time.time())
+        gangs = load(GANGS_FILE)
+        snapshot = {}
+        for name, index in list(boards.items()):
+            rows = []
+            for i, (key, score) in enumerate(index.top(self.size)):
+                row = {"rank": i + 1, "id": key, "score": score}
+                if name == "gang":
+                    g = gangs.get(key, {})
+                    row["name"] = g.get("name", "Unknown")
+                    row["type"] = g.get("type", "gang")
+                rows.append(row)
+            snapshot[name] = {"generated_at": now, "total": len(index), "rows": rows}
+
+        payloads = {name: json.dumps(data) for name, data in snapshot.items()}
+        payloads[None] = json.dumps(snapshot)
+        self._payloads = payloads
+
+    def get(self, board=None):
+        """Latest JSON for one board (or all boards), or None if not built yet."""
+        return self._payloads.get(board)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Leaderboard snapshot failed: {e}")
+            time.sleep(self.interval)
+
+
+# Shared instance read by the web server
+snapshots = SnapshotPublisher()
@@ -0,0 +1,114 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from utils.metrics import registry, current_source, task_sources
+
+SAMPLE_INTERVAL = 0.25  # seconds between lag probes
+LAG_THRESHOLD = 0.5  # a stall this long gets its stack captured
+WINDOW = 1200  # probes kept for percentiles (~5 minutes)
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+loop_lag = registry.histogram(
+    "event_loop_lag_seconds", "Delay between a probe's scheduled and actual wakeup",
+    buckets=LAG_BUCKETS)
+loop_lag_quantile = registry.gauge(
+    "event_loop_lag_quantile_seconds", "Recent event loop lag percentiles", ["quantile"])
+loop_stalls = registry.counter(
+    "event_loop_stalls_total", "Stalls longer than the threshold", ["source"])
+
+
+def running_source(loop):
+    """Command/View name of the task `loop` is currently running (callable from other threads)."""
+    try:
+        task = asyncio.current_task(loop)
+    except Exception:
+        return "unknown"
+    if task is None:
+        return "idle"
+    source = task_sources.get(task)
+    if source:
+        return source
+    if hasattr(task, "get_context"):
+        source = task.get_context().get(current_source)
+        if source:
+            return source
+    return task.get_name()
+
+
+class LoopMonitor:
+    """Measures event-loop lag and captures the stack of whatever blocks it.
+
+    A probe task on the loop records how late each sleep wakes up. A watchdog
+    thread checks the probe's heartbeat; when the loop has been stuck longer
+    than LAG_THRESHOLD it grabs the loop thread's current stack and the
+    command or View that was running, since the loop itself can't report
+    while it is blocked.
+    """
+
+    def __init__(self, threshold=LAG_THRESHOLD):
+        self.threshold = threshold
+        self.samples = deque(maxlen=WINDOW)
+        self.stalls = deque(maxlen=20)  # recent captures: dict(at, lag, source, stack)
+        self._heartbeat = time.monotonic()
+        self._loop = None
+        self._loop_thread = None
+        self._task = None
+
+    def percentile(self, q):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def start(self):
+        """Start the probe task and watchdog thread (idempotent)."""
+        if self._task and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.create_task(self._probe())
+        threading.Thread(target=self._watchdog, daemon=True).start()
+
+    async def _probe(self):
+        n = 0
+        while True:
+            expected = time.monotonic() + SAMPLE_INTERVAL
+            await asyncio.sleep(SAMPLE_INTERVAL)
+            now = time.monotonic()
+            self._heartbeat = now
+            lag = max(0.0, now - expected)
+            self.samples.append(lag)
+            loop_lag.observe(lag)
+            n += 1
+            if n % 20 == 0:
+                for q in (0.5, 0.9, 0.99):
+                    loop_lag_quantile.set(self.percentile(q), str(q))
+
+    def _watchdog(self):
+        captured = False
+        while self._task and not self._task.done():
+            time.sleep(SAMPLE_INTERVAL / 2)
+            stalled = time.monotonic() - self._heartbeat - SAMPLE_INTERVAL
+            if stalled < self.threshold:
+                captured = False
+                continue
+            if captured:
+                continue
+            captured = True
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            source = running_source(self._loop)
+            self.stalls.append({"at": time.time(), "lag": stalled, "source": source, "stack": stack})
+            loop_stalls.inc(source)
+            print(f"Event loop blocked for {stalled:.2f}s+ in {source}:\n{stack}")
+
+
+# Shared monitor started from main.py
+loop_monitor = LoopMonitor()
@@ -0,0 +1,198 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+import discord
+import config
+from utils.metrics import registry
+from utils.leaderboard_index import boards, ensure_loaded
+
+LRU_SIZE = 5000  # members kept from activity and on-demand fetches ("players" policy)
+MISS_TTL = 600  # seconds a "not in this guild" answer is remembered
+QUERY_BATCH = 100  # user ids per gateway member query (Discord's limit)
+
+cached_members = registry.gauge(
+    "member_cache_members", "Guild members held in memory", ["cache"])
+member_lookups = registry.counter(
+    "member_cache_lookups_total", "Member lookups by outcome", ["result"])
+
+
+def client_options():
+    """Extra commands.Bot kwargs for config.MEMBER_CACHE.
+
+    "all" keeps discord.py's defaults: every member of every guild is chunked
+    at startup and cached. "players" caches nobody up front; members are kept
+    in a bounded LRU as they show activity or are looked up.
+    """
+    if config.MEMBER_CACHE != "players":
+        return {}
+    return {"member_cache_flags": discord.MemberCacheFlags.none(), "chunk_guilds_at_startup": False}
+
+
+def rss_bytes():
+    """Resident memory of this process, or None where /proc isn't available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class MemberCache:
+    """Member lookups that work under either member cache policy.
+
+    With "players", discord.py's own cache stays empty, so lookups go through
+    an LRU of recently active or fetched members, then fetch_member (with a
+    negative cache for people who left). Guild membership of players, needed
+    for server leaderboards and opponent search, is read once per guild by
+    querying the users.json ids QUERY_BATCH at a time (never the whole member
+    list) and kept as plain ids; joins, leaves and activity keep it current.
+    It is only re-read after a shard re-identifies, when events may have been
+    missed.
+    """
+
+    def __init__(self):
+        self._lru = OrderedDict()  # (guild_id, user_id) -> Member
+        self._misses = {}  # (guild_id, user_id) -> expiry
+        self._guild_players = {}  # guild_id -> {str user id}, kept current by events
+        self._unreadable = {}  # guild_id -> time after which a failed read is retried
+        self._reading = {}  # guild_id -> task querying the guild's players
+
+    @property
+    def full(self):
+        return config.MEMBER_CACHE != "players"
+
+    def remember(self, member):
+        if self.full or not isinstance(member, discord.Member):
+            return
+        key = (member.guild.id, member.id)
+        self._lru[key] = member
+        self._lru.move_to_end(key)
+        if len(self._lru) > LRU_SIZE:
+            self._lru.popitem(last=False)
+        self._misses.pop(key, None)
+        players = self._guild_players.get(member.guild.id)
+        if players is not None and not member.bot:
+            # May not have a record yet; rankings and opponent search skip those
+            players.add(str(member.id))
+
+    def joined(self, member):
+        players = self._guild_players.get(member.guild.id)
+        if players is not None and not member.bot and str(member.id) in boards["yen"]:
+            players.add(str(member.id))
+
+    def forget(self, guild_id, user_id):
+        self._lru.pop((guild_id, user_id), None)
+        players = self._guild_players.get(guild_id)
+        if players is not None:
+            players.discard(str(user_id))
+
+    def forget_guilds(self, guild_ids):
+        """Drop player sets that may have missed events (shard re-identified, guild removed)."""
+        for guild_id in guild_ids:
+            self._guild_players.pop(guild_id, None)
+            self._unreadable.pop(guild_id, None)
+
+    def get(self, guild, user_id):
+        """Cached member or None; never hits the API."""
+        member = guild.get_member(user_id)
+        if member is None and not self.full:
+            member = self._lru.get((guild.id, user_id))
+            if member is not None:
+                self._lru.move_to_end((guild.id, user_id))
+        return member
+
+    async def fetch(self, guild, user_id):
+        """Member or None, fetching (and caching) it on a miss."""
+        member = self.get(guild, user_id)
+        if member is not None:
+            member_lookups.inc("hit")
+            return member
+        key = (guild.id, user_id)
+        if self._misses.get(key, 0) > time.time():
+            member_lookups.inc("miss")
+            return None
+        try:
+            member = await guild.fetch_member(user_id)
+        except (discord.NotFound, discord.Forbidden):
+            self._misses[key] = time.time() + MISS_TTL
+            member_lookups.inc("miss")
+            return None
+        member_lookups.inc("fetched")
+        self.remember(member)
+        return member
+
+    async def member_ids(self, guild):
+        """String ids of the guild's human members who have a player record (all members under "all").
+
+        Only the first call for a guild waits for the queries; concurrent
+        callers share them.
+        """
+        if self.full:
+            return {str(m.id) for m in guild.members if not m.bot}
+        players = self._guild_players.get(guild.id)
+        if players is not None:
+            return players
+        if self._unreadable.get(guild.id, 0) > time.time():
+            return set()
+        task = self._reading.get(guild.id)
+        if task is None:
+            task = self._reading[guild.id] = asyncio.create_task(self._read_players(guild))
+            task.add_done_callback(lambda _: self._reading.pop(guild.id, None))
+        return await asyncio.shield(task)
+
+    async def _read_players(self, guild):
+        ensure_loaded()
+        player_ids = [int(uid) for uid in boards["yen"].ids() if uid.isdigit()]
+        found = set()
+        try:
+            for i in range(0, len(player_ids), QUERY_BATCH):
+                batch = player_ids[i:i + QUERY_BATCH]
+                members = await guild.query_members(user_ids=batch, limit=len(batch), cache=False)
+                found.update(str(m.id) for m in members if not m.bot)
+        except Exception as e:
+            # e.g. the members intent is off; retry later instead of on every command
+            print(f"Could not read members of guild {guild.id}: {e}")
+            self._unreadable[guild.id] = time.time() + MISS_TTL
+            return set()
+        self._guild_players[guild.id] = found
+        return found
+
+    def stats(self, bot):
+        """{"discord": members in discord.py's cache, "lru": members held here}."""
+        counts = {"discord": sum(len(g.members) for g in bot.guilds), "lru": len(self._lru)}
+        for name, value in counts.items():
+            cached_members.set(value, name)
+        return counts
+
+
+def track(bot):
+    """Keep recently active members and drop those who leave."""
+
+    @bot.listen()
+    async def on_message(message):
+        member_cache.remember(message.author)
+
+    @bot.listen()
+    async def on_interaction(interaction):
+        member_cache.remember(interaction.user)
+
+    @bot.listen()
+    async def on_member_join(member):
+        member_cache.joined(member)
+
+    @bot.listen()
+    async def on_raw_member_remove(payload):
+        member_cache.forget(payload.guild_id, payload.user.id)
+
+    @bot.listen()
+    async def on_ready():
+        counts = member_cache.stats(bot)
+        rss = rss_bytes()
+        print(f"Member cache ({config.MEMBER_CACHE}): {counts['discord']:,} cached by discord.py, "
+              f"{counts['lru']:,} in LRU"
+              + (f", RSS {rss / 1048576:,.0f} MiB" if rss else ""))
+
+
+# Shared instance used by the cogs
+member_cache = MemberCache()
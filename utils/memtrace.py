@@ -0,0 +1,70 @@
+import gc
+import sys
+import tracemalloc
+
+TRACE_FRAMES = 10
+
+
+class MemoryTracer:
+    """tracemalloc snapshots diffed against a baseline taken at start()."""
+
+    def __init__(self):
+        self.baseline = None
+
+    @property
+    def tracing(self):
+        return tracemalloc.is_tracing()
+
+    def start(self, frames=TRACE_FRAMES):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.baseline = self._snapshot()
+
+    def stop(self):
+        self.baseline = None
+        tracemalloc.stop()
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+
+    def diff(self, limit=10, reset=False):
+        """Top allocation sites grown since the baseline: [(where, size_diff, count_diff)]."""
+        snapshot = self._snapshot()
+        stats = snapshot.compare_to(self.baseline, "lineno")
+        if reset:
+            self.baseline = snapshot
+        top = []
+        for stat in stats[:limit]:
+            frame = stat.traceback[0]
+            where = f"{frame.filename.rsplit('/', 1)[-1]}:{frame.lineno}"
+            top.append((where, stat.size_diff, stat.count_diff))
+        return top
+
+    def traced_memory(self):
+        """(current, peak) bytes allocated while tracing."""
+        return tracemalloc.get_traced_memory()
+
+
+def live_views():
+    """Live discord.ui.View instances grouped by class, e.g. {"BattleView": 3}."""
+    from discord.ui import View
+
+    counts = {}
+    for obj in gc.get_objects():
+        if isinstance(obj, View):
+            name = type(obj).__name__
+            counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+def raid_lobbies():
+    """Number of open raid lobbies, or None if the raid cog isn't loaded."""
+    raid = sys.modules.get("cogs.raid")
+    return len(raid.active_lobbies) if raid else None
+
+
+# Shared tracer used by the admin memory command
+memtrace = MemoryTracer()
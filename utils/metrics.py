@@ -0,0 +1,199 @@
+import asyncio
+import time
+from contextvars import ContextVar
+
+# Upper bounds in seconds; the pull animation alone sleeps 1-2s
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Command or View running in the current task, used to attribute work to it
+current_source = ContextVar("current_source", default=None)
+# The same, keyed by task so other threads (loop monitor, profiler) can read it;
+# Task.get_context() only exists on Python 3.12+
+task_sources = {}
+
+
+def _label_str(labelnames, labels, extra=None):
+    pairs = list(zip(labelnames, labels))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    body = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+                    for k, v in pairs)
+    return "{" + body + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def items(self):
+        return list(self._values.items())
+
+    def samples(self):
+        for labels, value in list(self._values.items()):
+            yield self.name + _label_str(self.labelnames, labels), value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value, *labels):
+        self._values[labels] = value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}  # labels -> [bucket counts..., sum, count]
+
+    def observe(self, value, *labels):
+        data = self._values.get(labels)
+        if data is None:
+            data = self._values[labels] = [0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                data[i] += 1
+        data[-2] += value
+        data[-1] += 1
+
+    def samples(self):
+        for labels, data in list(self._values.items()):
+            for bound, count in zip(self.buckets, data):
+                yield (self.name + "_bucket"
+                       + _label_str(self.labelnames, labels, ("le", bound)), count)
+            yield self.name + "_bucket" + _label_str(self.labelnames, labels, ("le", "+Inf")), data[-1]
+            yield self.name + "_sum" + _label_str(self.labelnames, labels), data[-2]
+            yield self.name + "_count" + _label_str(self.labelnames, labels), data[-1]
+
+
+class MetricsRegistry:
+    """Minimal in-process metrics store rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def _get(self, cls, name, help, labelnames, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+        return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self._get(Counter, name, help, labelnames)
+
+    def gauge(self, name, help, labelnames=()):
+        return self._get(Gauge, name, help, labelnames)
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help, labelnames, buckets=buckets)
+
+    def render(self):
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample, value in metric.samples():
+                lines.append(f"{sample} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# Shared registry exported at /metrics
+registry = MetricsRegistry()
+
+command_latency = registry.histogram(
+    "bot_command_duration_seconds", "Command latency from invoke to completion", ["command"])
+command_errors = registry.counter(
+    "bot_command_errors_total", "Commands that raised", ["command"])
+command_in_flight = registry.gauge(
+    "bot_commands_in_flight", "Commands currently running", ["command"])
+commands_queued = registry.gauge(
+    "governor_queued", "Commands waiting for a per-user slot")
+view_latency = registry.histogram(
+    "bot_view_callback_duration_seconds", "View interaction callback latency", ["view"])
+view_errors = registry.counter(
+    "bot_view_callback_errors_total", "View interaction callbacks that raised", ["view"])
+view_in_flight = registry.gauge(
+    "bot_view_callbacks_in_flight", "View interaction callbacks currently running", ["view"])
+
+
+def in_flight():
+    """Commands plus View callbacks currently running, and commands queued behind the governor."""
+    return (sum(v for _, v in command_in_flight.items())
+            + commands_queued.value()
+            + sum(v for _, v in view_in_flight.items()))
+
+
+def instrument_bot(bot):
+    """Time every command through the bot's global invoke hooks."""
+
+    @bot.before_invoke
+    async def _metrics_before(ctx):
+        ctx.metrics_started = time.perf_counter()
+        current_source.set(ctx.command.qualified_name)
+        task_sources[asyncio.current_task()] = ctx.command.qualified_name
+        command_in_flight.inc(ctx.command.qualified_name)
+
+    @bot.after_invoke
+    async def _metrics_after(ctx):
+        # after_invoke also runs when the command raised
+        name = ctx.command.qualified_name
+        task_sources.pop(asyncio.current_task(), None)
+        started = getattr(ctx, "metrics_started", None)
+        if started is None:
+            return
+        command_in_flight.dec(name)
+        command_latency.observe(time.perf_counter() - started, name)
+        if ctx.command_failed:
+            command_errors.inc(name)
+
+
+def instrument_views():
+    """Time interaction callbacks of every discord.ui.View subclass."""
+    from discord.ui import View
+
+    if getattr(View, "_metrics_instrumented", False):
+        return
+    View._metrics_instrumented = True
+    original_task = View._scheduled_task
+    original_on_error = View.on_error
+
+    async def _scheduled_task(self, item, interaction):
+        name = type(self).__name__
+        current_source.set(name)
+        task = asyncio.current_task()
+        task_sources[task] = name
+        view_in_flight.inc(name)
+        started = time.perf_counter()
+        try:
+            return await original_task(self, item, interaction)
+        finally:
+            task_sources.pop(task, None)
+            view_in_flight.dec(name)
+            view_latency.observe(time.perf_counter() - started, name)
+
+    async def on_error(self, interaction, error, item):
+        view_errors.inc(type(self).__name__)
+        return await original_on_error(self, interaction, error, item)
+
+    View._scheduled_task = _scheduled_task
+    View.on_error = on_error
@@ -0,0 +1,150 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import discord
+from utils.metrics import registry
+
+HIGH = 0  # results the user is waiting for
+LOW = 1  # cosmetic messages (animations, progress edits); dropped under backlog
+MAX_IN_FLIGHT = 8  # requests running at once across all channels
+LOW_DROP_DEPTH = 40  # queued jobs above which LOW sends/edits are dropped
+
+outbox_depth = registry.gauge(
+    "outbox_queue_depth", "Sends and edits waiting in the outbound queue")
+outbox_sent = registry.counter(
+    "outbox_requests_total", "Sends and edits performed by the outbound queue", ["kind", "priority"])
+outbox_merged = registry.counter(
+    "outbox_merged_edits_total", "Edits folded into an edit of the same message still queued")
+outbox_dropped = registry.counter(
+    "outbox_dropped_total", "Low-priority sends and edits dropped under backlog", ["kind"])
+rate_limited = registry.counter(
+    "discord_rate_limited_total", "429 responses from the Discord API", ["scope"])
+
+
+class _RateLimitCounter(logging.Handler):
+    """Counts the 429s discord.py's HTTP client logs before it retries them."""
+
+    def emit(self, record):
+        message = record.getMessage()
+        if "Global rate limit" in message:
+            rate_limited.inc("global")
+        elif "rate limited" in message or "429" in message:
+            rate_limited.inc("route")
+
+
+logging.getLogger("discord.http").addHandler(_RateLimitCounter(logging.WARNING))
+
+
+class _Job:
+    __slots__ = ("kind", "target", "kwargs", "priority", "future", "started")
+
+    def __init__(self, kind, target, kwargs, priority):
+        self.kind = kind
+        self.target = target
+        self.kwargs = kwargs
+        self.priority = priority
+        self.future = asyncio.get_running_loop().create_future()
+        self.started = False
+
+
+class Outbox:
+    """Outbound message queue with one lane per channel.
+
+    Discord rate-limits message routes per channel, so each channel gets its
+    own priority queue drained by a single worker (one request in flight per
+    channel), and MAX_IN_FLIGHT caps requests across channels. HIGH jobs go
+    before LOW ones; an edit to a message that already has an edit queued is
+    merged into it, so only the latest content is sent; LOW jobs are dropped
+    (resolving to None) once the backlog passes LOW_DROP_DEPTH. discord.py
+    still handles the bucket headers and retries.
+
+    Interaction responses don't go through here: they have a 3 second
+    deadline and their own webhook bucket, so they are never held up by
+    queued channel traffic.
+    """
+
+    def __init__(self):
+        self._lanes = {}  # channel id -> heap of (priority, seq, job)
+        self._workers = {}  # channel id -> task draining that lane
+        self._edits = {}  # message id -> queued edit job
+        self._seq = itertools.count()
+        self._slots = None
+        self.depth = 0
+
+    def send(self, channel, priority=HIGH, **kwargs):
+        """Queue channel.send(**kwargs); await the result for the Message (None if dropped)."""
+        job = _Job("send", channel, kwargs, priority)
+        self._enqueue(channel.id, job)
+        return job.future
+
+    def edit(self, message, priority=HIGH, **kwargs):
+        """Queue message.edit(**kwargs), merging with an edit of the same message still queued."""
+        queued = self._edits.get(message.id)
+        if queued is not None and not queued.started:
+            queued.kwargs.update(kwargs)
+            outbox_merged.inc()
+            if priority < queued.priority:
+                queued.priority = priority
+                self._push(message.channel.id, queued)
+            return queued.future
+        job = _Job("edit", message, kwargs, priority)
+        if self._enqueue(message.channel.id, job):
+            # Only a job that is actually queued can take later edits
+            self._edits[message.id] = job
+        return job.future
+
+    def _enqueue(self, channel_id, job):
+        """Queue `job`; returns False if it was dropped instead."""
+        if job.priority == LOW and self.depth >= LOW_DROP_DEPTH:
+            outbox_dropped.inc(job.kind)
+            job.future.set_result(None)
+            return False
+        self.depth += 1
+        outbox_depth.set(self.depth)
+        self._push(channel_id, job)
+        if channel_id not in self._workers:
+            self._workers[channel_id] = asyncio.create_task(self._drain(channel_id))
+        return True
+
+    def _push(self, channel_id, job):
+        heapq.heappush(self._lanes.setdefault(channel_id, []), (job.priority, next(self._seq), job))
+
+    async def _drain(self, channel_id):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(MAX_IN_FLIGHT)
+        lane = self._lanes[channel_id]
+        try:
+            while lane:
+                _, _, job = heapq.heappop(lane)
+                if job.started:
+                    continue  # stale entry left behind by a priority bump
+                job.started = True
+                self.depth -= 1
+                outbox_depth.set(self.depth)
+                if job.kind == "edit" and self._edits.get(job.target.id) is job:
+                    del self._edits[job.target.id]
+                async with self._slots:
+                    try:
+                        if job.kind == "send":
+                            result = await job.target.send(**job.kwargs)
+                        else:
+                            result = await job.target.edit(**job.kwargs)
+                    except Exception as e:
+                        if isinstance(e, discord.HTTPException) and e.status == 429:
+                            rate_limited.inc("exhausted")
+                        if not job.future.done():
+                            job.future.set_exception(e)
+                        continue
+                outbox_sent.inc(job.kind, "high" if job.priority == HIGH else "low")
+                if not job.future.done():
+                    job.future.set_result(result)
+        finally:
+            # If cancelled mid-drain, the next job queued here starts a new worker
+            del self._workers[channel_id]
+            if not lane:
+                del self._lanes[channel_id]
+
+
+# Shared queue used by the cogs for non-interaction messages
+outbox = Outbox()
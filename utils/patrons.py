@@ -0,0 +1,130 @@
+import heapq
+import os
+import time
+from utils.database import load, save, locked, CLUSTER_ID
+
+PATRONS_FILE = "data/patrons.json"
+USERS_FILE = "data/users.json"
+
+
+class PatronRegistry:
+    """uid -> tier map plus a min-heap ordered by expiry.
+
+    Kept in its own small file so patron checks never load users.json. The
+    first time the file is missing it is rebuilt from users.json once.
+    Stale heap entries (renewed or removed patrons) are skipped on pop.
+    In cluster mode other workers save the same file, so the map is reloaded
+    when the file's mtime changes and every change is applied to a fresh
+    copy under the file lock.
+    """
+
+    def __init__(self, path=PATRONS_FILE):
+        self.path = path
+        self._patrons = None  # uid -> {"tier", "name", "expires_at"}
+        self._heap = []
+        self._mtime = None  # st_mtime_ns of the file the map was read from
+
+    def _ensure_loaded(self):
+        if self._patrons is not None:
+            if CLUSTER_ID is not None and self._file_mtime() != self._mtime:
+                self._read()
+            return
+        with locked(self.path):
+            if os.path.exists(self.path):
+                self._read()
+                return
+            patrons = {}
+            for uid, user_data in load(USERS_FILE).items():
+                if isinstance(user_data, dict) and "patreon" in user_data:
+                    p = user_data["patreon"]
+                    patrons[uid] = {
+                        "tier": p.get("tier"),
+                        "name": p.get("name", "Unknown"),
+                        "expires_at": p.get("expires_at", 0),
+                    }
+            self._patrons = patrons
+            self._heapify()
+            self._save()
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _read(self):
+        self._mtime = self._file_mtime()
+        self._patrons = load(self.path)
+        self._heapify()
+
+    def _heapify(self):
+        self._heap = [(p["expires_at"], uid) for uid, p in self._patrons.items()]
+        heapq.heapify(self._heap)
+
+    def _save(self):
+        save(self.path, self._patrons)
+        self._mtime = self._file_mtime()
+
+    def add(self, uid, tier, name, expires_at):
+        with locked(self.path):
+            self._ensure_loaded()
+            uid = str(uid)
+            self._patrons[uid] = {"tier": tier, "name": name, "expires_at": expires_at}
+            heapq.heappush(self._heap, (expires_at, uid))
+            self._save()
+
+    def remove(self, uid):
+        with locked(self.path):
+            self._ensure_loaded()
+            if self._patrons.pop(str(uid), None) is not None:
+                self._save()
+
+    def get(self, uid):
+        """Patron record for uid, or None."""
+        self._ensure_loaded()
+        return self._patrons.get(str(uid))
+
+    def is_patron(self, uid, now=None):
+        """True if uid has an unexpired Patreon subscription."""
+        p = self.get(uid)
+        now = now if now is not None else time.time()
+        return bool(p) and p["expires_at"] > now
+
+    def items(self):
+        self._ensure_loaded()
+        return list(self._patrons.items())
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._patrons)
+
+    def next_expiry(self):
+        """Earliest expiry timestamp among current patrons, or None."""
+        self._ensure_loaded()
+        while self._heap:
+            expires_at, uid = self._heap[0]
+            p = self._patrons.get(uid)
+            if p and p["expires_at"] == expires_at:
+                return expires_at
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_expired(self, now=None):
+        """Remove and return the uids whose subscription has expired."""
+        with locked(self.path):
+            self._ensure_loaded()
+            now = now if now is not None else time.time()
+            expired = []
+            while self._heap and self._heap[0][0] <= now:
+                expires_at, uid = heapq.heappop(self._heap)
+                p = self._patrons.get(uid)
+                if p and p["expires_at"] == expires_at:
+                    del self._patrons[uid]
+                    expired.append(uid)
+            if expired:
+                self._save()
+        return expired
+
+
+# Shared instance used by the gacha and patreon cogs
+patrons = PatronRegistry()
@@ -0,0 +1,84 @@
+class PrefixMatcher:
+    """Callable command_prefix that matches case-insensitive prefixes in O(1).
+
+    config.PREFIXES spells out every case permutation of "ls " and "ls", and
+    discord.py tries each of them with startswith() on every message it
+    sees. This lowercases the first few characters once and compares them
+    against the distinct lowercase prefixes (longest first, so "ls pull"
+    still resolves to "ls "). is_command() additionally checks the invoked
+    word against the bot's command table, so chatter that merely starts
+    with "ls" is dropped before discord.py builds a Context for it.
+    """
+
+    def __init__(self, prefixes):
+        self.prefixes = list(prefixes)
+        self._bases = sorted({p.lower() for p in self.prefixes}, key=len, reverse=True)
+        self._width = len(self._bases[0])
+        self._first = {c for p in self._bases for c in (p[0].lower(), p[0].upper())}
+
+    def match(self, content):
+        """The prefix exactly as typed at the start of `content`, or None."""
+        if content[:1] not in self._first:
+            return None  # most chatter stops at one set lookup
+        head = content[:self._width].lower()
+        for base in self._bases:
+            if head.startswith(base):
+                return content[:len(base)]
+        return None
+
+    def __call__(self, bot, message):
+        # Fall back to the full list so discord.py's own matching still fails cleanly
+        return self.match(message.content) or self.prefixes
+
+    def is_command(self, bot, content, pending_owner=None):
+        """True if `content` invokes a loaded command or alias (or one of a deferred cog)."""
+        prefix = self.match(content)
+        if prefix is None:
+            return False
+        rest = content[len(prefix):]
+        if not rest or rest[0].isspace():
+            return False
+        word = rest.split(None, 1)[0]
+        # all_commands is discord.py's name/alias table (case-insensitive with case_insensitive=True)
+        return word in bot.all_commands or (pending_owner is not None and pending_owner(word) is not None)
+
+
+def benchmark(n=200000):
+    """Per-message prefix overhead: discord.py-style list scan vs PrefixMatcher."""
+    import timeit
+
+    prefixes = ["ls ", "ls", "LS ", "LS", "Ls ", "Ls", "lS ", "lS"]
+    matcher = PrefixMatcher(prefixes)
+
+    class Bot:
+        all_commands = {"pull": None, "bal": None, "p": None}
+
+    bot = Bot()
+    messages = {
+        "chatter": "hey has anyone seen the new episode yet?",
+        "ls chatter": "lsd is a weird name for a channel",
+        "command": "ls pull",
+    }
+
+    def scan(content):
+        # What discord.py's get_prefix/get_context do with a list prefix: copy the
+        # list, startswith() the tuple, then find() which entry matched
+        ret = list(prefixes)
+        if not content.startswith(tuple(ret)):
+            return None
+        for p in ret:
+            if content.startswith(p):
+                return p
+        return None
+
+    print(f"{'message':<12} {'list scan':>12} {'match':>12} {'is_command':>12}")
+    for name, content in messages.items():
+        t_scan = timeit.timeit(lambda: scan(content), number=n) / n * 1e9
+        t_match = timeit.timeit(lambda: matcher.match(content), number=n) / n * 1e9
+        t_cmd = timeit.timeit(lambda: matcher.is_command(bot, content), number=n) / n * 1e9
+        print(f"{name:<12} {t_scan:>10.0f}ns {t_match:>10.0f}ns {t_cmd:>10.0f}ns")
+
+
+if __name__ == "__main__":
+    # python -m utils.prefix
+    benchmark()
@@ -0,0 +1,60 @@
+import asyncio
+import sys
+import threading
+import time
+from utils.loop_monitor import running_source
+
+SAMPLE_INTERVAL = 0.005  # 200 Hz
+MAX_DURATION = 120
+
+
+class SamplingProfiler:
+    """Samples the event-loop thread's stack from a background thread.
+
+    Stacks are aggregated in the collapsed format read by flamegraph.pl and
+    speedscope ("root;frame;frame count"), with the running command or View
+    as the root frame so hot paths can be compared per command. Nothing is
+    hooked into the interpreter, so the bot runs at full speed in between
+    samples.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.running = False
+
+    async def run(self, seconds):
+        """Profile the running loop for `seconds`. Returns (collapsed stacks as bytes, sample count)."""
+        if self.running:
+            raise RuntimeError("A profile is already running")
+        loop = asyncio.get_running_loop()
+        self.running = True
+        try:
+            return await asyncio.to_thread(self._sample, loop, threading.get_ident(), seconds)
+        finally:
+            self.running = False
+
+    def _sample(self, loop, loop_thread, seconds):
+        counts = {}
+        total = 0
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            frame = sys._current_frames().get(loop_thread)
+            if frame is not None:
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]})")
+                    frame = frame.f_back
+                stack.append(running_source(loop))
+                key = ";".join(reversed(stack))
+                counts[key] = counts.get(key, 0) + 1
+                total += 1
+            time.sleep(self.interval)
+
+        lines = [f"{stack} {count}" for stack, count in
+                 sorted(counts.items(), key=lambda kv: kv[1], reverse=True)]
+        return ("\n".join(lines) + "\n").encode("utf-8"), total
+
+
+# Shared instance used by the admin profile command
+profiler = SamplingProfiler()
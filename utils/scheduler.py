@@ -0,0 +1,292 @@
+import asyncio
+import heapq
+import os
+import time
+from utils.database import load, save, locked, CLUSTER_ID, PRIMARY
+
+# Cluster workers each keep their own deadlines
+SCHEDULE_FILE = "data/schedule.json" if CLUSTER_ID is None else f"data/schedule-{CLUSTER_ID}.json"
+# Changes to primary_only deadlines made on other workers, waiting for the primary
+INBOX_FILE = "data/schedule-inbox.json"
+FLUSH_INTERVAL = 30  # seconds between writes of a changed schedule
+MAX_SLEEP = 300
+
+
+class Scheduler:
+    """Persistent min-heap of deadlines shared by every cog.
+
+    A deadline is identified by (kind, key), e.g. ("daily_claim", "<uid>").
+    Cogs register one async handler per kind; when deadlines fire the handler
+    receives a list of (key, payload) tuples, so a batch that comes due
+    together can be processed with a single load/save. Kinds registered
+    without a handler are plain cooldown markers and are simply dropped when
+    due; due deadlines of a kind nobody has registered yet (its cog failed to
+    load or is being reloaded) are parked until a handler registers.
+    Kinds registered as primary_only track data shared by the whole cluster
+    and are only kept by the primary worker, so they fire once; the other
+    workers forward their changes to it through INBOX_FILE.
+    Rescheduling pushes a new heap entry and stale ones are skipped on pop, so
+    schedule, cancel and due_at never walk the whole set.
+    """
+
+    def __init__(self, path=SCHEDULE_FILE):
+        self.path = path
+        self._heap = []
+        self._entries = {}  # (kind, key) -> (when, payload)
+        self._kind_counts = {}  # kind -> number of entries, so has_kind needn't scan
+        self._handlers = {}  # kind -> async handler, or None for cooldown markers
+        self._parked = {}  # kind -> [(when, key)] due but waiting for a handler
+        self._elsewhere = set()  # primary_only kinds this worker leaves to the primary
+        self._inbox_mtime = None  # st_mtime_ns of INBOX_FILE when the primary last read it
+        self._loaded = False
+        self._pending = 0  # changes since the last flush
+        self.dirty_since = None  # time of the oldest change not yet flushed
+        self.last_flush = 0
+        self._wakeup = None
+        self._task = None
+        self._paused = False
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        data = load(self.path)
+        for kind, entries in data.items():
+            for key, (when, payload) in entries.items():
+                self._push(kind, key, when, payload)
+        self._pending = 0
+
+    def _push(self, kind, key, when, payload):
+        when = int(when)
+        if (kind, key) not in self._entries:
+            self._kind_counts[kind] = self._kind_counts.get(kind, 0) + 1
+        self._entries[(kind, key)] = (when, payload)
+        heapq.heappush(self._heap, (when, kind, key))
+
+    def _remove(self, kind, key):
+        """Drop (kind, key); returns its (when, payload) or None. Its heap entry goes stale."""
+        entry = self._entries.pop((kind, key), None)
+        if entry is not None:
+            self._kind_counts[kind] -= 1
+            if not self._kind_counts[kind]:
+                del self._kind_counts[kind]
+        return entry
+
+    def _changed(self):
+        self._pending += 1
+        if self.dirty_since is None:
+            self.dirty_since = time.time()
+
+    def unflushed_for(self, now=None):
+        """Seconds the oldest unflushed change has waited (0 when the file is current).
+
+        Changes are debounced for up to FLUSH_INTERVAL, so anything well past
+        that means flushes are failing or the dispatch task is stuck.
+        """
+        if self.dirty_since is None:
+            return 0
+        now = now if now is not None else time.time()
+        return max(0, now - self.dirty_since)
+
+    def register(self, kind, handler=None, primary_only=False):
+        """Register `async def handler(items)` for deadlines of `kind`.
+
+        Without a handler, `kind` is a cooldown marker that is only queried
+        with due_at/remaining and discarded once it passes. On workers other
+        than the primary, a primary_only kind is dropped and later schedule
+        calls for it are ignored.
+        """
+        if primary_only and not PRIMARY:
+            self._ensure_loaded()
+            self._elsewhere.add(kind)
+            self._parked.pop(kind, None)
+            # Hand over deadlines this worker kept before the kind was primary_only
+            held = [(key, when, payload) for (k, key), (when, payload) in self._entries.items() if k == kind]
+            for key, _, _ in held:
+                self._remove(kind, key)
+                self._changed()
+            if held:
+                self._forward([[kind, key, when, payload] for key, when, payload in held])
+            return
+        self._handlers[kind] = handler
+        parked = self._parked.pop(kind, None)
+        if parked:
+            for when, key in parked:
+                heapq.heappush(self._heap, (when, kind, key))
+            if self._wakeup:
+                self._wakeup.set()
+
+    def schedule(self, kind, key, when, payload=None):
+        """Set (or move) the deadline for (kind, key). `when=None` cancels it."""
+        self._ensure_loaded()
+        if kind in self._elsewhere:
+            self._forward([[kind, str(key), when, payload]])
+            return
+        key = str(key)
+        if when is None:
+            self.cancel(kind, key)
+            return
+        current = self._entries.get((kind, key))
+        if current and current == (int(when), payload):
+            return
+        self._push(kind, key, when, payload)
+        self._changed()
+        if self._wakeup and int(when) <= self.next_due():
+            self._wakeup.set()
+
+    def cancel(self, kind, key):
+        self._ensure_loaded()
+        if kind in self._elsewhere:
+            self._forward([[kind, str(key), None, None]])
+            return
+        if self._remove(kind, str(key)) is not None:
+            self._changed()
+
+    def due_at(self, kind, key):
+        """Timestamp of the pending deadline for (kind, key), or None."""
+        self._ensure_loaded()
+        entry = self._entries.get((kind, str(key)))
+        return entry[0] if entry else None
+
+    def remaining(self, kind, key, now=None):
+        """Seconds until (kind, key) is ready; 0 when nothing is pending."""
+        when = self.due_at(kind, key)
+        if when is None:
+            return 0
+        now = now if now is not None else time.time()
+        return max(0, int(when - now))
+
+    def _forward(self, changes):
+        """Append [kind, key, when, payload] changes (when=None cancels) to the primary's inbox."""
+        with locked(INBOX_FILE):
+            inbox = load(INBOX_FILE, default=[])
+            inbox.extend(changes)
+            save(INBOX_FILE, inbox)
+
+    def take_forwarded(self):
+        """On the primary, apply the changes other workers forwarded since the last call.
+
+        A stat per call; the inbox is only read when its mtime moved.
+        """
+        if CLUSTER_ID is None or not PRIMARY:
+            return
+        try:
+            mtime = os.stat(INBOX_FILE).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._inbox_mtime:
+            return
+        with locked(INBOX_FILE):
+            inbox = load(INBOX_FILE, default=[])
+            if inbox:
+                save(INBOX_FILE, [])
+            self._inbox_mtime = os.stat(INBOX_FILE).st_mtime_ns
+        for kind, key, when, payload in inbox:
+            self.schedule(kind, key, when, payload)
+
+    def owns(self, kind):
+        """False for a primary_only kind on a worker other than the primary."""
+        return kind not in self._elsewhere
+
+    def has_kind(self, kind):
+        self._ensure_loaded()
+        return kind in self._kind_counts
+
+    def next_due(self):
+        """Earliest pending deadline across all kinds, or None."""
+        self._ensure_loaded()
+        while self._heap:
+            when, kind, key = self._heap[0]
+            entry = self._entries.get((kind, key))
+            if entry and entry[0] == when:
+                return when
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now=None):
+        """Remove and return due deadlines grouped by kind: {kind: [(key, payload)]}."""
+        self._ensure_loaded()
+        now = now if now is not None else time.time()
+        ready = {}
+        while self._heap and self._heap[0][0] <= now:
+            when, kind, key = heapq.heappop(self._heap)
+            entry = self._entries.get((kind, key))
+            if not entry or entry[0] != when:
+                continue
+            if kind not in self._handlers:
+                # Keep it (and persist it) until the owning cog registers
+                self._parked.setdefault(kind, []).append((when, key))
+                continue
+            self._remove(kind, key)
+            ready.setdefault(kind, []).append((key, entry[1]))
+            self._changed()
+        return ready
+
+    def flush(self, force=False):
+        """Persist the schedule if it changed (at most every FLUSH_INTERVAL unless forced)."""
+        if not self._pending:
+            return
+        if not force and time.time() - self.last_flush < FLUSH_INTERVAL:
+            return
+        data = {}
+        for (kind, key), (when, payload) in self._entries.items():
+            data.setdefault(kind, {})[key] = [when, payload]
+        save(self.path, data)
+        self._pending = 0
+        self.dirty_since = None
+        self.last_flush = time.time()
+
+    def start(self):
+        """Start the dispatch task on the running loop (idempotent)."""
+        self._ensure_loaded()
+        if self._task and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def pause(self):
+        """Hold dispatching, e.g. while the cogs that own the handlers are still loading."""
+        self._paused = True
+
+    def resume(self):
+        self._paused = False
+        if self._wakeup:
+            self._wakeup.set()
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self.flush(force=True)
+
+    async def _run(self):
+        while True:
+            if self._paused:
+                # Due deadlines stay queued until resume(), while the cogs register
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            due = self.next_due()
+            delay = MAX_SLEEP if due is None else due - time.time()
+            delay = min(max(delay, 0), MAX_SLEEP, FLUSH_INTERVAL)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+            self.take_forwarded()
+            for kind, items in self.pop_due().items():
+                handler = self._handlers.get(kind)
+                if handler is None:
+                    # Cooldown marker: nothing to do once it has passed
+                    continue
+                try:
+                    await handler(items)
+                except Exception as e:
+                    print(f"Scheduler handler '{kind}' failed: {e}")
+            self.flush()
+
+
+# Shared instance used by all cogs
+scheduler = Scheduler()
@@ -0,0 +1,74 @@
+from utils.database import load, save, CLUSTER_ID
+
+# Cluster workers each restore only the sessions of their own shards
+SESSIONS_FILE = "data/sessions.json" if CLUSTER_ID is None else f"data/sessions-{CLUSTER_ID}.json"
+
+
+class SessionStore:
+    """Saves in-memory game sessions (lobbies, battles) across restarts.
+
+    Cogs register a provider returning JSON-able state for their sessions.
+    persist() writes every provider's state in one save at shutdown, and a cog
+    reclaims its part with take() when it loads again.
+    """
+
+    def __init__(self, path=SESSIONS_FILE):
+        self.path = path
+        self._providers = {}
+        self._retired = {}  # name -> providers of reloaded cogs whose sessions still run
+        self._restored = None
+
+    def register(self, name, provider):
+        self._providers[name] = provider
+
+    def retire(self, name):
+        """Keep persisting the current provider of `name` after its cog is reloaded.
+
+        Views created by the old module keep running against it until they
+        finish; their state is merged with the new provider's on persist().
+        """
+        provider = self._providers.pop(name, None)
+        if provider is not None:
+            self._retired.setdefault(name, []).append(provider)
+
+    def hand_over(self, name, state):
+        """Give `state` to the next take(name) in this process (e.g. across a cog reload)."""
+        self._ensure_restored()[name] = state
+
+    def persist(self):
+        # Keep state no cog has reclaimed yet (a deferred cog that never loaded)
+        data = dict(self._restored) if self._restored is not None else load(self.path)
+        for name, provider in self._providers.items():
+            try:
+                data[name] = provider()
+            except Exception as e:
+                print(f"Failed to persist {name} sessions: {e}")
+        for name, providers in self._retired.items():
+            for provider in list(providers):
+                try:
+                    state = provider()
+                except Exception as e:
+                    print(f"Failed to persist retired {name} sessions: {e}")
+                    continue
+                if not state:
+                    providers.remove(provider)  # everything it tracked has finished
+                elif isinstance(state, list):
+                    data[name] = (data.get(name) or []) + state
+                else:
+                    data[name] = {**state, **(data.get(name) or {})}
+        save(self.path, data)
+
+    def _ensure_restored(self):
+        if self._restored is None:
+            self._restored = load(self.path)
+            if self._restored:
+                save(self.path, {})
+        return self._restored
+
+    def take(self, name, default=None):
+        """Pop the state saved for `name` at the last shutdown (so it is restored once)."""
+        return self._ensure_restored().pop(name, default)
+
+
+# Shared instance used by the raid and combat cogs
+sessions = SessionStore()
@@ -0,0 +1,93 @@
+import config
+from discord.ext import commands
+from utils.metrics import registry
+from utils import leaderboard_index
+from utils.member_cache import member_cache
+
+shard_latency = registry.gauge(
+    "gateway_shard_latency_seconds", "Heartbeat latency per shard", ["shard"])
+shard_events = registry.counter(
+    "gateway_shard_events_total", "Messages and interactions received per shard", ["shard", "event"])
+shard_connections = registry.counter(
+    "gateway_shard_connections_total", "Shard ready/resume/disconnect transitions", ["shard", "state"])
+
+
+def parse_shard_ids(spec):
+    """Parse a shard range such as "0-3", "0,2,5" or "0-3,8" into a sorted id list (None if empty)."""
+    if not spec:
+        return None
+    ids = []
+    for part in spec.split(","):
+        part = part.strip()
+        if "-" in part:
+            start, end = part.split("-", 1)
+            ids.extend(range(int(start), int(end) + 1))
+        elif part:
+            ids.append(int(part))
+    return sorted(set(ids))
+
+
+def create_bot(**kwargs):
+    """Build the bot for the configured shard layout.
+
+    Without SHARD_COUNT this is the plain single-connection commands.Bot.
+    SHARD_COUNT=auto lets Discord pick the count; a number (optionally with
+    SHARD_IDS) runs only that range, so several processes can split a bot.
+    """
+    count = config.SHARD_COUNT
+    if not count:
+        return commands.Bot(**kwargs)
+    if count != "auto":
+        kwargs["shard_count"] = int(count)
+        shard_ids = parse_shard_ids(config.SHARD_IDS)
+        if shard_ids is not None:
+            kwargs["shard_ids"] = shard_ids
+    return commands.AutoShardedBot(**kwargs)
+
+
+def shard_of(bot, guild):
+    """Shard id serving `guild` (0 when unsharded or for DMs)."""
+    if guild is None or not bot.shard_count:
+        return 0
+    return guild.shard_id
+
+
+def update_latency(bot):
+    """Refresh the per-shard latency gauges; called before /metrics renders."""
+    for shard_id, latency in getattr(bot, "latencies", None) or [(bot.shard_id or 0, bot.latency)]:
+        if latency == latency and latency != float("inf"):  # skip NaN/inf before the first heartbeat
+            shard_latency.set(latency, str(shard_id))
+
+
+def track(bot):
+    """Count per-shard events and drop cached per-server state when a shard reconnects."""
+
+    @bot.listen()
+    async def on_message(message):
+        shard_events.inc(str(shard_of(bot, message.guild)), "message")
+
+    @bot.listen()
+    async def on_interaction(interaction):
+        shard_events.inc(str(shard_of(bot, interaction.guild)), "interaction")
+
+    @bot.listen()
+    async def on_shard_ready(shard_id):
+        # A fresh IDENTIFY rebuilds the shard's member cache and may have missed
+        # joins and leaves, so rankings and player sets built before it are dropped
+        shard_connections.inc(str(shard_id), "ready")
+        guild_ids = [g.id for g in bot.guilds if g.shard_id == shard_id]
+        leaderboard_index.forget_guilds(guild_ids)
+        member_cache.forget_guilds(guild_ids)
+
+    @bot.listen()
+    async def on_shard_resumed(shard_id):
+        shard_connections.inc(str(shard_id), "resumed")
+
+    @bot.listen()
+    async def on_shard_disconnect(shard_id):
+        shard_connections.inc(str(shard_id), "disconnect")
+
+    @bot.listen()
+    async def on_guild_remove(guild):
+        leaderboard_index.forget_guilds([guild.id])
+        member_cache.forget_guilds([guild.id])
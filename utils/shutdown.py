@@ -0,0 +1,51 @@
+import asyncio
+import signal
+import time
+from utils.metrics import in_flight
+from utils.scheduler import scheduler
+from utils.sessions import sessions
+
+DRAIN_TIMEOUT = 20  # seconds to wait for running commands (Render allows 30)
+
+
+class Shutdown:
+    """Graceful stop: refuse new commands, drain, persist, then close the gateway."""
+
+    def __init__(self):
+        self.draining = False
+        self._done = None
+
+    def install(self, bot):
+        """Run the shutdown sequence on SIGTERM/SIGINT (no-op where signals aren't supported)."""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, lambda s=sig: asyncio.create_task(self.run(bot, s.name)))
+            except (NotImplementedError, RuntimeError):
+                pass
+
+    async def run(self, bot, reason="shutdown"):
+        if self.draining:
+            return await self._done.wait()
+        self.draining = True
+        self._done = asyncio.Event()
+        print(f"Shutting down ({reason}): draining in-flight commands...")
+
+        deadline = time.monotonic() + DRAIN_TIMEOUT
+        while in_flight() > 0 and time.monotonic() < deadline:
+            await asyncio.sleep(0.25)
+        left = in_flight()
+        if left:
+            print(f"Drain timed out with {left} handler(s) still running")
+
+        sessions.persist()
+        scheduler.stop()
+        print("Sessions and schedule saved, closing gateway")
+        try:
+            await bot.close()
+        finally:
+            self._done.set()
+
+
+# Shared instance used by main.py
+shutdown = Shutdown()